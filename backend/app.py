@@ -11,24 +11,48 @@ All models, routes, utilities, and configuration are in this single file.
 
 import os
 import re
+import io
+import csv
 import json
+import base64
+import math
+import zlib
+import heapq
+import queue
+import select
+import socket
+import hashlib
+import ipaddress
+import zipfile
+import threading
+import multiprocessing
 import qrcode
 import smtplib
 import traceback
-from datetime import datetime, timedelta, date
-from functools import wraps
+from datetime import datetime, timedelta, date, timezone
+from calendar import monthrange
+from zoneinfo import ZoneInfo
+from functools import wraps, lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from collections import deque
 from email.message import EmailMessage
 from werkzeug.utils import secure_filename
 import urllib.parse
+import urllib.request
+import urllib.error
 
-from flask import Flask, Blueprint, request, jsonify, send_file
+from flask import Flask, Blueprint, request, jsonify, send_file, Response, stream_with_context, current_app, g
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity, get_jwt
-from sqlalchemy import ForeignKey, text, func, case, extract, or_, and_, inspect
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from sqlalchemy import ForeignKey, text, func, case, extract, or_, and_, inspect, insert, delete, update
+from sqlalchemy.dialects import postgresql, sqlite
 from dotenv import load_dotenv
 
+from pool_tasks import render_qr_png, hash_password
+
 # Load environment variables
 load_dotenv()
 
@@ -80,6 +104,81 @@ MAIL_USE_TLS = os.getenv("MAIL_USE_TLS", "true").lower() == "true"
 # Google Gemini AI configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Gemini call guards: per-call deadline, concurrent calls, wait for a free slot,
+# and the circuit breaker (consecutive failures before opening, seconds before a retry)
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "15"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_QUEUE_WAIT_SECONDS = float(os.getenv("GEMINI_QUEUE_WAIT_SECONDS", "1"))
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "3"))
+GEMINI_BREAKER_COOLDOWN_SECONDS = int(os.getenv("GEMINI_BREAKER_COOLDOWN_SECONDS", "60"))
+
+# Local recommender: share of the score from content similarity (the rest is collaborative filtering)
+RECOMMENDER_CONTENT_WEIGHT = float(os.getenv("RECOMMENDER_CONTENT_WEIGHT", "0.5"))
+
+# Precomputed recommendations: rows stored per participant, UTC hour after which the nightly
+# full run starts, and minutes between incremental refreshes of changed participants (0 disables)
+RECOMMENDATIONS_PER_USER = 10
+RECOMMENDATION_NIGHTLY_HOUR = int(os.getenv("RECOMMENDATION_NIGHTLY_HOUR", "3"))
+RECOMMENDATION_REFRESH_MINUTES = int(os.getenv("RECOMMENDATION_REFRESH_MINUTES", "15"))
+# A nightly run still unfinished after this long lost its worker and may be claimed again
+RECOMMENDATION_RUN_STALE_MINUTES = 120
+
+# University KPI snapshots: minutes between scheduler ticks that write today's row and
+# fill any missing days (0 disables; the dashboard then writes today's row on first read)
+UNIVERSITY_KPI_SNAPSHOT_MINUTES = int(os.getenv("UNIVERSITY_KPI_SNAPSHOT_MINUTES", "60"))
+
+# Shared Gemini response cache: entry lifetime in seconds (0 disables) and size before LRU eviction
+GEMINI_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CACHE_TTL_SECONDS", str(24 * 3600)))
+GEMINI_CACHE_MAX_ENTRIES = int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "5000"))
+
+# Serve the leader dashboard from per-leader snapshots refreshed after writes
+LEADER_DASHBOARD_SNAPSHOTS = os.getenv("LEADER_DASHBOARD_SNAPSHOTS", "true").lower() == "true"
+
+# Live check-in stream (Server-Sent Events)
+LIVE_EVENTS_CHANNEL = "clubhub_event_live"
+LIVE_STREAM_HEARTBEAT_SECONDS = 15
+# Streams are capped per worker so leader screens can never occupy every gthread
+# thread; size GUNICORN_THREADS for the number of screens open at once.
+LIVE_STREAM_MAX_SECONDS = int(os.getenv("LIVE_STREAM_MAX_SECONDS", "120"))
+LIVE_STREAMS_PER_WORKER = int(os.getenv(
+    "LIVE_STREAMS_PER_WORKER", str(max(1, int(os.getenv("GUNICORN_THREADS", "8")) // 2))
+))
+# EventSource puts the token in the URL, so it is short-lived and scoped to one stream
+LIVE_STREAM_TOKEN_SECONDS = 60
+
+# Reminder blasts: concurrent sends allowed per channel
+REMINDER_CHANNEL_CONCURRENCY = {
+    "email": int(os.getenv("REMINDER_EMAIL_CONCURRENCY", "8")),
+    "whatsapp": int(os.getenv("REMINDER_WHATSAPP_CONCURRENCY", "4")),
+    "sms": int(os.getenv("REMINDER_SMS_CONCURRENCY", "4")),
+}
+# A running job heartbeats updated_at; one silent this long lost its worker
+REMINDER_JOB_STALE_MINUTES = int(os.getenv("REMINDER_JOB_STALE_MINUTES", "10"))
+
+# CPU-bound work (QR badge rendering, batch password hashing): pool processes
+# (0 runs the work in the request thread)
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Maximum number of club request decisions accepted in one batch
+MAX_DECISION_BATCH = 100
+
+# Campus timezone: imported calendar times are stored as naive local times in this zone
+CAMPUS_TIMEZONE = os.getenv("CAMPUS_TIMEZONE", "UTC")
+
+# Calendar feeds: minutes between conditional re-fetches of subscribed iCal URLs (0 disables)
+CALENDAR_REFRESH_MINUTES = int(os.getenv("CALENDAR_REFRESH_MINUTES", "60"))
+CALENDAR_FETCH_TIMEOUT = int(os.getenv("CALENDAR_FETCH_TIMEOUT", "10"))
+# Feed URLs are user-supplied: only public http(s) hosts are fetched unless this is set
+CALENDAR_ALLOW_PRIVATE_HOSTS = os.getenv("CALENDAR_ALLOW_PRIVATE_HOSTS", "false").lower() == "true"
+
+# Length of club events created without a duration, and the longest one allowed
+EVENT_DEFAULT_DURATION_MINUTES = int(os.getenv("EVENT_DEFAULT_DURATION_MINUTES", "120"))
+MAX_EVENT_DURATION_MINUTES = 24 * 60
+
+# Bookable hours searched by the venue free-slot endpoint
+VENUE_OPEN_TIME = os.getenv("VENUE_OPEN_TIME", "08:00")
+VENUE_CLOSE_TIME = os.getenv("VENUE_CLOSE_TIME", "22:00")
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif", "webp"}
 
@@ -105,6 +204,7 @@ class User(db.Model):
     # OAuth fields
     provider = db.Column(db.String(50), nullable=True)  # 'google', 'facebook', 'linkedin', or None
     provider_id = db.Column(db.String(200), nullable=True)  # OAuth provider's user ID
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     # Reminder preferences - TEMPORARILY COMMENTED OUT until columns are added to database
     # Uncomment these after running the SQL migration script
     # phone_number = db.Column(db.String(20), nullable=True)  # For WhatsApp/SMS
@@ -177,6 +277,7 @@ class Club(db.Model):
     description = db.Column(db.String(300))
     category = db.Column(db.String(50))
     leader_id = db.Column(db.Integer, ForeignKey("users.id"), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     events = db.relationship("Event", backref="club", lazy=True, cascade="all, delete-orphan")
     leader = db.relationship("User", foreign_keys=[leader_id], backref="led_clubs")
@@ -191,6 +292,23 @@ class Club(db.Model):
         }
 
 
+class Venue(db.Model):
+    """A bookable place; events are linked to it through the normalized form of their location."""
+    __tablename__ = "venues"
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(200), nullable=False)
+    normalized_name = db.Column(db.String(200), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "normalized_name": self.normalized_name
+        }
+
+
 class Event(db.Model):
     """Event model representing club events."""
     __tablename__ = "events"
@@ -199,11 +317,21 @@ class Event(db.Model):
     club_id = db.Column(db.Integer, ForeignKey("clubs.id"), nullable=False)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(300))
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     time = db.Column(db.Time, nullable=False)
     location = db.Column(db.String(200), nullable=False)
     poster_image = db.Column(db.String(500), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    series_id = db.Column(db.Integer, ForeignKey("event_series.id"), nullable=True, index=True)
+    venue_id = db.Column(db.Integer, ForeignKey("venues.id"), nullable=True)
+    duration_minutes = db.Column(db.Integer, nullable=True)  # None: EVENT_DEFAULT_DURATION_MINUTES
+    # [starts_at, ends_at) kept in step with date/time/duration for venue overlap queries
+    starts_at = db.Column(db.DateTime, nullable=True)
+    ends_at = db.Column(db.DateTime, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    __table_args__ = (
+        db.Index("ix_events_venue_schedule", "venue_id", "starts_at", "ends_at"),
+    )
     
     registrations = db.relationship(
         "Registration",
@@ -222,6 +350,36 @@ class Event(db.Model):
             "time": str(self.time),
             "location": self.location,
             "poster_image": self.poster_image,
+            "series_id": self.series_id,
+            "venue_id": self.venue_id,
+            "duration_minutes": self.duration_minutes or EVENT_DEFAULT_DURATION_MINUTES,
+            "ends_at": str(self.ends_at) if self.ends_at else None,
+            "created_at": str(self.created_at)
+        }
+
+
+class EventSeries(db.Model):
+    """Recurring event series (weekly or bi-weekly) expanded into Event rows."""
+    __tablename__ = "event_series"
+    
+    id = db.Column(db.Integer, primary_key=True)
+    club_id = db.Column(db.Integer, ForeignKey("clubs.id"), nullable=False)
+    frequency = db.Column(db.String(20), nullable=False)  # weekly, biweekly
+    start_date = db.Column(db.Date, nullable=False)
+    until_date = db.Column(db.Date, nullable=False)
+    exclusions = db.Column(db.Text, nullable=True)  # JSON list of YYYY-MM-DD dates
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    club = db.relationship("Club", backref=db.backref("event_series", cascade="all, delete-orphan"))
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "club_id": self.club_id,
+            "frequency": self.frequency,
+            "start_date": str(self.start_date),
+            "until_date": str(self.until_date),
+            "exclusions": json.loads(self.exclusions) if self.exclusions else [],
             "created_at": str(self.created_at)
         }
 
@@ -231,13 +389,14 @@ class Registration(db.Model):
     __tablename__ = "registrations"
     
     id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, ForeignKey("events.id"), nullable=False)
+    event_id = db.Column(db.Integer, ForeignKey("events.id"), nullable=False, index=True)
     participant_name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), nullable=False)
     qr_code_path = db.Column(db.String(300))
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     cancelled = db.Column(db.Boolean, default=False, nullable=False)
     checked_in = db.Column(db.Boolean, default=False, nullable=False)
+    checked_in_at = db.Column(db.DateTime, nullable=True, index=True)
 
     def to_dict(self):
         return {
@@ -248,7 +407,8 @@ class Registration(db.Model):
             "qr_code_path": self.qr_code_path,
             "timestamp": str(self.timestamp),
             "cancelled": self.cancelled,
-            "checked_in": self.checked_in
+            "checked_in": self.checked_in,
+            "checked_in_at": str(self.checked_in_at) if self.checked_in_at else None
         }
 
 
@@ -258,6 +418,8 @@ class EventInsight(db.Model):
     
     event_id = db.Column(db.Integer, ForeignKey("events.id"), primary_key=True)
     views = db.Column(db.Integer, default=0, nullable=False)
+    unique_viewers = db.Column(db.Integer, default=0, nullable=False)  # HyperLogLog estimate
+    viewer_sketch = db.Column(db.LargeBinary, nullable=True)  # Serialized HyperLogLog registers
     
     event = db.relationship(
         "Event",
@@ -265,6 +427,22 @@ class EventInsight(db.Model):
     )
 
 
+class EventDailyViewSketch(db.Model):
+    """Per-day unique viewer sketch (HyperLogLog) for an event."""
+    __tablename__ = "event_daily_view_sketches"
+    
+    event_id = db.Column(db.Integer, ForeignKey("events.id"), primary_key=True)
+    view_date = db.Column(db.Date, primary_key=True)
+    views = db.Column(db.Integer, default=0, nullable=False)
+    unique_viewers = db.Column(db.Integer, default=0, nullable=False)
+    sketch = db.Column(db.LargeBinary, nullable=False)
+    
+    event = db.relationship(
+        "Event",
+        backref=db.backref("daily_view_sketches", lazy=True, cascade="all, delete-orphan")
+    )
+
+
 class ClubRequest(db.Model):
     """Club request model for club proposals."""
     __tablename__ = "club_requests"
@@ -288,6 +466,10 @@ class ClubRequest(db.Model):
     leader_email = db.Column(db.String(120), nullable=True)
     leader_password = db.Column(db.String(120), nullable=True)
     
+    __table_args__ = (
+        db.Index("ix_club_requests_status_created", "status", "created_at", "id"),
+    )
+    
     proposer = db.relationship(
         "User",
         backref=db.backref("club_requests", passive_deletes=False),
@@ -397,6 +579,50 @@ class EventReminder(db.Model):
     event = db.relationship("Event", backref="reminders")
 
 
+class ReminderJob(db.Model):
+    """Background reminder blast for an event, with progress counters."""
+    __tablename__ = "reminder_jobs"
+    
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, ForeignKey("events.id"), nullable=False, index=True)
+    leader_id = db.Column(db.Integer, ForeignKey("users.id"), nullable=False)
+    channels = db.Column(db.String(100), nullable=False)  # comma-separated
+    reminder_type = db.Column(db.String(20), default="manual")
+    status = db.Column(db.String(20), default="queued", nullable=False)  # queued, running, completed, failed
+    total = db.Column(db.Integer, default=0, nullable=False)
+    results = db.Column(db.Text, nullable=True)  # JSON {"sent": {...}, "failed": {...}}
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=True)  # heartbeat while running
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    event = db.relationship("Event", backref=db.backref("reminder_jobs", cascade="all, delete-orphan"))
+    
+    def to_dict(self):
+        results = json.loads(self.results) if self.results else {
+            "sent": {"email": 0, "whatsapp": 0, "sms": 0},
+            "failed": {"email": 0, "whatsapp": 0, "sms": 0}
+        }
+        processed = sum(results["sent"].values()) + sum(results["failed"].values())
+        return {
+            "id": self.id,
+            "event_id": self.event_id,
+            "channels": self.channels.split(","),
+            "reminder_type": self.reminder_type,
+            "status": self.status,
+            "total": self.total,
+            "processed": processed,
+            "sent": results["sent"],
+            "failed": results["failed"],
+            "error": self.error,
+            "created_at": str(self.created_at),
+            "started_at": str(self.started_at) if self.started_at else None,
+            "updated_at": str(self.updated_at) if self.updated_at else None,
+            "finished_at": str(self.finished_at) if self.finished_at else None
+        }
+
+
 class UniversityCalendarEvent(db.Model):
     """University calendar events imported by users."""
     __tablename__ = "university_calendar_events"
@@ -409,6 +635,10 @@ class UniversityCalendarEvent(db.Model):
     end_datetime = db.Column(db.DateTime, nullable=False)
     location = db.Column(db.String(200), nullable=True)
     calendar_url = db.Column(db.String(500), nullable=True)
+    # iCal identity (UID, plus RECURRENCE-ID for instances) used to diff re-syncs
+    event_key = db.Column(db.String(600), nullable=True)
+    sequence = db.Column(db.Integer, default=0)
+    last_modified = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     user = db.relationship("User", backref="university_calendar_events")
@@ -452,6 +682,10 @@ class UniversityOfficialCalendarEvent(db.Model):
     start_datetime = db.Column(db.DateTime, nullable=False)
     end_datetime = db.Column(db.DateTime, nullable=False)
     location = db.Column(db.String(200), nullable=True)
+    # iCal identity (UID, plus RECURRENCE-ID for instances) used to diff re-syncs
+    event_key = db.Column(db.String(600), nullable=True)
+    sequence = db.Column(db.Integer, default=0)
+    last_modified = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -467,6 +701,22 @@ class UniversityOfficialCalendarEvent(db.Model):
         }
 
 
+class CalendarFeed(db.Model):
+    """A distinct subscribed iCal URL with the HTTP validators from its last fetch."""
+    __tablename__ = "calendar_feeds"
+    
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(500), unique=True, nullable=False)
+    etag = db.Column(db.String(300), nullable=True)
+    last_modified = db.Column(db.String(100), nullable=True)  # Last-Modified header, verbatim
+    last_status = db.Column(db.Integer, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    last_checked_at = db.Column(db.DateTime, nullable=True)
+    last_changed_at = db.Column(db.DateTime, nullable=True)
+    next_fetch_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
 class ClubCalendarPermission(db.Model):
     """Tracks which clubs have permission to view university calendar."""
     __tablename__ = "club_calendar_permissions"
@@ -493,6 +743,135 @@ class ClubCalendarPermission(db.Model):
         }
 
 
+class LeaderDataVersion(db.Model):
+    """Per-leader counter bumped whenever that leader's events, registrations or check-ins change."""
+    __tablename__ = "leader_data_versions"
+    
+    leader_id = db.Column(db.Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class LeaderDashboardSnapshot(db.Model):
+    """Materialized leader dashboard payload, valid while its data_version is current."""
+    __tablename__ = "leader_dashboard_snapshots"
+    
+    leader_id = db.Column(db.Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    data_version = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class LeaderInsightSnapshot(db.Model):
+    """Stored analytics and AI insights for a leader, valid while its data_version is current."""
+    __tablename__ = "leader_insight_snapshots"
+    
+    leader_id = db.Column(db.Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    data_version = db.Column(db.Integer, nullable=False)
+    analytics_data = db.Column(db.Text, nullable=False)  # JSON
+    insights = db.Column(db.Text, nullable=False)  # JSON
+    source = db.Column(db.String(20), nullable=False)  # gemini, fallback
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class Recommendation(db.Model):
+    """Stored top-N event recommendation for a participant, written by the recommendation job."""
+    __tablename__ = "recommendations"
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    event_id = db.Column(db.Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    rank = db.Column(db.Integer, nullable=False)
+    score = db.Column(db.Float, default=0.0, nullable=False)
+    popularity = db.Column(db.Integer, default=0, nullable=False)
+    source = db.Column(db.String(20), nullable=False)  # hybrid, category, popular
+    explanation = db.Column(db.String(200), nullable=True)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Also the index behind the per-user read
+    __table_args__ = (db.UniqueConstraint("user_id", "rank", name="uq_recommendations_user_rank"),)
+
+
+class RecommendationState(db.Model):
+    """Registration history a participant's stored recommendations were computed from."""
+    __tablename__ = "recommendation_states"
+    
+    user_id = db.Column(db.Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    registrations = db.Column(db.Integer, default=0, nullable=False)
+    last_registration_id = db.Column(db.Integer, nullable=True)
+    interests = db.Column(db.Text, nullable=True)  # JSON list of categories
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class RecommendationRun(db.Model):
+    """One row per nightly full recommendation run; the date key lets a single worker claim each night."""
+    __tablename__ = "recommendation_runs"
+    
+    run_date = db.Column(db.Date, primary_key=True)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    users = db.Column(db.Integer, default=0, nullable=False)
+    rows = db.Column(db.Integer, default=0, nullable=False)
+
+
+class JobLease(db.Model):
+    """Next time a periodic job may run; workers claim a run by moving next_run_at forward."""
+    __tablename__ = "job_leases"
+    
+    name = db.Column(db.String(100), primary_key=True)
+    next_run_at = db.Column(db.DateTime, nullable=False)
+
+
+class GeminiResponseCache(db.Model):
+    """Gemini response stored under a hash of (model, prompt, generation config), shared by all workers."""
+    __tablename__ = "gemini_response_cache"
+    
+    cache_key = db.Column(db.String(64), primary_key=True)  # sha256 hex
+    model_name = db.Column(db.String(100), nullable=False)
+    response = db.Column(db.Text, nullable=False)
+    latency_ms = db.Column(db.Integer, default=0, nullable=False)  # Cost of the original call
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    last_hit_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class GeminiCacheStat(db.Model):
+    """Daily Gemini cache counters: hits, misses and the API time the hits saved."""
+    __tablename__ = "gemini_cache_stats"
+    
+    stat_date = db.Column(db.Date, primary_key=True)
+    hits = db.Column(db.Integer, default=0, nullable=False)
+    misses = db.Column(db.Integer, default=0, nullable=False)
+    latency_saved_ms = db.Column(db.BigInteger, default=0, nullable=False)
+
+
+class UniversityKpiSnapshot(db.Model):
+    """Campus-wide totals captured once per day; the university dashboard and trends read these rows."""
+    __tablename__ = "university_kpi_snapshots"
+    
+    snapshot_date = db.Column(db.Date, primary_key=True)
+    clubs = db.Column(db.Integer, default=0, nullable=False)
+    events = db.Column(db.Integer, default=0, nullable=False)
+    participants = db.Column(db.Integer, default=0, nullable=False)
+    leaders = db.Column(db.Integer, default=0, nullable=False)
+    registrations = db.Column(db.Integer, default=0, nullable=False)
+    check_ins = db.Column(db.Integer, default=0, nullable=False)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "date": self.snapshot_date.isoformat(),
+            "clubs": self.clubs,
+            "events": self.events,
+            "participants": self.participants,
+            "leaders": self.leaders,
+            "registrations": self.registrations,
+            "check_ins": self.check_ins,
+            "computed_at": str(self.computed_at) if self.computed_at else None
+        }
+
+
 # ============================================================================
 # SECTION 4: UTILITY FUNCTIONS
 # ============================================================================
@@ -543,20 +922,68 @@ def leader_required(fn):
     return decorator
 
 
+def get_leader_club_ids(leader_id):
+    """Get the ids of clubs a leader owns, loaded at most once per request."""
+    cache = g.setdefault("leader_club_ids", {})
+    if leader_id not in cache:
+        cache[leader_id] = frozenset(
+            row.id for row in db.session.query(Club.id).filter(Club.leader_id == leader_id).all()
+        )
+    return cache[leader_id]
+
+
+def get_event_club_id(event_id):
+    """Get the club id of an event, loaded at most once per request."""
+    cache = g.setdefault("event_club_ids", {})
+    if event_id not in cache:
+        cache[event_id] = db.session.query(Event.club_id).filter(Event.id == event_id).scalar()
+    return cache[event_id]
+
+
+def invalidate_ownership_cache():
+    """Drop cached ownership lookups after clubs change hands within a request."""
+    g.pop("leader_club_ids", None)
+    g.pop("event_club_ids", None)
+
+
 def leader_owns_club(leader_id, club_id):
     """Check if a leader owns a specific club."""
-    club = Club.query.get(club_id)
-    if not club:
+    try:
+        club_id = int(club_id)
+    except (TypeError, ValueError):
         return False
-    return club.leader_id == leader_id
+    return club_id in get_leader_club_ids(leader_id)
 
 
 def leader_owns_event(leader_id, event_id):
     """Check if a leader owns the club that an event belongs to."""
-    event = Event.query.get(event_id)
-    if not event:
+    club_id = get_event_club_id(event_id)
+    if club_id is None:
         return False
-    return leader_owns_club(leader_id, event.club_id)
+    return leader_owns_club(leader_id, club_id)
+
+
+def bump_leader_data_version(club_id=None, leader_id=None):
+    """Record that a leader's dashboard data changed (runs inside the caller's transaction)."""
+    now = datetime.utcnow()
+    if leader_id is not None:
+        db.session.execute(text(
+            "INSERT INTO leader_data_versions (leader_id, version, updated_at) "
+            "VALUES (:leader_id, 1, :now) "
+            "ON CONFLICT (leader_id) DO UPDATE SET version = leader_data_versions.version + 1, updated_at = :now"
+        ), {"leader_id": leader_id, "now": now})
+    elif club_id is not None:
+        db.session.execute(text(
+            "INSERT INTO leader_data_versions (leader_id, version, updated_at) "
+            "SELECT leader_id, 1, :now FROM clubs WHERE id = :club_id AND leader_id IS NOT NULL "
+            "ON CONFLICT (leader_id) DO UPDATE SET version = leader_data_versions.version + 1, updated_at = :now"
+        ), {"club_id": club_id, "now": now})
+
+
+def get_leader_data_version(leader_id):
+    """Get the current data version for a leader (0 if nothing has been written yet)."""
+    version = db.session.query(LeaderDataVersion.version).filter_by(leader_id=leader_id).scalar()
+    return version or 0
 
 
 def send_registration_email(participant_email, participant_name, event, qr_path):
@@ -602,11 +1029,161 @@ def send_registration_email(participant_email, participant_name, event, qr_path)
         return False
 
 
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    """Shared process pool for CPU-bound work, created on first use (None when disabled).
+
+    Submit only functions from pool_tasks: spawn children import the task's
+    module, and importing this one would set up a second copy of the app.
+    """
+    global _process_pool
+    if PROCESS_POOL_WORKERS <= 0:
+        return None
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: forking a threaded worker can copy held locks into the children
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PROCESS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def hash_passwords(passwords, rounds=12):
+    """Hash several passwords in parallel on the process pool (inline when it is disabled)."""
+    pool = get_process_pool()
+    if pool is None or len(passwords) < 2:
+        return [hash_password(password, rounds) for password in passwords]
+    return list(pool.map(hash_password, passwords, [rounds] * len(passwords)))
+
+
+# ============================================================================
+# LIVE EVENT UPDATES (SERVER-SENT EVENTS)
+# ============================================================================
+
+class LiveEventBroker:
+    """Fans out per-event registration/check-in deltas to SSE subscribers.
+
+    On PostgreSQL, updates are published with pg_notify inside the writer's
+    transaction, so they are only delivered once committed and reach every
+    worker. Each worker runs a single LISTEN thread that pushes notifications
+    into in-memory subscriber queues, so any number of open leader screens
+    costs no extra database polling.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def subscribe(self, event_id):
+        """Register a new subscriber queue for an event."""
+        subscriber = queue.Queue(maxsize=1000)
+        with self._lock:
+            self._subscribers.setdefault(event_id, set()).add(subscriber)
+        self._ensure_listener(current_app._get_current_object())
+        return subscriber
+
+    def unsubscribe(self, event_id, subscriber):
+        """Remove a subscriber queue."""
+        with self._lock:
+            subscribers = self._subscribers.get(event_id)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[event_id]
+
+    def publish(self, event_id, update_type, data):
+        """Queue a delta for an event's subscribers (delivered on commit with PostgreSQL)."""
+        message = {"event_id": event_id, "type": update_type, **data}
+        if db.engine.dialect.name == "postgresql":
+            db.session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": LIVE_EVENTS_CHANNEL, "payload": json.dumps(message, default=str)}
+            )
+        else:
+            # Single-process fallback: no cross-worker delivery
+            self.dispatch(message)
+
+    def dispatch(self, message):
+        """Deliver a message to local subscribers, dropping it for any that are backed up."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(message.get("event_id"), ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                pass
+
+    def _ensure_listener(self, app):
+        if self._listener and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener and self._listener.is_alive():
+                return
+            with app.app_context():
+                if db.engine.dialect.name != "postgresql":
+                    return
+            self._listener = threading.Thread(target=self._listen, args=(app,), daemon=True, name="live-event-listener")
+            self._listener.start()
+
+    def _listen(self, app):
+        while True:
+            try:
+                with app.app_context():
+                    raw_connection = db.engine.raw_connection()
+                # Keep the LISTEN connection out of the request pool
+                raw_connection.detach()
+                connection = raw_connection.driver_connection
+                connection.autocommit = True
+                cursor = connection.cursor()
+                cursor.execute(f"LISTEN {LIVE_EVENTS_CHANNEL}")
+                while True:
+                    if select.select([connection], [], [], 30) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        notification = connection.notifies.pop(0)
+                        try:
+                            self.dispatch(json.loads(notification.payload))
+                        except ValueError:
+                            continue
+            except Exception as listen_err:
+                print(f"Live event listener error, reconnecting: {listen_err}")
+                threading.Event().wait(5)
+
+
+live_event_broker = LiveEventBroker()
+
+
+def publish_registration_update(registration, update_type, reactivated=False):
+    """Publish a registration/check-in/cancellation delta for live leader screens."""
+    delta = {
+        "registration": {"registrations": 1, "checked_in": 0, "cancelled": -1 if reactivated else 0},
+        "cancellation": {"registrations": -1, "checked_in": 0, "cancelled": 1},
+        "check_in": {"registrations": 0, "checked_in": 1, "cancelled": 0},
+    }[update_type]
+    live_event_broker.publish(registration.event_id, update_type, {
+        "delta": delta,
+        "registration": {
+            "id": registration.id,
+            "participant_name": registration.participant_name,
+            "email": registration.email,
+            "checked_in": registration.checked_in,
+            "checked_in_at": str(registration.checked_in_at) if registration.checked_in_at else None
+        },
+        "at": datetime.utcnow().isoformat()
+    })
+
+
 # ============================================================================
 # REMINDER SERVICE FUNCTIONS
 # ============================================================================
 
-def send_email_reminder(user_email, user_name, event, reminder_type="registration"):
+def send_email_reminder(user_email, user_name, event, reminder_type="registration", qr_code_path=None):
     """Send email reminder for an event."""
     try:
         if not MAIL_SERVER or not MAIL_FROM:
@@ -627,14 +1204,16 @@ def send_email_reminder(user_email, user_name, event, reminder_type="registratio
         msg["From"] = MAIL_FROM
         msg["To"] = user_email
         
-        # Get registration for QR code
-        registration = Registration.query.filter_by(
-            event_id=event.id, email=user_email, cancelled=False
-        ).first()
+        # Get registration for QR code (callers that already have it pass the path)
+        if qr_code_path is None:
+            registration = Registration.query.filter_by(
+                event_id=event.id, email=user_email, cancelled=False
+            ).first()
+            qr_code_path = registration.qr_code_path if registration else None
         
         qr_attachment = None
-        if registration and registration.qr_code_path and os.path.exists(registration.qr_code_path):
-            with open(registration.qr_code_path, "rb") as f:
+        if qr_code_path and os.path.exists(qr_code_path):
+            with open(qr_code_path, "rb") as f:
                 qr_attachment = f.read()
         
         html_body = f"""
@@ -780,35 +1359,175 @@ def send_sms_reminder(phone_number, user_name, event, reminder_type="registratio
         return False
 
 
+def reminder_channels_for(user, channels=None):
+    """Return the requested channels a user has enabled (all enabled channels if none requested)."""
+    enabled = []
+    if user.reminder_email_enabled:
+        enabled.append("email")
+    if user.reminder_whatsapp_enabled and user.phone_number:
+        enabled.append("whatsapp")
+    if user.reminder_sms_enabled and user.phone_number:
+        enabled.append("sms")
+    if channels is None:
+        return enabled
+    return [channel for channel in enabled if channel in channels]
+
+
+def send_reminder_on_channel(channel, user, event, reminder_type, qr_code_path=None):
+    """Send a single reminder to a user on one channel."""
+    user_name = user.name or user.email.split("@")[0]
+    if channel == "email":
+        return send_email_reminder(user.email, user_name, event, reminder_type, qr_code_path)
+    if channel == "whatsapp":
+        return send_whatsapp_reminder(user.phone_number, user_name, event, reminder_type)
+    if channel == "sms":
+        return send_sms_reminder(user.phone_number, user_name, event, reminder_type)
+    return False
+
+
 def send_event_reminders(user, event, reminder_type="registration", channels=None):
     """Send reminders through enabled channels for a user."""
-    if channels is None:
-        channels = []
-        if user.reminder_email_enabled:
-            channels.append("email")
-        if user.reminder_whatsapp_enabled and user.phone_number:
-            channels.append("whatsapp")
-        if user.reminder_sms_enabled and user.phone_number:
-            channels.append("sms")
-    
     results = {"email": False, "whatsapp": False, "sms": False}
-    
-    if "email" in channels and user.reminder_email_enabled:
-        results["email"] = send_email_reminder(
-            user.email, user.name or user.email.split("@")[0], event, reminder_type
-        )
-    
-    if "whatsapp" in channels and user.reminder_whatsapp_enabled and user.phone_number:
-        results["whatsapp"] = send_whatsapp_reminder(
-            user.phone_number, user.name or user.email.split("@")[0], event, reminder_type
+    for channel in reminder_channels_for(user, channels):
+        results[channel] = send_reminder_on_channel(channel, user, event, reminder_type)
+    return results
+
+
+def start_reminder_job(app, job_id):
+    """Run a reminder blast on a background thread so the request returns immediately."""
+    thread = threading.Thread(
+        target=run_reminder_job, args=(app, job_id), name=f"reminder-job-{job_id}", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def run_reminder_job(app, job_id, progress_interval=2.0):
+    """Resolve recipients with one join and fan out sends with per-channel concurrency limits."""
+    with app.app_context():
+        job = ReminderJob.query.get(job_id)
+        if not job:
+            return
+        
+        try:
+            channels = job.channels.split(",")
+            reminder_type = job.reminder_type
+            event = Event.query.get(job.event_id)
+            # One query for every active registration that belongs to a user account
+            recipients = (
+                db.session.query(User, Registration.qr_code_path)
+                .join(Registration, Registration.email == User.email)
+                .filter(Registration.event_id == job.event_id, Registration.cancelled == False)
+                .all()
+            )
+            
+            # Detach loaded rows so the sender threads never touch the session
+            db.session.expunge_all()
+            now = datetime.utcnow()
+            db.session.execute(
+                update(ReminderJob)
+                .where(ReminderJob.id == job_id)
+                .values(status="running", started_at=now, updated_at=now, total=len(recipients))
+            )
+            db.session.commit()
+            
+            sent = {"email": 0, "whatsapp": 0, "sms": 0}
+            failed = {"email": 0, "whatsapp": 0, "sms": 0}
+            executors = {
+                channel: ThreadPoolExecutor(
+                    max_workers=max(1, REMINDER_CHANNEL_CONCURRENCY.get(channel, 1)),
+                    thread_name_prefix=f"reminder-{channel}"
+                )
+                for channel in channels
+            }
+            try:
+                futures = {}
+                for user, qr_code_path in recipients:
+                    for channel in reminder_channels_for(user, channels):
+                        # "" rather than None: the join already resolved the QR code, and the
+                        # sender's own lookup would need an app context the pool threads lack
+                        future = executors[channel].submit(
+                            send_reminder_on_channel, channel, user, event, reminder_type, qr_code_path or ""
+                        )
+                        futures[future] = channel
+                
+                last_flush = datetime.utcnow()
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=progress_interval, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        channel = futures[future]
+                        try:
+                            ok = future.result()
+                        except Exception:
+                            ok = False
+                        if ok:
+                            sent[channel] += 1
+                        else:
+                            failed[channel] += 1
+                    
+                    # Flushing also heartbeats updated_at while slow sends are in flight
+                    if (datetime.utcnow() - last_flush).total_seconds() >= progress_interval:
+                        db.session.execute(
+                            update(ReminderJob)
+                            .where(ReminderJob.id == job_id)
+                            .values(results=json.dumps({"sent": sent, "failed": failed}), updated_at=datetime.utcnow())
+                        )
+                        db.session.commit()
+                        last_flush = datetime.utcnow()
+            finally:
+                for executor in executors.values():
+                    executor.shutdown(wait=True)
+            
+            db.session.execute(
+                update(ReminderJob)
+                .where(ReminderJob.id == job_id)
+                .values(
+                    status="completed",
+                    results=json.dumps({"sent": sent, "failed": failed}),
+                    updated_at=datetime.utcnow(),
+                    finished_at=datetime.utcnow()
+                )
+            )
+            db.session.commit()
+            print(f"✅ Reminder job {job_id} completed: sent={sent} failed={failed}")
+        except Exception as e:
+            db.session.rollback()
+            db.session.execute(
+                update(ReminderJob)
+                .where(ReminderJob.id == job_id)
+                .values(status="failed", error=str(e), updated_at=datetime.utcnow(), finished_at=datetime.utcnow())
+            )
+            db.session.commit()
+            print(f"❌ Reminder job {job_id} failed: {e}")
+            traceback.print_exc()
+        finally:
+            db.session.remove()
+
+
+def reap_stale_reminder_jobs():
+    """Mark queued/running jobs whose worker died as failed; returns how many were reaped.
+
+    They are not re-run: the job does not record which recipients were already
+    reached, so a restart would message them twice. The leader can send again.
+    """
+    now = datetime.utcnow()
+    cutoff = now - timedelta(minutes=REMINDER_JOB_STALE_MINUTES)
+    result = db.session.execute(
+        update(ReminderJob)
+        .where(
+            ReminderJob.status.in_(("queued", "running")),
+            func.coalesce(ReminderJob.updated_at, ReminderJob.created_at) < cutoff
         )
-    
-    if "sms" in channels and user.reminder_sms_enabled and user.phone_number:
-        results["sms"] = send_sms_reminder(
-            user.phone_number, user.name or user.email.split("@")[0], event, reminder_type
+        .values(
+            status="failed",
+            error="Reminder job stopped responding (worker restarted); send the reminders again",
+            updated_at=now,
+            finished_at=now
         )
-    
-    return results
+    )
+    db.session.commit()
+    return result.rowcount
 
 
 def create_automatic_reminders(user_id, event_id):
@@ -903,63 +1622,177 @@ def ensure_schema():
             pass
         
         try:
-            result = db.session.execute(
-                text("SELECT column_name FROM information_schema.columns WHERE table_name='users' AND column_name='profile_image'")
-            ).fetchone()
-            if not result:
-                db.session.execute(
-                    text("ALTER TABLE users ADD COLUMN profile_image VARCHAR(500)")
-                )
+            db.session.execute(
+                text("ALTER TABLE events ADD COLUMN IF NOT EXISTS series_id INTEGER REFERENCES event_series(id)")
+            )
+            db.session.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_events_series_id ON events (series_id)")
+            )
+            db.session.commit()
         except Exception:
-            pass
+            db.session.rollback()
         
         try:
-            result = db.session.execute(
-                text("SELECT column_name FROM information_schema.columns WHERE table_name='users' AND column_name='bio'")
-            ).fetchone()
-            if not result:
-                db.session.execute(
-                    text("ALTER TABLE users ADD COLUMN bio VARCHAR(500)")
-                )
+            db.session.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_club_requests_status_created ON club_requests (status, created_at, id)")
+            )
+            db.session.commit()
         except Exception:
-            pass
+            db.session.rollback()
         
-        # Add OAuth columns - MUST run before any User queries
+        # Trigram indexes let the queue's ?q= substring ILIKE search skip a sequential scan
         try:
-            result = db.session.execute(
-                text("SELECT column_name FROM information_schema.columns WHERE table_name='users' AND column_name='provider'")
-            ).fetchone()
-            if not result:
-                print("Adding OAuth columns: provider, provider_id...")
-                db.session.execute(
-                    text("ALTER TABLE users ADD COLUMN provider VARCHAR(50)")
-                )
-                db.session.execute(
-                    text("ALTER TABLE users ADD COLUMN provider_id VARCHAR(200)")
-                )
-                db.session.commit()
-                print("✅ Added OAuth columns")
+            db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_club_requests_name_trgm ON club_requests USING gin (name gin_trgm_ops)"
+            ))
+            db.session.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_club_requests_description_trgm "
+                "ON club_requests USING gin (description gin_trgm_ops)"
+            ))
+            db.session.commit()
         except Exception as e:
-            print(f"Error adding OAuth columns: {e}")
             db.session.rollback()
+            print(f"Trigram indexes for club request search not created: {e}")
         
-        # Make password nullable for OAuth users
+        # Range scans (calendars) and per-event registration counts
         try:
-            result = db.session.execute(
-                text("SELECT is_nullable FROM information_schema.columns WHERE table_name='users' AND column_name='password'")
-            ).fetchone()
-            if result and result[0] == 'NO':
-                print("Making password column nullable for OAuth users...")
-                db.session.execute(
-                    text("ALTER TABLE users ALTER COLUMN password DROP NOT NULL")
-                )
-                db.session.commit()
-                print("✅ Made password column nullable")
-        except Exception as e:
-            print(f"Error making password nullable: {e}")
+            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_events_date ON events (date)"))
+            db.session.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_registrations_event_id ON registrations (event_id)")
+            )
+            db.session.commit()
+        except Exception:
             db.session.rollback()
         
-        # Add reminder preference columns - MUST run before any User queries
+        try:
+            db.session.execute(
+                text("ALTER TABLE registrations ADD COLUMN IF NOT EXISTS checked_in_at TIMESTAMP")
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        
+        try:
+            db.session.execute(text("ALTER TABLE reminder_jobs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP"))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        
+        # Venues and event durations; starts_at/ends_at are backfilled by backfill_event_venues()
+        try:
+            db.session.execute(text("ALTER TABLE events ADD COLUMN IF NOT EXISTS venue_id INTEGER REFERENCES venues(id)"))
+            db.session.execute(text("ALTER TABLE events ADD COLUMN IF NOT EXISTS duration_minutes INTEGER"))
+            db.session.execute(text("ALTER TABLE events ADD COLUMN IF NOT EXISTS starts_at TIMESTAMP"))
+            db.session.execute(text("ALTER TABLE events ADD COLUMN IF NOT EXISTS ends_at TIMESTAMP"))
+            db.session.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_events_venue_schedule ON events (venue_id, starts_at, ends_at)")
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        
+        # Creation times behind the university KPI "today so far" deltas
+        # (rows that existed before this column are already in the snapshots)
+        try:
+            db.session.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS created_at TIMESTAMP"))
+            db.session.execute(text("ALTER TABLE clubs ADD COLUMN IF NOT EXISTS created_at TIMESTAMP"))
+            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_users_created_at ON users (created_at)"))
+            db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_events_created_at ON events (created_at)"))
+            db.session.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_registrations_timestamp ON registrations (timestamp)")
+            )
+            db.session.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_registrations_checked_in_at ON registrations (checked_in_at)")
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        
+        for table, scope in (
+            ("university_official_calendar_events", "calendar_id"),
+            ("university_calendar_events", "user_id, calendar_url")
+        ):
+            try:
+                db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS event_key VARCHAR(600)"))
+                db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS sequence INTEGER DEFAULT 0"))
+                db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS last_modified TIMESTAMP"))
+                db.session.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS ix_{table}_event_key ON {table} ({scope}, event_key)")
+                )
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+        
+        try:
+            db.session.execute(
+                text("ALTER TABLE event_insights ADD COLUMN IF NOT EXISTS unique_viewers INTEGER NOT NULL DEFAULT 0")
+            )
+            db.session.execute(
+                text("ALTER TABLE event_insights ADD COLUMN IF NOT EXISTS viewer_sketch BYTEA")
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        
+        try:
+            result = db.session.execute(
+                text("SELECT column_name FROM information_schema.columns WHERE table_name='users' AND column_name='profile_image'")
+            ).fetchone()
+            if not result:
+                db.session.execute(
+                    text("ALTER TABLE users ADD COLUMN profile_image VARCHAR(500)")
+                )
+        except Exception:
+            pass
+        
+        try:
+            result = db.session.execute(
+                text("SELECT column_name FROM information_schema.columns WHERE table_name='users' AND column_name='bio'")
+            ).fetchone()
+            if not result:
+                db.session.execute(
+                    text("ALTER TABLE users ADD COLUMN bio VARCHAR(500)")
+                )
+        except Exception:
+            pass
+        
+        # Add OAuth columns - MUST run before any User queries
+        try:
+            result = db.session.execute(
+                text("SELECT column_name FROM information_schema.columns WHERE table_name='users' AND column_name='provider'")
+            ).fetchone()
+            if not result:
+                print("Adding OAuth columns: provider, provider_id...")
+                db.session.execute(
+                    text("ALTER TABLE users ADD COLUMN provider VARCHAR(50)")
+                )
+                db.session.execute(
+                    text("ALTER TABLE users ADD COLUMN provider_id VARCHAR(200)")
+                )
+                db.session.commit()
+                print("✅ Added OAuth columns")
+        except Exception as e:
+            print(f"Error adding OAuth columns: {e}")
+            db.session.rollback()
+        
+        # Make password nullable for OAuth users
+        try:
+            result = db.session.execute(
+                text("SELECT is_nullable FROM information_schema.columns WHERE table_name='users' AND column_name='password'")
+            ).fetchone()
+            if result and result[0] == 'NO':
+                print("Making password column nullable for OAuth users...")
+                db.session.execute(
+                    text("ALTER TABLE users ALTER COLUMN password DROP NOT NULL")
+                )
+                db.session.commit()
+                print("✅ Made password column nullable")
+        except Exception as e:
+            print(f"Error making password nullable: {e}")
+            db.session.rollback()
+        
+        # Add reminder preference columns - MUST run before any User queries
         columns_to_add = [
             ("phone_number", "VARCHAR(20)", None),
             ("reminder_email_enabled", "BOOLEAN NOT NULL DEFAULT TRUE", True),
@@ -1003,7 +1836,173 @@ def ensure_schema():
         print(f"Schema check failed: {schema_err}")
 
 
-def get_event_analytics(email=None, leader_id=None, club_ids=None):
+class HyperLogLog:
+    """HyperLogLog cardinality sketch used for unique viewer counts.
+
+    With the default precision of 12 there are 4096 one-byte registers,
+    giving a standard error of about 1.6%. Sketches are merged with a
+    register-wise max, so partial sketches from different workers (or
+    different days) can be combined without double counting.
+    """
+    VERSION = 1
+
+    def __init__(self, precision=12, registers=None):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Load a sketch serialized with to_bytes (None gives an empty sketch)."""
+        if not data:
+            return cls()
+        data = bytes(data)
+        if data[0] != cls.VERSION:
+            raise ValueError(f"Unsupported HyperLogLog sketch version: {data[0]}")
+        return cls(precision=data[1], registers=zlib.decompress(data[2:]))
+
+    def to_bytes(self):
+        """Serialize as version, precision and zlib-compressed registers."""
+        return bytes([self.VERSION, self.precision]) + zlib.compress(bytes(self.registers))
+
+    def add(self, value):
+        """Add a value (any string) to the sketch."""
+        digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+        x = int.from_bytes(digest, "big")
+        index = x >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        w = x & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - w.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """Merge another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+        return self
+
+    def count(self):
+        """Estimate the number of distinct values added."""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+TIMESERIES_BUCKETS = ("day", "week", "month")
+TIMESERIES_BUCKET_DAYS = {"day": 1, "week": 7, "month": 30}
+
+
+def parse_date_arg(value):
+    """Parse an optional YYYY-MM-DD query argument into a date."""
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def choose_timeseries_bucket(start_date, end_date, max_points):
+    """Pick the finest bucket that keeps a date range within max_points."""
+    if not start_date or not end_date:
+        return "day"
+    span_days = (end_date - start_date).days + 1
+    for bucket in TIMESERIES_BUCKETS:
+        if span_days / TIMESERIES_BUCKET_DAYS[bucket] <= max_points:
+            return bucket
+    return "month"
+
+
+def downsample_timeseries(points, max_points, start_date=None, end_date=None):
+    """Merge buckets into equal time windows so that at most max_points remain.
+
+    Windows are laid over the calendar span, not over the list of points, so
+    sparse series keep their gaps instead of folding distant dates together.
+    """
+    # date_trunc can place the first bucket before start_date
+    first = min(d for d in (start_date, date.fromisoformat(points[0]["date"])) if d)
+    last = max(d for d in (end_date, date.fromisoformat(points[-1]["date"])) if d)
+    window_days = max(1, -(-((last - first).days + 1) // max_points))
+    merged = {}
+    for point in points:
+        offset = (date.fromisoformat(point["date"]) - first).days // window_days
+        window_start = first + timedelta(days=offset * window_days)
+        merged[window_start] = merged.get(window_start, 0) + point["registrations"]
+    return [{"date": str(window_start), "registrations": count} for window_start, count in sorted(merged.items())]
+
+
+def parse_timeseries_args(args):
+    """Read start/end/bucket/max_points query arguments; raises ValueError with a message."""
+    try:
+        start_date = parse_date_arg(args.get("start"))
+        end_date = parse_date_arg(args.get("end"))
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD.")
+
+    bucket = args.get("bucket", "day")
+    if bucket not in TIMESERIES_BUCKETS + ("auto",):
+        raise ValueError("bucket must be one of: day, week, month, auto")
+
+    max_points = args.get("max_points", type=int)
+    if max_points is not None and max_points < 1:
+        raise ValueError("max_points must be a positive integer")
+    return start_date, end_date, bucket, max_points
+
+
+def get_registration_timeseries(start_date=None, end_date=None, bucket="day", max_points=None,
+                                event_filter=None, email=None):
+    """Get registration counts per date bucket (day/week/month) using date_trunc.
+
+    Returns a (points, bucket) tuple. With bucket="auto" the granularity is
+    derived from the date range and max_points; any remaining overflow is
+    merged so the payload never exceeds max_points.
+    """
+    filters = [Registration.cancelled == False]
+    if event_filter is not None:
+        filters.append(event_filter)
+    if email:
+        filters.append(Registration.email == email)
+    if start_date:
+        filters.append(Event.date >= start_date)
+    if end_date:
+        filters.append(Event.date <= end_date)
+
+    if bucket == "auto":
+        if max_points and not (start_date and end_date):
+            first_date, last_date = (
+                db.session.query(func.min(Event.date), func.max(Event.date))
+                .join(Registration, Registration.event_id == Event.id)
+                .filter(*filters)
+                .one()
+            )
+            start_date = start_date or first_date
+            end_date = end_date or last_date
+        bucket = choose_timeseries_bucket(start_date, end_date, max_points) if max_points else "day"
+
+    period = func.date_trunc(bucket, Event.date, type_=db.DateTime).label("period")
+    rows = (
+        db.session.query(period, func.count(Registration.id))
+        .join(Registration, Registration.event_id == Event.id)
+        .filter(*filters)
+        .group_by(period)
+        .order_by(period.asc())
+        .all()
+    )
+    points = [
+        {"date": str(period_start.date()), "registrations": count}
+        for period_start, count in rows if period_start is not None
+    ]
+
+    if max_points and len(points) > max_points:
+        points = downsample_timeseries(points, max_points, start_date, end_date)
+    return points, bucket
+
+
+def get_event_analytics(email=None, leader_id=None, club_ids=None, start_date=None, end_date=None,
+                        bucket="day", max_points=None):
     """Get comprehensive event analytics data for AI processing."""
     try:
         event_filter = None
@@ -1044,17 +2043,24 @@ def get_event_analytics(email=None, leader_id=None, club_ids=None):
         popular_clubs_query = popular_clubs_query.group_by(Club.name).order_by(func.count(Registration.id).desc()).limit(10)
         popular_clubs = [{"name": name, "registrations": count} for name, count in popular_clubs_query.all()]
         
-        date_query = (
-            db.session.query(Event.date, func.count(Registration.id).label("count"))
-            .join(Registration, Registration.event_id == Event.id)
-            .filter(Registration.cancelled == False)
-        )
-        if filter_club_ids:
-            date_query = date_query.filter(event_filter)
-        if email:
-            date_query = date_query.filter(Registration.email == email)
-        date_query = date_query.group_by(Event.date).order_by(Event.date.desc()).limit(30)
-        registrations_by_date = [{"date": str(date), "count": count} for date, count in date_query.all()]
+        if start_date or end_date or max_points:
+            points, _ = get_registration_timeseries(
+                start_date, end_date, bucket, max_points,
+                event_filter=event_filter if filter_club_ids else None, email=email
+            )
+            registrations_by_date = [{"date": p["date"], "count": p["registrations"]} for p in points]
+        else:
+            date_query = (
+                db.session.query(Event.date, func.count(Registration.id).label("count"))
+                .join(Registration, Registration.event_id == Event.id)
+                .filter(Registration.cancelled == False)
+            )
+            if filter_club_ids:
+                date_query = date_query.filter(event_filter)
+            if email:
+                date_query = date_query.filter(Registration.email == email)
+            date_query = date_query.group_by(Event.date).order_by(Event.date.desc()).limit(30)
+            registrations_by_date = [{"date": str(date), "count": count} for date, count in date_query.all()]
     except Exception as e:
         print(f"Error in get_event_analytics: {str(e)}")
         raise
@@ -1167,6 +2173,94 @@ def get_attendance_stats(event_id=None, leader_id=None):
         return {"events": stats, "total_events": len(stats)}
 
 
+def get_leader_event_rows(club_ids):
+    """Per-event registration, check-in and cancellation counts for a set of clubs in one grouped query."""
+    if not club_ids:
+        return []
+    return (
+        db.session.query(
+            Event,
+            Club.name.label("club_name"),
+            func.coalesce(func.sum(case((Registration.cancelled == False, 1), else_=0)), 0).label("registrations"),
+            func.coalesce(func.sum(case((Registration.checked_in == True, 1), else_=0)), 0).label("checked_in"),
+            func.coalesce(func.sum(case((Registration.cancelled == True, 1), else_=0)), 0).label("cancelled")
+        )
+        .join(Club, Event.club_id == Club.id)
+        .outerjoin(Registration, Registration.event_id == Event.id)
+        .filter(Event.club_id.in_(club_ids))
+        .group_by(Event.id, Club.name)
+        .order_by(Event.date.asc(), Event.time.asc())
+        .all()
+    )
+
+
+def build_leader_dashboard(leader_id, upcoming_limit=5, recent_check_in_limit=10):
+    """Build the leader dashboard payload: totals, per-event counts, upcoming events and recent check-ins."""
+    clubs = Club.query.filter_by(leader_id=leader_id).all()
+    club_ids = [club.id for club in clubs]
+    event_rows = get_leader_event_rows(club_ids)
+    # UTC, like the snapshot freshness check in leader_dashboard
+    today = datetime.utcnow().date()
+    
+    events = []
+    for event, club_name, registrations, checked_in, cancelled in event_rows:
+        events.append({
+            "id": event.id,
+            "club_id": event.club_id,
+            "club_name": club_name,
+            "title": event.title,
+            "date": str(event.date),
+            "time": str(event.time),
+            "location": event.location,
+            "registration_count": registrations,
+            "checked_in_count": checked_in,
+            "cancelled_count": cancelled,
+            "attendance_rate": round((checked_in / registrations * 100) if registrations > 0 else 0, 2),
+            "is_upcoming": event.date >= today
+        })
+    
+    total_registrations = sum(e["registration_count"] for e in events)
+    total_attendees = sum(e["checked_in_count"] for e in events)
+    
+    recent_check_ins = []
+    if club_ids:
+        check_in_rows = (
+            db.session.query(Registration, Event.title)
+            .join(Event, Registration.event_id == Event.id)
+            .filter(Event.club_id.in_(club_ids), Registration.checked_in == True)
+            .order_by(Registration.checked_in_at.desc().nullslast(), Registration.id.desc())
+            .limit(recent_check_in_limit)
+            .all()
+        )
+        recent_check_ins = [
+            {
+                "registration_id": reg.id,
+                "event_id": reg.event_id,
+                "event_title": event_title,
+                "participant_name": reg.participant_name,
+                "email": reg.email,
+                "checked_in_at": str(reg.checked_in_at) if reg.checked_in_at else None
+            }
+            for reg, event_title in check_in_rows
+        ]
+    
+    return {
+        "totals": {
+            "total_clubs": len(clubs),
+            "total_events": len(events),
+            "upcoming_events": sum(1 for e in events if e["is_upcoming"]),
+            "total_registrations": total_registrations,
+            "total_attendees": total_attendees,
+            "total_cancelled": sum(e["cancelled_count"] for e in events),
+            "attendance_rate": round((total_attendees / total_registrations * 100) if total_registrations > 0 else 0, 2)
+        },
+        "clubs": [club.to_dict() for club in clubs],
+        "events": events,
+        "upcoming_events": [e for e in events if e["is_upcoming"]][:upcoming_limit],
+        "recent_check_ins": recent_check_ins
+    }
+
+
 def build_leader_insight_prompt(analytics_data):
     """Build a formatted prompt for AI leader insights generation."""
     prompt = f"""You are a business intelligence AI that generates performance insights for university event organizers and club leaders.
@@ -1259,6 +2353,846 @@ Be specific and reference their past interests, preferred category, and day pref
     return prompt
 
 
+# ============================================================================
+# ICALENDAR (RFC 5545) PARSING
+# ============================================================================
+
+ICAL_EXPANSION_PAST_DAYS = 180
+ICAL_EXPANSION_FUTURE_DAYS = 400
+ICAL_MAX_OCCURRENCES = 1000
+ICAL_MAX_RRULE_PERIODS = 50000
+ICAL_BATCH_SIZE = 1000
+ICAL_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+ICAL_RRULE_PARTS = {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY", "BYMONTH", "WKST"}
+ICAL_DURATION_RE = re.compile(
+    r"^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$"
+)
+ICAL_ESCAPE_RE = re.compile(r"\\([\\;,nN])")
+
+
+def iter_ical_lines(stream):
+    """Yield unfolded content lines from an iterable of byte or text lines."""
+    pending = None
+    for raw in stream:
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        raw = raw.rstrip("\r\n")
+        # A folded line continues the previous one after a single space or tab
+        if raw[:1] in (" ", "\t"):
+            if pending is not None:
+                pending += raw[1:]
+            continue
+        if pending:
+            yield pending
+        pending = raw.lstrip("\ufeff")
+    if pending:
+        yield pending
+
+
+def parse_ical_content_line(line):
+    """Split a content line into (NAME, {PARAM: value}, value)."""
+    colon = line.find(":")
+    if colon == -1:
+        return None, {}, ""
+    if '"' in line[:colon]:
+        # Quoted parameter values may themselves contain colons
+        in_quotes = False
+        for colon, char in enumerate(line):
+            if char == '"':
+                in_quotes = not in_quotes
+            elif char == ":" and not in_quotes:
+                break
+    parts = line[:colon].split(";")
+    params = {}
+    for part in parts[1:]:
+        key, _, param_value = part.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return parts[0].upper(), params, line[colon + 1:]
+
+
+def unescape_ical_text(value):
+    """Undo TEXT value escaping of newlines, commas, semicolons and backslashes."""
+    if not value or "\\" not in value:
+        return value or ""
+    return ICAL_ESCAPE_RE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+@lru_cache(maxsize=64)
+def get_ical_timezone(tzid):
+    """Resolve a TZID to a ZoneInfo, or None when unknown (treated as floating time)."""
+    candidates = [tzid.strip().strip("/")]
+    # Some producers prefix the Olson name, e.g. /mozilla.org/20050126_1/America/New_York
+    segments = candidates[0].split("/")
+    if len(segments) > 2:
+        candidates.append("/".join(segments[-2:]))
+    for candidate in candidates:
+        try:
+            return ZoneInfo(candidate)
+        except Exception:
+            continue
+    return None
+
+
+def get_campus_timezone():
+    """The campus timezone that imported calendar times are converted to."""
+    return get_ical_timezone(CAMPUS_TIMEZONE) or timezone.utc
+
+
+def parse_ical_value(value, params):
+    """Parse a DATE or DATE-TIME value into (wall-clock datetime, tzinfo or None, is_all_day)."""
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d"), None, True
+    tz = None
+    if value.endswith("Z"):
+        value, tz = value[:-1], timezone.utc
+    elif params.get("TZID"):
+        tz = get_ical_timezone(params["TZID"])
+    parsed = datetime.strptime(value, "%Y%m%dT%H%M%S" if len(value) >= 15 else "%Y%m%dT%H%M")
+    return parsed, tz, False
+
+
+def to_campus_time(wall_clock, tz, campus_tz):
+    """Convert a wall-clock time in tz to a naive campus-local datetime (floating times stay as-is)."""
+    if tz is None:
+        return wall_clock
+    return wall_clock.replace(tzinfo=tz).astimezone(campus_tz).replace(tzinfo=None)
+
+
+def parse_ical_duration(value):
+    """Parse an RFC 5545 DURATION (e.g. PT1H30M, P1D) into a timedelta."""
+    match = ICAL_DURATION_RE.match(value.strip())
+    if not match:
+        return None
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    delta = timedelta(
+        weeks=int(weeks or 0), days=int(days or 0),
+        hours=int(hours or 0), minutes=int(minutes or 0), seconds=int(seconds or 0)
+    )
+    return -delta if sign == "-" else delta
+
+
+def _rrule_month_candidates(start, year, month, parts):
+    """Occurrence starts inside one month for MONTHLY/YEARLY rules."""
+    days_in_month = monthrange(year, month)[1]
+    days = set()
+    if "BYMONTHDAY" in parts:
+        for token in parts["BYMONTHDAY"].split(","):
+            day = int(token)
+            day = day if day > 0 else days_in_month + day + 1
+            if 1 <= day <= days_in_month:
+                days.add(day)
+    elif "BYDAY" in parts:
+        for token in parts["BYDAY"].split(","):
+            weekday = ICAL_WEEKDAYS.get(token[-2:])
+            if weekday is None:
+                continue
+            first = (weekday - date(year, month, 1).weekday()) % 7 + 1
+            matching = list(range(first, days_in_month + 1, 7))
+            ordinal = token[:-2].lstrip("+")
+            if not ordinal:
+                days.update(matching)
+            elif 0 < abs(int(ordinal)) <= len(matching):
+                n = int(ordinal)
+                days.add(matching[n - 1] if n > 0 else matching[n])
+    elif start.day <= days_in_month:
+        days.add(start.day)
+    return [start.replace(year=year, month=month, day=day) for day in sorted(days)]
+
+
+def _rrule_period_candidates(start, freq, interval, parts, period):
+    """Sorted occurrence starts for the period-th FREQ period after DTSTART."""
+    if freq == "DAILY":
+        return [start + timedelta(days=period * interval)]
+    if freq == "WEEKLY":
+        week_start = start - timedelta(days=start.weekday()) + timedelta(weeks=period * interval)
+        weekdays = {start.weekday()}
+        if "BYDAY" in parts:
+            weekdays = {ICAL_WEEKDAYS[t[-2:]] for t in parts["BYDAY"].split(",") if t[-2:] in ICAL_WEEKDAYS}
+        return [week_start + timedelta(days=day) for day in sorted(weekdays)]
+    if freq == "MONTHLY":
+        month_index = start.month - 1 + period * interval
+        return _rrule_month_candidates(start, start.year + month_index // 12, month_index % 12 + 1, parts)
+    # YEARLY
+    year = start.year + period * interval
+    months = sorted(int(m) for m in parts["BYMONTH"].split(",")) if "BYMONTH" in parts else [start.month]
+    candidates = []
+    for month in months:
+        candidates.extend(_rrule_month_candidates(start, year, month, parts))
+    return candidates
+
+
+def expand_ical_rrule(event, window_start, window_end, campus_tz):
+    """Yield campus-local occurrence starts of a recurring event inside the window.
+
+    Supports FREQ=DAILY/WEEKLY/MONTHLY/YEARLY with INTERVAL, COUNT, UNTIL,
+    BYDAY (with ordinals for monthly rules), BYMONTHDAY and BYMONTH. Other
+    rules fall back to the first occurrence only.
+    """
+    start, tz = event["_wall_start"], event["_tz"]
+    parts = dict(part.split("=", 1) for part in event["rrule"].upper().split(";") if "=" in part)
+    freq = parts.get("FREQ")
+    exdates = event["_exdates"]
+
+    if freq not in ("DAILY", "WEEKLY", "MONTHLY", "YEARLY") or set(parts) - ICAL_RRULE_PARTS:
+        if window_start <= event["start"] <= window_end and event["start"] not in exdates:
+            yield event["start"]
+        return
+
+    interval = max(int(parts.get("INTERVAL", "1")), 1)
+    count = int(parts["COUNT"]) if "COUNT" in parts else None
+    until = None
+    if "UNTIL" in parts:
+        until_wall, until_tz, until_all_day = parse_ical_value(parts["UNTIL"], {})
+        if until_all_day:
+            until_wall += timedelta(days=1, microseconds=-1)
+        until = to_campus_time(until_wall, until_tz or tz, campus_tz)
+
+    seen = 0
+    emitted = 0
+    for period in range(ICAL_MAX_RRULE_PERIODS):
+        for wall_clock in _rrule_period_candidates(start, freq, interval, parts, period):
+            if wall_clock < start:
+                continue
+            occurrence = to_campus_time(wall_clock, tz, campus_tz)
+            if (until and occurrence > until) or occurrence > window_end:
+                return
+            seen += 1
+            if count and seen > count:
+                return
+            if occurrence >= window_start and occurrence not in exdates:
+                yield occurrence
+                emitted += 1
+                if emitted >= ICAL_MAX_OCCURRENCES:
+                    return
+
+
+def build_ical_event(props, campus_tz):
+    """Turn the collected properties of one VEVENT into an event dict (None if unusable)."""
+    if "DTSTART" not in props:
+        return None
+    start_params, start_value = props["DTSTART"]
+    wall_start, tz, all_day = parse_ical_value(start_value, start_params)
+    start = to_campus_time(wall_start, tz, campus_tz)
+
+    if "DTEND" in props:
+        end_wall, end_tz, _ = parse_ical_value(props["DTEND"][1], props["DTEND"][0])
+        end = to_campus_time(end_wall, end_tz, campus_tz)
+    elif "DURATION" in props:
+        end = start + (parse_ical_duration(props["DURATION"][1]) or timedelta(0))
+    else:
+        end = start + timedelta(days=1) if all_day else start
+
+    recurrence_id = None
+    if "RECURRENCE-ID" in props:
+        rid_wall, rid_tz, _ = parse_ical_value(props["RECURRENCE-ID"][1], props["RECURRENCE-ID"][0])
+        recurrence_id = to_campus_time(rid_wall, rid_tz, campus_tz)
+
+    last_modified = None
+    if "LAST-MODIFIED" in props:
+        lm_wall, lm_tz, _ = parse_ical_value(props["LAST-MODIFIED"][1], props["LAST-MODIFIED"][0])
+        last_modified = to_campus_time(lm_wall, lm_tz, timezone.utc)
+
+    exdates = set()
+    for params, value in props.get("EXDATE", []):
+        for item in value.split(","):
+            if item.strip():
+                ex_wall, ex_tz, _ = parse_ical_value(item, params)
+                exdates.add(to_campus_time(ex_wall, ex_tz or tz, campus_tz))
+
+    sequence = props.get("SEQUENCE", ({}, "0"))[1].strip()
+    return {
+        "uid": props.get("UID", ({}, ""))[1].strip() or None,
+        "recurrence_id": recurrence_id,
+        "title": (unescape_ical_text(props.get("SUMMARY", ({}, ""))[1]).strip() or "University Event")[:200],
+        "description": unescape_ical_text(props.get("DESCRIPTION", ({}, ""))[1]),
+        "location": unescape_ical_text(props.get("LOCATION", ({}, ""))[1])[:200],
+        "start": start,
+        "end": max(end, start),
+        "all_day": all_day,
+        "sequence": int(sequence) if sequence.isdigit() else 0,
+        "last_modified": last_modified,
+        "status": props.get("STATUS", ({}, ""))[1].strip().upper(),
+        "rrule": props.get("RRULE", ({}, ""))[1].strip() or None,
+        "_wall_start": wall_start,
+        "_tz": tz,
+        "_exdates": exdates
+    }
+
+
+def _public_ical_event(event, start=None, recurrence_id=None):
+    """Strip parser internals; for expanded occurrences shift start/end to the instance."""
+    result = {key: value for key, value in event.items() if not key.startswith("_") and key != "rrule"}
+    if start is not None:
+        result["end"] = start + (event["end"] - event["start"])
+        result["start"] = start
+        result["recurrence_id"] = recurrence_id
+    return result
+
+
+def parse_ical_stream(stream, window_start=None, window_end=None, campus_tz=None):
+    """Stream the VEVENTs of an iCalendar feed as event dicts.
+
+    Lines are unfolded as they are read, TZID/UTC times are converted to the
+    campus timezone, all-day events keep midnight starts, and RRULEs are
+    expanded inside [window_start, window_end]. Single events are yielded as
+    soon as they close; only recurring masters are held until the end so that
+    instances overridden by a RECURRENCE-ID are not emitted twice.
+    """
+    now = datetime.utcnow()
+    window_start = window_start or now - timedelta(days=ICAL_EXPANSION_PAST_DAYS)
+    window_end = window_end or now + timedelta(days=ICAL_EXPANSION_FUTURE_DAYS)
+    campus_tz = campus_tz or get_campus_timezone()
+
+    masters = []
+    overridden = set()
+    props = None
+    depth = 0  # nesting of sub-components (e.g. VALARM) inside the current VEVENT
+
+    for line in iter_ical_lines(stream):
+        name, params, value = parse_ical_content_line(line)
+        if name == "BEGIN":
+            if props is not None:
+                depth += 1
+            elif value.strip().upper() == "VEVENT":
+                props = {}
+            continue
+        if name == "END":
+            if props is None:
+                continue
+            if depth:
+                depth -= 1
+                continue
+            try:
+                event = build_ical_event(props, campus_tz)
+            except (ValueError, KeyError) as parse_err:
+                print(f"Error parsing event: {parse_err}")
+                event = None
+            props = None
+            if event is None:
+                continue
+            if event["rrule"] and event["recurrence_id"] is None:
+                masters.append(event)
+                continue
+            if event["recurrence_id"] is not None:
+                overridden.add((event["uid"], event["recurrence_id"]))
+            if event["status"] != "CANCELLED":
+                yield _public_ical_event(event)
+            continue
+        if props is None or depth or name is None:
+            continue
+        if name == "EXDATE":
+            props.setdefault("EXDATE", []).append((params, value))
+        elif name not in props:
+            props[name] = (params, value)
+
+    for event in masters:
+        if event["status"] == "CANCELLED":
+            continue
+        try:
+            for occurrence in expand_ical_rrule(event, window_start, window_end, campus_tz):
+                if (event["uid"], occurrence) not in overridden:
+                    yield _public_ical_event(event, occurrence, occurrence)
+        except ValueError as rule_err:
+            print(f"Error expanding RRULE for {event['uid']}: {rule_err}")
+
+
+CALENDAR_DIFF_FIELDS = ("title", "description", "start_datetime", "end_datetime", "location")
+
+
+def calendar_event_key(item):
+    """Stable identity of a parsed calendar entry: UID, plus RECURRENCE-ID for instances."""
+    key = item["uid"] or "nouid:" + hashlib.sha1(
+        f"{item['title']}|{item['start']}|{item['end']}".encode("utf-8")
+    ).hexdigest()
+    if item["recurrence_id"] is not None:
+        key += "/" + item["recurrence_id"].strftime("%Y%m%dT%H%M%S")
+    return key[:600]
+
+
+def sync_calendar_events(model, scope, items, preview=None):
+    """Diff parsed iCal items against the stored rows in scope and apply only the changes.
+
+    Rows are matched on event_key. When SEQUENCE and LAST-MODIFIED are both
+    unchanged the row is taken as unchanged; otherwise the stored fields are
+    compared. New keys are bulk-inserted, changed rows bulk-updated by primary
+    key and keys missing from the feed deleted. Returns the change counts.
+    """
+    columns = [getattr(model, field) for field in CALENDAR_DIFF_FIELDS]
+    stored = (
+        db.session.query(model.id, model.event_key, model.sequence, model.last_modified, *columns)
+        .filter(*[getattr(model, column) == value for column, value in scope.items()])
+    )
+    existing = {}
+    stale_ids = []
+    for row in stored:
+        # Rows imported before keys existed (or duplicates) are replaced
+        if row.event_key is None or row.event_key in existing:
+            stale_ids.append(row.id)
+        else:
+            existing[row.event_key] = row
+
+    counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    seen = set()
+    inserts = []
+    updates = []
+    created_at = datetime.utcnow()
+
+    for item in items:
+        key = calendar_event_key(item)
+        if key in seen:
+            continue
+        seen.add(key)
+        if preview is not None and len(preview) < 10:
+            preview.append(item)
+
+        values = {
+            "title": item["title"],
+            "description": item["description"],
+            "start_datetime": item["start"],
+            "end_datetime": item["end"],
+            "location": item["location"],
+            "sequence": item["sequence"],
+            "last_modified": item["last_modified"]
+        }
+        current = existing.get(key)
+        if current is None:
+            inserts.append({**scope, **values, "event_key": key, "created_at": created_at})
+        elif current.sequence == item["sequence"] and current.last_modified == item["last_modified"] and (
+            item["last_modified"] is not None
+            or all(getattr(current, field) == values[field] for field in CALENDAR_DIFF_FIELDS)
+        ):
+            counts["unchanged"] += 1
+        else:
+            updates.append({"id": current.id, **values})
+
+        if len(inserts) >= ICAL_BATCH_SIZE:
+            db.session.execute(insert(model), inserts)
+            counts["inserted"] += len(inserts)
+            inserts = []
+        if len(updates) >= ICAL_BATCH_SIZE:
+            db.session.execute(update(model), updates)
+            counts["updated"] += len(updates)
+            updates = []
+
+    if inserts:
+        db.session.execute(insert(model), inserts)
+        counts["inserted"] += len(inserts)
+    if updates:
+        db.session.execute(update(model), updates)
+        counts["updated"] += len(updates)
+
+    removed_ids = stale_ids + [row.id for key, row in existing.items() if key not in seen]
+    for offset in range(0, len(removed_ids), ICAL_BATCH_SIZE):
+        db.session.execute(
+            delete(model)
+            .where(model.id.in_(removed_ids[offset:offset + ICAL_BATCH_SIZE]))
+            .execution_options(synchronize_session=False)
+        )
+    counts["deleted"] = len(removed_ids)
+    return counts
+
+
+# ============================================================================
+# CALENDAR FEED SCHEDULER
+# ============================================================================
+
+def check_calendar_url(url):
+    """Reject feed URLs that are not http(s) or that resolve to a private, loopback or reserved address."""
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("Calendar URL must be an http or https URL")
+    if CALENDAR_ALLOW_PRIVATE_HOSTS:
+        return
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(parsed.hostname, parsed.port or None)}
+    except socket.gaierror:
+        raise ValueError(f"Calendar host {parsed.hostname} could not be resolved")
+    for address in addresses:
+        if not ipaddress.ip_address(address.split("%")[0]).is_global:
+            raise ValueError(f"Calendar host {parsed.hostname} is not a public address")
+
+
+class CalendarRedirectHandler(urllib.request.HTTPRedirectHandler):
+    """Apply check_calendar_url to every redirect target as well."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        check_calendar_url(newurl)
+        return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+
+calendar_feed_opener = urllib.request.build_opener(CalendarRedirectHandler)
+
+
+def fetch_calendar_feed(url, etag=None, last_modified=None, timeout=None):
+    """Conditionally GET an iCal URL. Returns (status, response); response is None on 304."""
+    check_calendar_url(url)
+    headers = {"User-Agent": "StudentClubHub-CalendarSync/1.0", "Accept": "text/calendar, */*"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    feed_request = urllib.request.Request(url, headers=headers)
+    try:
+        response = calendar_feed_opener.open(feed_request, timeout=timeout or CALENDAR_FETCH_TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, None
+        raise
+    return response.status, response
+
+
+def register_calendar_feed(url, response=None):
+    """Make sure the scheduler polls url; a newly seen feed keeps the validators of response."""
+    if CalendarFeed.query.filter_by(url=url).first():
+        return
+    feed = CalendarFeed(url=url, next_fetch_at=datetime.utcnow())
+    if response is not None:
+        feed.etag = response.headers.get("ETag")
+        feed.last_modified = response.headers.get("Last-Modified")
+        feed.last_status = response.status
+        feed.last_checked_at = feed.last_changed_at = datetime.utcnow()
+        feed.next_fetch_at = datetime.utcnow() + timedelta(minutes=CALENDAR_REFRESH_MINUTES)
+    db.session.add(feed)
+
+
+def ensure_calendar_feeds():
+    """Register a feed for every distinct URL that official or participant calendars use."""
+    urls = {
+        url for (url,) in db.session.query(UniversityOfficialCalendar.calendar_url)
+        .filter(UniversityOfficialCalendar.calendar_url.isnot(None)).distinct()
+    }
+    urls |= {
+        url for (url,) in db.session.query(UniversityCalendarEvent.calendar_url)
+        .filter(UniversityCalendarEvent.calendar_url.isnot(None)).distinct()
+    }
+    known = {url for (url,) in db.session.query(CalendarFeed.url)}
+    for url in urls - known:
+        db.session.add(CalendarFeed(url=url, next_fetch_at=datetime.utcnow()))
+    try:
+        db.session.commit()
+    except Exception:
+        # Another worker registered the same URL first
+        db.session.rollback()
+
+
+def refresh_calendar_feed(feed):
+    """Fetch one feed with its validators and apply it to every calendar subscribed to the URL.
+
+    A 304 skips parsing entirely. Otherwise the body is parsed once and
+    diffed into each subscribing official calendar and participant.
+    """
+    url = feed.url
+    official_ids = [
+        calendar_id for (calendar_id,) in
+        db.session.query(UniversityOfficialCalendar.id).filter_by(calendar_url=url)
+    ]
+    user_ids = [
+        user_id for (user_id,) in
+        db.session.query(UniversityCalendarEvent.user_id).filter_by(calendar_url=url).distinct()
+    ]
+    if not official_ids and not user_ids:
+        db.session.delete(feed)
+        db.session.commit()
+        return {"url": url, "status": "unsubscribed"}
+
+    now = datetime.utcnow()
+    status, response = fetch_calendar_feed(url, feed.etag, feed.last_modified)
+    feed.last_status = status
+    feed.last_checked_at = now
+    feed.last_error = None
+    subscribers = len(official_ids) + len(user_ids)
+    if response is None:
+        db.session.commit()
+        return {"url": url, "status": 304, "subscribers": subscribers}
+
+    with response:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        items = list(parse_ical_stream(response))
+
+    changes = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    scopes = [(UniversityOfficialCalendarEvent, {"calendar_id": calendar_id}) for calendar_id in official_ids]
+    scopes += [(UniversityCalendarEvent, {"user_id": user_id, "calendar_url": url}) for user_id in user_ids]
+    for model, scope in scopes:
+        for key, count in sync_calendar_events(model, scope, items).items():
+            changes[key] += count
+    if official_ids:
+        db.session.query(UniversityOfficialCalendar).filter(
+            UniversityOfficialCalendar.id.in_(official_ids)
+        ).update({"last_synced": now}, synchronize_session=False)
+
+    feed.etag = etag
+    feed.last_modified = last_modified
+    feed.last_changed_at = now
+    db.session.commit()
+    return {"url": url, "status": status, "subscribers": subscribers, "events": len(items), "changes": changes}
+
+
+def run_calendar_refresh_cycle(interval_minutes=None):
+    """Refresh every due feed once.
+
+    Each feed is claimed with a conditional UPDATE of next_fetch_at, so with
+    several workers running the scheduler every URL is still fetched once.
+    """
+    interval = timedelta(minutes=max(interval_minutes or CALENDAR_REFRESH_MINUTES, 1))
+    now = datetime.utcnow()
+    due_ids = [
+        feed_id for (feed_id,) in
+        db.session.query(CalendarFeed.id).filter(CalendarFeed.next_fetch_at <= now)
+    ]
+    results = []
+    for feed_id in due_ids:
+        claimed = db.session.execute(
+            update(CalendarFeed)
+            .where(CalendarFeed.id == feed_id, CalendarFeed.next_fetch_at <= now)
+            .values(next_fetch_at=now + interval)
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            continue
+        feed = CalendarFeed.query.get(feed_id)
+        url = feed.url
+        try:
+            results.append(refresh_calendar_feed(feed))
+        except Exception as e:
+            db.session.rollback()
+            db.session.execute(
+                update(CalendarFeed)
+                .where(CalendarFeed.id == feed_id)
+                .values(last_error=str(e)[:1000], last_checked_at=datetime.utcnow())
+            )
+            db.session.commit()
+            print(f"❌ Calendar feed refresh failed for {url}: {e}")
+            results.append({"url": url, "status": "error", "error": str(e)})
+    return results
+
+
+class CalendarFeedScheduler:
+    """Background thread that periodically runs run_calendar_refresh_cycle."""
+
+    def __init__(self, tick_seconds=60):
+        self.tick_seconds = tick_seconds
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, app):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(app,), daemon=True, name="calendar-feed-scheduler"
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, app):
+        with app.app_context():
+            try:
+                ensure_calendar_feeds()
+            except Exception as e:
+                print(f"Calendar feed registration failed: {e}")
+            finally:
+                db.session.remove()
+        while not self._stop.wait(self.tick_seconds):
+            with app.app_context():
+                try:
+                    run_calendar_refresh_cycle()
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Calendar feed refresh cycle failed: {e}")
+                finally:
+                    db.session.remove()
+
+
+calendar_feed_scheduler = CalendarFeedScheduler()
+
+
+# ============================================================================
+# OFFICIAL CALENDAR CLASH INDEX
+# ============================================================================
+
+def event_interval(event_date, event_time, duration_minutes=None):
+    """Half-open [start, end) datetime interval occupied by a club event."""
+    start = datetime.combine(event_date, event_time)
+    return start, start + timedelta(minutes=duration_minutes or EVENT_DEFAULT_DURATION_MINUTES)
+
+
+class IntervalTree:
+    """Static centered interval tree over half-open (start, end, payload) intervals.
+
+    Built in O(m log m); a query reports the k overlapping intervals in
+    O(log m + k), however long the individual intervals are.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals):
+        starts = sorted(interval[0] for interval in intervals)
+        # The median start always stays at this node, so the recursion shrinks
+        self.center = center = starts[len(starts) // 2]
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] <= center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here, key=lambda interval: interval[0])
+        self.by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        self.left = IntervalTree(left) if left else None
+        self.right = IntervalTree(right) if right else None
+
+    def overlapping(self, start, end):
+        """Payload tuples of all intervals overlapping [start, end)."""
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if end <= node.center:
+                for interval in node.by_start:
+                    if interval[0] >= end:
+                        break
+                    found.append(interval)
+                if node.left:
+                    stack.append(node.left)
+            elif start > node.center:
+                for interval in node.by_end:
+                    if interval[1] <= start:
+                        break
+                    found.append(interval)
+                if node.right:
+                    stack.append(node.right)
+            else:
+                found.extend(node.by_start)
+                if node.left:
+                    stack.append(node.left)
+                if node.right:
+                    stack.append(node.right)
+        return found
+
+
+def sweep_interval_overlaps(left, right):
+    """All overlapping (left, right) pairs between two interval lists in O((n+m) log(n+m) + k).
+
+    Endpoints are swept in time order with ends before starts at equal
+    times, so touching intervals do not clash. Each pair is reported once,
+    by whichever interval starts second.
+    """
+    points = []
+    for side, intervals in ((0, left), (1, right)):
+        for index, interval in enumerate(intervals):
+            points.append((interval[0], 1, side, index))
+            points.append((interval[1], 0, side, index))
+    points.sort(key=lambda point: (point[0], point[1]))
+
+    active = ({}, {})
+    pairs = []
+    for _, is_start, side, index in points:
+        if not is_start:
+            active[side].pop(index, None)
+            continue
+        interval = (left, right)[side][index]
+        for other in active[1 - side].values():
+            pairs.append((interval, other) if side == 0 else (other, interval))
+        active[side][index] = interval
+    return pairs
+
+
+class OfficialCalendarIndex:
+    """In-process interval index over official calendar entries.
+
+    Each calendar's entries are cached with the last_synced stamp they were
+    loaded at. Every lookup compares the stamps (one small query), reloads
+    only calendars that were synced since, by any worker, and rebuilds the
+    in-memory tree from the cached entries.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calendars = {}  # calendar_id -> (last_synced, name, entries)
+        self._tree = None
+
+    def refresh(self):
+        """Bring the index up to date with the official calendars; returns the current tree."""
+        stamps = {
+            calendar_id: (last_synced, name) for calendar_id, last_synced, name in
+            db.session.query(
+                UniversityOfficialCalendar.id,
+                UniversityOfficialCalendar.last_synced,
+                UniversityOfficialCalendar.calendar_name
+            )
+        }
+        with self._lock:
+            stale = [
+                calendar_id for calendar_id, (last_synced, _) in stamps.items()
+                if calendar_id not in self._calendars or self._calendars[calendar_id][0] != last_synced
+            ]
+            removed = [calendar_id for calendar_id in self._calendars if calendar_id not in stamps]
+            if not stale and not removed:
+                return self._tree
+
+            for calendar_id in removed:
+                del self._calendars[calendar_id]
+            for calendar_id in stale:
+                last_synced, name = stamps[calendar_id]
+                entries = [
+                    (row.start_datetime, row.end_datetime, row.id, calendar_id, row.title)
+                    for row in db.session.query(
+                        UniversityOfficialCalendarEvent.id,
+                        UniversityOfficialCalendarEvent.title,
+                        UniversityOfficialCalendarEvent.start_datetime,
+                        UniversityOfficialCalendarEvent.end_datetime
+                    ).filter(UniversityOfficialCalendarEvent.calendar_id == calendar_id)
+                    if row.end_datetime > row.start_datetime
+                ]
+                self._calendars[calendar_id] = (last_synced, name, entries)
+
+            intervals = [entry for _, _, entries in self._calendars.values() for entry in entries]
+            self._tree = IntervalTree(intervals) if intervals else None
+            return self._tree
+
+    def calendar_name(self, calendar_id):
+        cached = self._calendars.get(calendar_id)
+        return cached[1] if cached else None
+
+    def overlapping(self, start, end):
+        """Official entries overlapping [start, end), ordered by start."""
+        tree = self.refresh()
+        if tree is None:
+            return []
+        return sorted(tree.overlapping(start, end))
+
+    def entry_to_dict(self, entry):
+        start, end, entry_id, calendar_id, title = entry
+        return {
+            "id": entry_id,
+            "calendar_id": calendar_id,
+            "calendar_name": self.calendar_name(calendar_id),
+            "title": title,
+            "start_datetime": str(start),
+            "end_datetime": str(end)
+        }
+
+
+official_calendar_index = OfficialCalendarIndex()
+
+
+def find_official_clashes(event_date, event_time, duration_minutes=None):
+    """Official calendar entries overlapping a club event slot (empty if the lookup fails)."""
+    try:
+        start, end = event_interval(event_date, event_time, duration_minutes)
+        return [official_calendar_index.entry_to_dict(entry) for entry in official_calendar_index.overlapping(start, end)]
+    except Exception as clash_err:
+        print(f"Official calendar clash lookup failed: {clash_err}")
+        return []
+
+
 # ============================================================================
 # SECTION 5: ROUTE BLUEPRINTS - GENERAL
 # ============================================================================
@@ -1573,9 +3507,14 @@ def get_clubs():
 
 events_bp = Blueprint("events", __name__)
 
+def qr_payload(registration_id, event_id, participant_name, participant_email):
+    """Text encoded in a registration's check-in QR code."""
+    return f"REG:{registration_id}|EVT:{event_id}|NAME:{participant_name}|EMAIL:{participant_email}"
+
+
 def _generate_qr_for_registration(registration, event, participant_name, participant_email):
     """Generate QR code for a registration."""
-    qr_data = f"REG:{registration.id}|EVT:{event.id}|NAME:{participant_name}|EMAIL:{participant_email}"
+    qr_data = qr_payload(registration.id, event.id, participant_name, participant_email)
     qr_img = qrcode.make(qr_data)
     safe_email = sanitize_filename(participant_email)
     filename = f"registration_{registration.id}_{safe_email}.png"
@@ -1637,6 +3576,210 @@ def get_poster_image(filename):
         return jsonify({"error": str(e)}), 500
 
 
+VENUE_ABBREVIATIONS = {
+    "rm": "room", "bldg": "building", "blk": "block", "flr": "floor",
+    "aud": "auditorium", "hse": "house", "ctr": "center", "centre": "center"
+}
+
+
+# Locations that are not a physical room: any of these words ("Online via Zoom",
+# a meeting link) or one of the placeholder phrases ("TBA") never gets a venue
+VIRTUAL_VENUE_WORDS = frozenset(
+    "online virtual zoom teams meet webinar webex skype discord livestream remote http https www".split()
+)
+PLACEHOLDER_VENUE_NAMES = frozenset({
+    "tba", "tbd", "tbc", "to be announced", "to be decided", "to be determined", "to be confirmed",
+    "na", "n a", "none", "various", "multiple", "everywhere"
+})
+
+
+def normalize_venue_name(location):
+    """Canonical key of a free-text location, so "Rm. 101, Bldg A" and "room 101 building a" match."""
+    words = re.sub(r"[^a-z0-9]+", " ", (location or "").lower()).split()
+    return " ".join(VENUE_ABBREVIATIONS.get(word, word) for word in words)[:200]
+
+
+def is_bookable_venue(key):
+    """Whether a normalized location names a physical venue that can be double-booked."""
+    return bool(key) and key not in PLACEHOLDER_VENUE_NAMES and not VIRTUAL_VENUE_WORDS.intersection(key.split())
+
+
+def get_or_create_venue_id(location):
+    """Venue id for a location, registering the venue on first use (None for blank, online or TBA)."""
+    key = normalize_venue_name(location)
+    if not is_bookable_venue(key):
+        return None
+    venue_id = db.session.query(Venue.id).filter_by(normalized_name=key).scalar()
+    if venue_id:
+        return venue_id
+    try:
+        with db.session.begin_nested():
+            venue = Venue(name=str(location).strip()[:200], normalized_name=key)
+            db.session.add(venue)
+        return venue.id
+    except Exception:
+        # Another request registered the same venue first
+        return db.session.query(Venue.id).filter_by(normalized_name=key).scalar()
+
+
+def parse_event_duration(value):
+    """Validate a duration in minutes (None keeps the default); raises ValueError."""
+    if value in (None, ""):
+        return None
+    try:
+        minutes = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("duration_minutes must be an integer")
+    if minutes < 1 or minutes > MAX_EVENT_DURATION_MINUTES:
+        raise ValueError(f"duration_minutes must be between 1 and {MAX_EVENT_DURATION_MINUTES}")
+    return minutes
+
+
+def find_venue_conflicts(venue_id, slots, exclude_ids=()):
+    """Events at a venue overlapping any [start, end) slot, with the venue row locked.
+
+    The lock is held until the caller commits, so two requests booking the
+    same venue are checked one after the other. The lower bound on starts_at
+    (no event is longer than MAX_EVENT_DURATION_MINUTES) keeps the scan of
+    ix_events_venue_schedule to a short range per slot.
+    """
+    if venue_id is None or not slots:
+        return []
+    db.session.query(Venue.id).filter(Venue.id == venue_id).with_for_update().scalar()
+    longest = timedelta(minutes=MAX_EVENT_DURATION_MINUTES)
+    query = (
+        db.session.query(Event.id, Event.title, Event.starts_at, Event.ends_at, Club.id, Club.name)
+        .join(Club, Club.id == Event.club_id)
+        .filter(
+            Event.venue_id == venue_id,
+            or_(*[
+                and_(Event.starts_at > start - longest, Event.starts_at < end, Event.ends_at > start)
+                for start, end in slots
+            ])
+        )
+    )
+    if exclude_ids:
+        query = query.filter(~Event.id.in_(list(exclude_ids)))
+    return [
+        {
+            "id": event_id,
+            "title": title,
+            "starts_at": str(starts_at),
+            "ends_at": str(ends_at),
+            "club_id": club_id,
+            "club_name": club_name
+        }
+        for event_id, title, starts_at, ends_at, club_id, club_name in query.order_by(Event.starts_at, Event.id)
+    ]
+
+
+def backfill_event_venues(batch_size=1000):
+    """Fill venue_id and starts_at/ends_at for events written before venues existed.
+
+    starts_at marks an event as processed, so events without a bookable venue
+    are not picked up again on the next start. Venues registered for online or
+    placeholder locations before those were recognised are unlinked and removed.
+    """
+    virtual_ids = [
+        venue_id for venue_id, key in db.session.query(Venue.id, Venue.normalized_name)
+        if not is_bookable_venue(key)
+    ]
+    if virtual_ids:
+        db.session.execute(
+            update(Event).where(Event.venue_id.in_(virtual_ids)).values(venue_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(delete(Venue).where(Venue.id.in_(virtual_ids)))
+        db.session.commit()
+
+    rows = db.session.query(
+        Event.id, Event.date, Event.time, Event.location, Event.duration_minutes
+    ).filter(Event.starts_at.is_(None)).all()
+    if not rows:
+        return 0
+    venue_ids = {}
+    updates = []
+    for event_id, event_date, event_time, location, duration_minutes in rows:
+        key = normalize_venue_name(location)
+        if key not in venue_ids:
+            venue_ids[key] = get_or_create_venue_id(location)
+        starts_at, ends_at = event_interval(event_date, event_time, duration_minutes)
+        updates.append({"id": event_id, "venue_id": venue_ids[key], "starts_at": starts_at, "ends_at": ends_at})
+    for offset in range(0, len(updates), batch_size):
+        db.session.execute(update(Event), updates[offset:offset + batch_size])
+    db.session.commit()
+    return len(updates)
+
+
+RECURRENCE_INTERVALS = {"weekly": 7, "biweekly": 14}
+MAX_SERIES_OCCURRENCES = 60
+
+
+def expand_recurrence(start_date, recurrence):
+    """Expand a weekly/bi-weekly recurrence spec into occurrence dates.
+
+    The spec looks like {"frequency": "weekly", "until": "YYYY-MM-DD",
+    "exclude": ["YYYY-MM-DD", ...]}. Raises ValueError on invalid input.
+    """
+    if isinstance(recurrence, str):
+        recurrence = json.loads(recurrence)
+    if not isinstance(recurrence, dict):
+        raise ValueError("recurrence must be an object")
+
+    frequency = recurrence.get("frequency", "weekly")
+    if frequency not in RECURRENCE_INTERVALS:
+        raise ValueError("recurrence.frequency must be 'weekly' or 'biweekly'")
+    if not recurrence.get("until"):
+        raise ValueError("recurrence.until is required")
+
+    until_date = datetime.strptime(str(recurrence["until"]), "%Y-%m-%d").date()
+    if until_date < start_date:
+        raise ValueError("recurrence.until must be on or after the first event date")
+    exclusions = sorted({
+        datetime.strptime(str(d), "%Y-%m-%d").date() for d in recurrence.get("exclude", []) or []
+    })
+
+    step = timedelta(days=RECURRENCE_INTERVALS[frequency])
+    dates = []
+    current = start_date
+    while current <= until_date:
+        if current not in exclusions:
+            dates.append(current)
+        current += step
+    if len(dates) > MAX_SERIES_OCCURRENCES:
+        raise ValueError(f"A series can have at most {MAX_SERIES_OCCURRENCES} occurrences")
+    if not dates:
+        raise ValueError("recurrence produces no events")
+    return frequency, until_date, exclusions, dates
+
+
+def create_event_series(club_id, fields, recurrence):
+    """Create an EventSeries and insert all of its Event rows with one multi-row INSERT."""
+    frequency, until_date, exclusions, dates = expand_recurrence(fields["date"], recurrence)
+    series = EventSeries(
+        club_id=club_id,
+        frequency=frequency,
+        start_date=dates[0],
+        until_date=until_date,
+        exclusions=json.dumps([str(d) for d in exclusions])
+    )
+    db.session.add(series)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    rows = []
+    for occurrence in dates:
+        starts_at, ends_at = event_interval(occurrence, fields["time"], fields.get("duration_minutes"))
+        rows.append({
+            **fields, "club_id": club_id, "date": occurrence, "series_id": series.id,
+            "starts_at": starts_at, "ends_at": ends_at, "created_at": now
+        })
+    event_ids = db.session.scalars(
+        insert(Event).returning(Event.id, sort_by_parameter_order=True), rows
+    ).all()
+    return series, event_ids
+
+
 @events_bp.route("/events", methods=["POST"])
 @jwt_required()
 def create_event():
@@ -1673,18 +3816,58 @@ def create_event():
         if not leader_owns_club(current_user.get("id"), club_id):
             return jsonify({"error": "You can only create events for your own clubs."}), 403
         
-        event = Event(
-            club_id=int(club_id),
-            title=str(data["title"]).strip(),
-            description=str(data.get("description", "")).strip(),
-            date=datetime.strptime(str(data["date"]), "%Y-%m-%d").date(),
-            time=datetime.strptime(str(data["time"]), "%H:%M").time(),
-            location=str(data["location"]).strip(),
-            poster_image=poster_image
-        )
+        fields = {
+            "title": str(data["title"]).strip(),
+            "description": str(data.get("description", "")).strip(),
+            "date": datetime.strptime(str(data["date"]), "%Y-%m-%d").date(),
+            "time": datetime.strptime(str(data["time"]), "%H:%M").time(),
+            "location": str(data["location"]).strip(),
+            "poster_image": poster_image,
+            "duration_minutes": parse_event_duration(data.get("duration_minutes"))
+        }
+        fields["venue_id"] = get_or_create_venue_id(fields["location"])
+        
+        if data.get("recurrence"):
+            series, event_ids = create_event_series(int(club_id), fields, data.get("recurrence"))
+            slots = [
+                event_interval(occurrence, fields["time"], fields["duration_minutes"])
+                for (occurrence,) in db.session.query(Event.date).filter(Event.id.in_(event_ids))
+            ]
+            conflicts = find_venue_conflicts(fields["venue_id"], slots, exclude_ids=event_ids)
+            if conflicts:
+                db.session.rollback()
+                return jsonify({"error": "The venue is already booked for some of these dates.", "conflicts": conflicts}), 409
+            bump_leader_data_version(club_id=int(club_id))
+            db.session.commit()
+            events = Event.query.filter(Event.id.in_(event_ids)).order_by(Event.date.asc()).all()
+            clashes = [
+                {"event_id": e.id, "date": str(e.date), "official_event": clash}
+                for e in events for clash in find_official_clashes(e.date, e.time, e.duration_minutes)
+            ]
+            return jsonify({
+                "message": f"Event series created with {len(events)} events!",
+                "series": series.to_dict(),
+                "event": events[0].to_dict(),
+                "events": [e.to_dict() for e in events],
+                "clashes": clashes
+            }), 201
+        
+        starts_at, ends_at = event_interval(fields["date"], fields["time"], fields["duration_minutes"])
+        conflicts = find_venue_conflicts(fields["venue_id"], [(starts_at, ends_at)])
+        if conflicts:
+            db.session.rollback()
+            return jsonify({"error": "The venue is already booked at that time.", "conflicts": conflicts}), 409
+        
+        event = Event(club_id=int(club_id), starts_at=starts_at, ends_at=ends_at, **fields)
         db.session.add(event)
+        bump_leader_data_version(club_id=event.club_id)
         db.session.commit()
-        return jsonify({"message": "Event created successfully!", "event": event.to_dict()}), 201
+        # Clashes with the official calendar are warnings, not errors
+        return jsonify({
+            "message": "Event created successfully!",
+            "event": event.to_dict(),
+            "clashes": find_official_clashes(event.date, event.time, event.duration_minutes)
+        }), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
@@ -1726,6 +3909,7 @@ def delete_event(event_id):
         return jsonify({"error": "Events can only be deleted at least 7 days in advance."}), 400
 
     try:
+        bump_leader_data_version(club_id=event.club_id)
         db.session.delete(event)
         db.session.commit()
         return jsonify({"message": "Event deleted successfully."}), 200
@@ -1760,12 +3944,15 @@ def update_event(event_id):
         if not data:
             data = request.get_json(force=True) or {}
     
+    booked_slot = (event.date, event.time, event.duration_minutes, event.location)
     try:
+        bump_leader_data_version(leader_id=current_user.get("id"))
         if "club_id" in data and data["club_id"]:
             new_club_id = int(data["club_id"])
             if not leader_owns_club(current_user.get("id"), new_club_id):
                 return jsonify({"error": "You can only assign events to your own clubs."}), 403
             event.club_id = new_club_id
+            g.setdefault("event_club_ids", {})[event_id] = new_club_id
         if "title" in data and data["title"]:
             event.title = str(data["title"]).strip()
         if "description" in data:
@@ -1785,17 +3972,183 @@ def update_event(event_id):
             event.date = new_date
         if "time" in data and data["time"]:
             event.time = datetime.strptime(str(data["time"]), "%H:%M").time()
+        if "duration_minutes" in data:
+            event.duration_minutes = parse_event_duration(data["duration_minutes"])
+
+        # Only a moved slot is re-checked, so older double-bookings stay editable
+        if (event.date, event.time, event.duration_minutes, event.location) != booked_slot:
+            event.venue_id = get_or_create_venue_id(event.location)
+            event.starts_at, event.ends_at = event_interval(event.date, event.time, event.duration_minutes)
+            conflicts = find_venue_conflicts(event.venue_id, [(event.starts_at, event.ends_at)], exclude_ids=[event.id])
+            if conflicts:
+                db.session.rollback()
+                return jsonify({"error": "The venue is already booked at that time.", "conflicts": conflicts}), 409
+
+        db.session.commit()
+        return jsonify({
+            "message": "Event updated successfully.",
+            "event": event.to_dict(),
+            "clashes": find_official_clashes(event.date, event.time, event.duration_minutes)
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+@events_bp.route("/events/series/<int:series_id>", methods=["PUT"])
+@jwt_required()
+def update_event_series(series_id):
+    """Update all upcoming events of a series with one bulk UPDATE (leader only)."""
+    current_user = get_current_user_context()
+    if not current_user or current_user.get("role") != "leader":
+        return jsonify({"error": "Access denied"}), 403
+
+    series = EventSeries.query.get(series_id)
+    if not series:
+        return jsonify({"error": "Event series not found"}), 404
+
+    if not leader_owns_club(current_user.get("id"), series.club_id):
+        return jsonify({"error": "You can only edit event series from your own clubs."}), 403
+
+    data = request.get_json() or {}
+    values = {}
+    try:
+        if data.get("title"):
+            values["title"] = str(data["title"]).strip()
+        if "description" in data:
+            values["description"] = str(data["description"] or "").strip()
+        if data.get("location"):
+            values["location"] = str(data["location"]).strip()
+        if data.get("time"):
+            values["time"] = datetime.strptime(str(data["time"]), "%H:%M").time()
+        if "poster_image" in data:
+            values["poster_image"] = str(data["poster_image"]).strip() if data["poster_image"] else None
+    except ValueError:
+        return jsonify({"error": "Invalid time format. Use HH:MM."}), 400
+    try:
+        if "duration_minutes" in data:
+            values["duration_minutes"] = parse_event_duration(data["duration_minutes"])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not values:
+        return jsonify({"error": "No series fields to update"}), 400
+
+    # Same rule as single events: only occurrences from tomorrow onwards can change
+    from_date = datetime.utcnow().date() + timedelta(days=1)
+
+    try:
+        if not {"time", "location", "duration_minutes"} & values.keys():
+            events_updated = db.session.execute(
+                update(Event)
+                .where(Event.series_id == series_id, Event.date >= from_date)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        else:
+            # The booked slot moves, so each occurrence gets its own starts_at/ends_at
+            occurrences = db.session.query(
+                Event.id, Event.date, Event.time, Event.location, Event.duration_minutes
+            ).filter(Event.series_id == series_id, Event.date >= from_date).all()
+            rows = []
+            venue_ids = {}
+            for event_id, event_date, event_time, location, duration_minutes in occurrences:
+                row = {"id": event_id, "time": event_time, "location": location, "duration_minutes": duration_minutes}
+                row.update(values)
+                if row["location"] not in venue_ids:
+                    venue_ids[row["location"]] = get_or_create_venue_id(row["location"])
+                row["venue_id"] = venue_ids[row["location"]]
+                row["starts_at"], row["ends_at"] = event_interval(event_date, row["time"], row["duration_minutes"])
+                rows.append(row)
+            if rows:
+                db.session.execute(update(Event), rows)
+            own_ids = [row["id"] for row in rows]
+            conflicts = []
+            for venue_id in set(venue_ids.values()):
+                conflicts += find_venue_conflicts(
+                    venue_id,
+                    [(row["starts_at"], row["ends_at"]) for row in rows if row["venue_id"] == venue_id],
+                    exclude_ids=own_ids
+                )
+            if conflicts:
+                db.session.rollback()
+                return jsonify({"error": "The venue is already booked for some of these dates.", "conflicts": conflicts}), 409
+            events_updated = len(rows)
+        bump_leader_data_version(club_id=series.club_id)
+        db.session.commit()
+        return jsonify({
+            "message": "Event series updated successfully.",
+            "series": series.to_dict(),
+            "events_updated": events_updated
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
+
+
+@events_bp.route("/events/series/<int:series_id>", methods=["DELETE"])
+@jwt_required()
+def delete_event_series(series_id):
+    """Delete upcoming events of a series with bulk DELETEs (leader only, 7 days in advance)."""
+    current_user = get_current_user_context()
+    if not current_user or current_user.get("role") != "leader":
+        return jsonify({"error": "Access denied"}), 403
+
+    series = EventSeries.query.get(series_id)
+    if not series:
+        return jsonify({"error": "Event series not found"}), 404
 
+    if not leader_owns_club(current_user.get("id"), series.club_id):
+        return jsonify({"error": "You can only delete event series from your own clubs."}), 403
+
+    # Same rule as single events: only occurrences at least 7 days ahead can be deleted
+    cutoff = datetime.utcnow().date() + timedelta(days=7)
+    target_ids = (
+        db.session.query(Event.id)
+        .filter(Event.series_id == series_id, Event.date >= cutoff)
+        .scalar_subquery()
+    )
+
+    try:
+        # Bulk DELETE skips ORM cascades, so dependent rows are removed explicitly
+        for model in (Registration, EventInsight, EventDailyViewSketch, CollectionEvent, EventReview, EventReminder, ReminderJob):
+            db.session.execute(
+                delete(model).where(model.event_id.in_(target_ids)).execution_options(synchronize_session=False)
+            )
+        result = db.session.execute(
+            delete(Event)
+            .where(Event.series_id == series_id, Event.date >= cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.rowcount
+
+        remaining = db.session.query(func.count(Event.id)).filter(Event.series_id == series_id).scalar()
+        if not remaining:
+            db.session.delete(series)
+        bump_leader_data_version(club_id=series.club_id)
         db.session.commit()
-        return jsonify({"message": "Event updated successfully.", "event": event.to_dict()}), 200
+        return jsonify({
+            "message": "Event series deleted successfully.",
+            "events_deleted": deleted,
+            "events_kept": remaining
+        }), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
 
+def insert_missing_rows(model, rows):
+    """INSERT rows, skipping any whose primary key already exists (ON CONFLICT DO NOTHING)."""
+    if not rows:
+        return
+    dialect = postgresql if db.engine.dialect.name == "postgresql" else sqlite
+    db.session.execute(dialect.insert(model).values(rows).on_conflict_do_nothing())
+
+
 @events_bp.route("/events/track-views", methods=["POST"])
+@jwt_required(optional=True)
 def track_event_views():
-    """Track event views for analytics."""
+    """Track event views and unique viewers (HyperLogLog) for analytics."""
     try:
         data = request.get_json(force=True)
         event_ids = data.get("event_ids", [])
@@ -1812,15 +4165,65 @@ def track_event_views():
         if not unique_ids:
             return jsonify({"error": "No valid event ids provided"}), 400
 
-        for event_id in unique_ids:
-            event = Event.query.get(event_id)
-            if not event:
-                continue
-            insight = EventInsight.query.get(event_id)
-            if not insight:
-                insight = EventInsight(event_id=event_id, views=0)
-                db.session.add(insight)
-            insight.views += 1
+        # Logged-in users are keyed by id, anonymous visitors by a client-held token
+        current_user = get_current_user_context()
+        viewer_token = str(data.get("viewer_token") or "").strip()[:128]
+        if current_user:
+            viewer_key = f"user:{current_user.get('id')}"
+        elif viewer_token:
+            viewer_key = f"anon:{viewer_token}"
+        else:
+            viewer_key = None
+
+        valid_ids = sorted(
+            row.id for row in db.session.query(Event.id).filter(Event.id.in_(unique_ids)).all()
+        )
+        if not valid_ids:
+            db.session.commit()
+            return jsonify({"message": "Views tracked"}), 200
+
+        # Create missing rows first (a concurrent first view simply skips the insert),
+        # then lock them in event id order so concurrent workers merge instead of overwrite
+        today = datetime.utcnow().date()
+        insert_missing_rows(EventInsight, [
+            {"event_id": event_id, "views": 0, "unique_viewers": 0} for event_id in valid_ids
+        ])
+        empty_sketch = HyperLogLog().to_bytes()
+        insert_missing_rows(EventDailyViewSketch, [
+            {"event_id": event_id, "view_date": today, "views": 0, "unique_viewers": 0, "sketch": empty_sketch}
+            for event_id in valid_ids
+        ])
+
+        insights = {
+            insight.event_id: insight
+            for insight in EventInsight.query.filter(EventInsight.event_id.in_(valid_ids))
+            .order_by(EventInsight.event_id).with_for_update().all()
+        }
+        daily_sketches = {
+            sketch.event_id: sketch
+            for sketch in EventDailyViewSketch.query.filter(
+                EventDailyViewSketch.event_id.in_(valid_ids),
+                EventDailyViewSketch.view_date == today
+            ).order_by(EventDailyViewSketch.event_id).with_for_update().all()
+        }
+
+        for event_id in valid_ids:
+            insight = insights[event_id]
+            insight.views = (insight.views or 0) + 1
+
+            daily = daily_sketches[event_id]
+            daily.views = (daily.views or 0) + 1
+
+            if viewer_key:
+                total_hll = HyperLogLog.from_bytes(insight.viewer_sketch)
+                total_hll.add(viewer_key)
+                insight.viewer_sketch = total_hll.to_bytes()
+                insight.unique_viewers = total_hll.count()
+
+                daily_hll = HyperLogLog.from_bytes(daily.sketch)
+                daily_hll.add(viewer_key)
+                daily.sketch = daily_hll.to_bytes()
+                daily.unique_viewers = daily_hll.count()
 
         db.session.commit()
         return jsonify({"message": "Views tracked"}), 200
@@ -1853,6 +4256,101 @@ def participant_events():
     return jsonify([e.to_dict() for e in events]), 200
 
 
+MAX_AVAILABILITY_DAYS = 31
+
+
+@events_bp.route("/venues", methods=["GET"])
+@jwt_required()
+def list_venues():
+    """List known venues, optionally filtered by ?q= on the normalized name."""
+    query = Venue.query
+    q = normalize_venue_name(request.args.get("q"))
+    if q:
+        query = query.filter(Venue.normalized_name.like(f"%{q}%"))
+    venues = query.order_by(Venue.normalized_name).limit(200).all()
+    return jsonify([venue.to_dict() for venue in venues]), 200
+
+
+@events_bp.route("/venues/<int:venue_id>/availability", methods=["GET"])
+@jwt_required()
+def venue_availability(venue_id):
+    """Free slots at a venue for a run of days (default: the next 7 days).
+
+    Only the venue's bookings in the window are read, through
+    ix_events_venue_schedule. Options: start_date, days, min_minutes, and
+    open/close (HH:MM) to override VENUE_OPEN_TIME/VENUE_CLOSE_TIME.
+    """
+    venue = Venue.query.get(venue_id)
+    if not venue:
+        return jsonify({"error": "Venue not found"}), 404
+    
+    try:
+        start_date = parse_date_arg(request.args.get("start_date")) or datetime.utcnow().date()
+        days = int(request.args.get("days", 7))
+        min_minutes = int(request.args.get("min_minutes", 60))
+        open_time = datetime.strptime(request.args.get("open", VENUE_OPEN_TIME), "%H:%M").time()
+        close_time = datetime.strptime(request.args.get("close", VENUE_CLOSE_TIME), "%H:%M").time()
+    except ValueError:
+        return jsonify({"error": "Invalid parameters. Dates use YYYY-MM-DD, times HH:MM."}), 400
+    if days < 1 or days > MAX_AVAILABILITY_DAYS:
+        return jsonify({"error": f"days must be between 1 and {MAX_AVAILABILITY_DAYS}"}), 400
+    if close_time <= open_time:
+        return jsonify({"error": "close must be after open"}), 400
+    min_minutes = max(min_minutes, 1)
+    
+    window_start = datetime.combine(start_date, open_time)
+    window_end = datetime.combine(start_date + timedelta(days=days - 1), close_time)
+    bookings = (
+        db.session.query(Event.id, Event.title, Event.starts_at, Event.ends_at)
+        .filter(
+            Event.venue_id == venue_id,
+            Event.starts_at > window_start - timedelta(minutes=MAX_EVENT_DURATION_MINUTES),
+            Event.starts_at < window_end,
+            Event.ends_at > window_start
+        )
+        .order_by(Event.starts_at)
+        .all()
+    )
+    
+    schedule = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        day_start, day_end = datetime.combine(day, open_time), datetime.combine(day, close_time)
+        booked = [
+            booking for booking in bookings
+            if booking.starts_at < day_end and booking.ends_at > day_start
+        ]
+        free = []
+        cursor = day_start
+        # Bookings are sorted by start, so one pass over them finds every gap
+        for booking in booked + [None]:
+            gap_end = min(booking.starts_at, day_end) if booking else day_end
+            if (gap_end - cursor) >= timedelta(minutes=min_minutes):
+                free.append({
+                    "start": cursor.isoformat(),
+                    "end": gap_end.isoformat(),
+                    "minutes": int((gap_end - cursor).total_seconds() // 60)
+                })
+            if booking:
+                cursor = max(cursor, booking.ends_at)
+        schedule.append({
+            "date": str(day),
+            "free": free,
+            "booked": [
+                {"event_id": b.id, "title": b.title, "starts_at": b.starts_at.isoformat(), "ends_at": b.ends_at.isoformat()}
+                for b in booked
+            ]
+        })
+    
+    return jsonify({
+        "venue": venue.to_dict(),
+        "start_date": str(start_date),
+        "days": days,
+        "min_minutes": min_minutes,
+        "schedule": schedule
+    }), 200
+
+
 # ============================================================================
 # SECTION 9: ROUTE BLUEPRINTS - REGISTRATIONS
 # ============================================================================
@@ -1893,6 +4391,9 @@ def register_for_event_authenticated(event_id):
         else:
             return jsonify({"error": "Already registered for this event"}), 400
 
+        bump_leader_data_version(club_id=event.club_id)
+        publish_registration_update(registration, "registration", reactivated=not created)
+
         qr_generated = False
         if not registration.qr_code_path or not os.path.exists(registration.qr_code_path):
             _generate_qr_for_registration(
@@ -1904,8 +4405,7 @@ def register_for_event_authenticated(event_id):
         if created:
             award_points_and_badges(user.id, "register", 10)
 
-        if created or qr_generated:
-            db.session.commit()
+        db.session.commit()
 
         qr_url = f"/api/registrations/{registration.id}/qr"
         send_registration_email(
@@ -1951,6 +4451,10 @@ def cancel_rsvp(event_id):
 
     try:
         registration.cancelled = True
+        event = registration.event or Event.query.get(event_id)
+        if event:
+            bump_leader_data_version(club_id=event.club_id)
+        publish_registration_update(registration, "cancellation")
         db.session.commit()
         return jsonify({"message": "RSVP cancelled.", "event_id": event_id}), 200
     except Exception as e:
@@ -1987,6 +4491,9 @@ def register_for_event():
         else:
             return jsonify({"error": "Already registered for this event"}), 400
 
+        bump_leader_data_version(club_id=event.club_id)
+        publish_registration_update(registration, "registration", reactivated=not created)
+
         qr_generated = False
         if not registration.qr_code_path or not os.path.exists(registration.qr_code_path):
             _generate_qr_for_registration(
@@ -2000,8 +4507,7 @@ def register_for_event():
             if user:
                 award_points_and_badges(user.id, "register", 10)
 
-        if created or qr_generated:
-            db.session.commit()
+        db.session.commit()
 
         send_registration_email(
             registration.email, registration.participant_name, event, registration.qr_code_path
@@ -2097,16 +4603,16 @@ def popular_clubs():
 
 @analytics_bp.route("/active-days", methods=["GET"])
 def active_days():
-    """Get active days with registration counts."""
-    results = (
-        db.session.query(Event.date, func.count(Registration.id))
-        .join(Registration, Registration.event_id == Event.id)
-        .filter(Registration.cancelled == False)
-        .group_by(Event.date)
-        .order_by(Event.date.asc())
-        .all()
-    )
-    return jsonify([{"date": str(date), "registrations": count} for date, count in results]), 200
+    """Get registration counts per day/week/month, optionally bounded by start/end."""
+    try:
+        start_date, end_date, bucket, max_points = parse_timeseries_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    points, bucket_used = get_registration_timeseries(start_date, end_date, bucket, max_points)
+    response = jsonify(points)
+    response.headers["X-Timeseries-Bucket"] = bucket_used
+    return response, 200
 
 
 @analytics_bp.route("/event-wise-attendance", methods=["GET"])
@@ -2168,8 +4674,7 @@ def leader_events():
         return jsonify({"error": "Access denied"}), 403
 
     leader_id = current_user.get("id")
-    leader_clubs = Club.query.filter_by(leader_id=leader_id).all()
-    leader_club_ids = [club.id for club in leader_clubs]
+    leader_club_ids = sorted(get_leader_club_ids(leader_id))
     
     if not leader_club_ids:
         return jsonify([]), 200
@@ -2181,31 +4686,116 @@ def leader_events():
                 func.sum(case((Registration.cancelled == False, 1), else_=0)),
                 0
             ).label("registration_count"),
-            func.coalesce(EventInsight.views, 0).label("view_count")
+            func.coalesce(EventInsight.views, 0).label("view_count"),
+            func.coalesce(EventInsight.unique_viewers, 0).label("unique_viewers")
         )
         .outerjoin(Registration, Registration.event_id == Event.id)
         .outerjoin(EventInsight, EventInsight.event_id == Event.id)
         .filter(Event.club_id.in_(leader_club_ids))
-        .group_by(Event.id, EventInsight.views)
+        .group_by(Event.id, EventInsight.views, EventInsight.unique_viewers)
         .order_by(Event.date.asc(), Event.time.asc())
         .all()
     )
 
     payload = []
-    for event, reg_count, view_count in events:
+    for event, reg_count, view_count, unique_viewers in events:
         event_data = event.to_dict()
         event_data["registration_count"] = reg_count
         event_data["club_name"] = event.club.name if event.club else None
         event_data["view_count"] = view_count
+        event_data["unique_viewers"] = unique_viewers
         payload.append(event_data)
 
     return jsonify(payload), 200
 
 
+def like_pattern(term):
+    """Substring LIKE pattern for a user-supplied term, with its wildcards escaped (escape="\\")."""
+    return "%{}%".format(term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_"))
+
+
+def leader_registrations_query(event_id, search=None):
+    """Active registrations for an event joined with participant profiles in one query."""
+    query = (
+        db.session.query(
+            Registration,
+            User.name.label("profile_name"),
+            User.profile_image.label("profile_image"),
+            User.bio.label("profile_bio")
+        )
+        .outerjoin(User, and_(User.email == Registration.email, User.role == "participant"))
+        .filter(Registration.event_id == event_id, Registration.cancelled == False)
+    )
+    if search:
+        keyword = like_pattern(search)
+        query = query.filter(or_(
+            Registration.participant_name.ilike(keyword, escape="\\"),
+            Registration.email.ilike(keyword, escape="\\"),
+            User.name.ilike(keyword, escape="\\")
+        ))
+    return query
+
+
+def csv_safe(value):
+    """Prevent spreadsheet formula injection in exported CSV cells."""
+    value = "" if value is None else str(value)
+    if value and value[0] in ("=", "+", "-", "@", "\t", "\r"):
+        return "'" + value
+    return value
+
+
+@leader_bp.route("/dashboard", methods=["GET"])
+@jwt_required()
+def leader_dashboard():
+    """Get the whole leader dashboard in one request, served from a snapshot when nothing changed."""
+    current_user = get_current_user_context()
+    if not current_user or current_user.get("role") != "leader":
+        return jsonify({"error": "Access denied"}), 403
+    
+    leader_id = current_user.get("id")
+    use_snapshot = LEADER_DASHBOARD_SNAPSHOTS and request.args.get("refresh") != "1"
+    data_version = get_leader_data_version(leader_id)
+    
+    if use_snapshot:
+        snapshot = LeaderDashboardSnapshot.query.get(leader_id)
+        # Upcoming events depend on today's date, so snapshots never outlive the day
+        if (snapshot and snapshot.data_version == data_version
+                and snapshot.computed_at and snapshot.computed_at.date() == datetime.utcnow().date()):
+            payload = json.loads(snapshot.payload)
+            payload["snapshot"] = {
+                "cached": True,
+                "data_version": data_version,
+                "computed_at": str(snapshot.computed_at)
+            }
+            return jsonify(payload), 200
+    
+    try:
+        payload = build_leader_dashboard(leader_id)
+    except Exception as e:
+        return jsonify({"error": f"Failed to build dashboard: {str(e)}"}), 500
+    
+    computed_at = datetime.utcnow()
+    if LEADER_DASHBOARD_SNAPSHOTS:
+        try:
+            db.session.merge(LeaderDashboardSnapshot(
+                leader_id=leader_id,
+                data_version=data_version,
+                payload=json.dumps(payload),
+                computed_at=computed_at
+            ))
+            db.session.commit()
+        except Exception as snapshot_err:
+            db.session.rollback()
+            print(f"Failed to store dashboard snapshot: {snapshot_err}")
+    
+    payload["snapshot"] = {"cached": False, "data_version": data_version, "computed_at": str(computed_at)}
+    return jsonify(payload), 200
+
+
 @leader_bp.route("/registrations/<int:event_id>", methods=["GET"])
 @jwt_required()
 def leader_event_registrations(event_id):
-    """Get registrations for a specific event (leader only)."""
+    """Get registrations for a specific event (leader only), with optional search and pagination."""
     current_user = get_current_user_context()
     if not current_user or current_user.get("role") != "leader":
         return jsonify({"error": "Access denied"}), 403
@@ -2217,106 +4807,403 @@ def leader_event_registrations(event_id):
     if not leader_owns_event(current_user.get("id"), event_id):
         return jsonify({"error": "You can only view registrations for events from your own clubs."}), 403
 
-    registrations = (
-        Registration.query.filter_by(event_id=event_id, cancelled=False)
-        .order_by(Registration.timestamp.desc())
-        .all()
-    )
+    search = request.args.get("q", "").strip()
+    page = request.args.get("page", type=int)
+    per_page = request.args.get("per_page", type=int)
+
+    query = leader_registrations_query(event_id, search)
+    total = query.order_by(None).count()
+    query = query.order_by(Registration.timestamp.desc(), Registration.id.desc())
+
+    # Pagination is opt-in so existing clients still receive the full list
+    if page or per_page:
+        page = max(page or 1, 1)
+        per_page = min(max(per_page or 50, 1), 200)
+        query = query.offset((page - 1) * per_page).limit(per_page)
+    else:
+        page, per_page = 1, total
 
     registration_data = []
-    for reg in registrations:
+    for reg, profile_name, profile_image, profile_bio in query.all():
         reg_dict = reg.to_dict()
-        participant = User.query.filter_by(email=reg.email, role="participant").first()
-        if participant:
-            reg_dict["participant_profile_image"] = participant.profile_image
-            reg_dict["participant_name"] = participant.name
-            reg_dict["participant_bio"] = participant.bio
+        if profile_name is not None:
+            reg_dict["participant_profile_image"] = profile_image
+            reg_dict["participant_name"] = profile_name
+            reg_dict["participant_bio"] = profile_bio
         registration_data.append(reg_dict)
 
     return jsonify({
         "event": event.to_dict(),
-        "registrations": registration_data
+        "registrations": registration_data,
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": -(-total // per_page) if per_page else 0
+        }
+    }), 200
+
+
+@leader_bp.route("/registrations/<int:event_id>/export.csv", methods=["GET"])
+@jwt_required()
+def export_leader_event_registrations(event_id):
+    """Stream the attendee list for an event as CSV (leader only)."""
+    current_user = get_current_user_context()
+    if not current_user or current_user.get("role") != "leader":
+        return jsonify({"error": "Access denied"}), 403
+
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({"error": "Event not found"}), 404
+
+    if not leader_owns_event(current_user.get("id"), event_id):
+        return jsonify({"error": "You can only export registrations for events from your own clubs."}), 403
+
+    search = request.args.get("q", "").strip()
+    query = (
+        leader_registrations_query(event_id, search)
+        .order_by(Registration.timestamp.asc(), Registration.id.asc())
+        .yield_per(500)
+    )
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["registration_id", "participant_name", "email", "registered_at", "checked_in"])
+        for reg, profile_name, _, _ in query:
+            writer.writerow([
+                reg.id,
+                csv_safe(profile_name or reg.participant_name),
+                csv_safe(reg.email),
+                str(reg.timestamp),
+                "yes" if reg.checked_in else "no"
+            ])
+            # Flush in small chunks so the sheet is never held in memory
+            if buffer.tell() >= 8192:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+
+    filename = f"{sanitize_filename(event.title) or 'event'}_{event.id}_attendees.csv"
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+def render_qr_pngs(items, window=None):
+    """Render (key, qr_data) pairs to (key, png) in input order, keeping at most `window` in flight."""
+    pool = get_process_pool()
+    if pool is None:
+        for key, qr_data in items:
+            yield key, render_qr_png(qr_data)
+        return
+
+    window = window or PROCESS_POOL_WORKERS * 4
+    pending = deque()
+    for key, qr_data in items:
+        pending.append((key, pool.submit(render_qr_png, qr_data)))
+        if len(pending) >= window:
+            done_key, future = pending.popleft()
+            yield done_key, future.result()
+    while pending:
+        done_key, future = pending.popleft()
+        yield done_key, future.result()
+
+
+class ZipStreamBuffer:
+    """Write-only, non-seekable file object that lets zipfile stream its output."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+@leader_bp.route("/events/<int:event_id>/qr-badges.zip", methods=["GET"])
+@jwt_required()
+def export_event_qr_badges(event_id):
+    """Stream a ZIP of every attendee's check-in QR code for an event (leader only)."""
+    current_user = get_current_user_context()
+    if not current_user or current_user.get("role") != "leader":
+        return jsonify({"error": "Access denied"}), 403
+
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({"error": "Event not found"}), 404
+
+    if not leader_owns_event(current_user.get("id"), event_id):
+        return jsonify({"error": "You can only export badges for events from your own clubs."}), 403
+
+    rows = (
+        db.session.query(Registration.id, Registration.participant_name, Registration.email)
+        .filter(Registration.event_id == event_id, Registration.cancelled == False)
+        .order_by(Registration.participant_name.asc(), Registration.id.asc())
+        .yield_per(500)
+    )
+
+    def badges():
+        for index, (reg_id, name, email) in enumerate(rows, start=1):
+            entry = f"{index:05d}_{sanitize_filename(name or email) or 'attendee'}_{reg_id}.png"
+            yield entry, qr_payload(reg_id, event_id, name, email)
+
+    def generate():
+        buffer = ZipStreamBuffer()
+        # PNGs are already compressed, so entries are stored rather than deflated
+        archive = zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED)
+        for entry, png in render_qr_pngs(badges()):
+            archive.writestr(entry, png)
+            yield buffer.drain()
+        archive.close()
+        yield buffer.drain()
+
+    filename = f"{sanitize_filename(event.title) or 'event'}_{event.id}_qr_badges.zip"
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@leader_bp.route("/events/<int:event_id>/reach", methods=["GET"])
+@jwt_required()
+def leader_event_reach(event_id):
+    """Get estimated unique viewers for an event, overall and per day (leader only)."""
+    current_user = get_current_user_context()
+    if not current_user or current_user.get("role") != "leader":
+        return jsonify({"error": "Access denied"}), 403
+
+    if not leader_owns_event(current_user.get("id"), event_id):
+        return jsonify({"error": "You can only view reach for events from your own clubs."}), 403
+
+    try:
+        start_date = parse_date_arg(request.args.get("start"))
+        end_date = parse_date_arg(request.args.get("end"))
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
+
+    query = EventDailyViewSketch.query.filter_by(event_id=event_id)
+    if start_date:
+        query = query.filter(EventDailyViewSketch.view_date >= start_date)
+    if end_date:
+        query = query.filter(EventDailyViewSketch.view_date <= end_date)
+    daily_rows = query.order_by(EventDailyViewSketch.view_date.asc()).all()
+
+    # Merging the daily sketches estimates unique viewers across the whole range
+    range_hll = HyperLogLog()
+    for row in daily_rows:
+        range_hll.merge(HyperLogLog.from_bytes(row.sketch))
+
+    insight = EventInsight.query.get(event_id)
+    return jsonify({
+        "event_id": event_id,
+        "total_views": insight.views if insight else 0,
+        "unique_viewers": insight.unique_viewers if insight else 0,
+        "range_views": sum(row.views for row in daily_rows),
+        "range_unique_viewers": range_hll.count() if daily_rows else 0,
+        "daily": [
+            {"date": str(row.view_date), "views": row.views, "unique_viewers": row.unique_viewers}
+            for row in daily_rows
+        ]
     }), 200
 
 
+def live_stream_serializer():
+    """Signer for stream tokens; salted so they are never valid as access tokens."""
+    return URLSafeTimedSerializer(current_app.config["JWT_SECRET_KEY"], salt="live-event-stream")
+
+
+_live_stream_slots = threading.BoundedSemaphore(LIVE_STREAMS_PER_WORKER)
+
+
+@leader_bp.route("/events/<int:event_id>/live-token", methods=["POST"])
+@jwt_required()
+def leader_event_live_token(event_id):
+    """Issue a short-lived token for opening one event's live stream."""
+    current_user = get_current_user_context()
+    if not current_user or current_user.get("role") != "leader":
+        return jsonify({"error": "Access denied"}), 403
+
+    if not leader_owns_event(current_user.get("id"), event_id):
+        return jsonify({"error": "You can only watch events from your own clubs."}), 403
+
+    token = live_stream_serializer().dumps({"user_id": current_user.get("id"), "event_id": event_id})
+    return jsonify({"token": token, "expires_in": LIVE_STREAM_TOKEN_SECONDS}), 200
+
+
+@leader_bp.route("/events/<int:event_id>/live", methods=["GET"])
+def leader_event_live(event_id):
+    """Stream live registration, cancellation and check-in deltas for an event (SSE, leader only).
+
+    EventSource cannot send headers, so the client fetches a token from
+    /live-token and opens ?token=<token>; fetch a fresh one before reconnecting.
+    """
+    try:
+        claims = live_stream_serializer().loads(
+            request.args.get("token", ""), max_age=LIVE_STREAM_TOKEN_SECONDS
+        )
+    except BadSignature:
+        return jsonify({"error": "Invalid or expired stream token"}), 401
+    if claims.get("event_id") != event_id:
+        return jsonify({"error": "Invalid or expired stream token"}), 401
+
+    if not leader_owns_event(claims.get("user_id"), event_id):
+        return jsonify({"error": "You can only watch events from your own clubs."}), 403
+
+    if not _live_stream_slots.acquire(blocking=False):
+        return jsonify({"error": "Too many live streams open, try again shortly"}), 503
+
+    # Subscribe before reading the snapshot so no delta is missed in between
+    subscriber = live_event_broker.subscribe(event_id)
+    try:
+        stats = get_attendance_stats(event_id=event_id)
+    except Exception as e:
+        live_event_broker.unsubscribe(event_id, subscriber)
+        _live_stream_slots.release()
+        return jsonify({"error": str(e)}), 500
+    snapshot = {
+        "event_id": event_id,
+        "registrations": stats["total_registrations"] - stats["cancelled_count"],
+        "checked_in": stats["checked_in_count"],
+        "cancelled": stats["cancelled_count"]
+    }
+
+    def stream():
+        started = datetime.utcnow()
+        yield "retry: 3000\n"
+        yield f"event: snapshot\ndata: {json.dumps(snapshot)}\n\n"
+        while (datetime.utcnow() - started).total_seconds() < LIVE_STREAM_MAX_SECONDS:
+            try:
+                message = subscriber.get(timeout=LIVE_STREAM_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+
+    def close_stream():
+        # Runs even if the client disconnects before the generator starts
+        live_event_broker.unsubscribe(event_id, subscriber)
+        _live_stream_slots.release()
+
+    response = Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+    response.call_on_close(close_stream)
+    return response
+
+
 @leader_bp.route("/calendar", methods=["GET"])
 @jwt_required()
 def get_leader_calendar():
-    """Get calendar events for leader including university calendar if club has permission."""
+    """Get calendar events across all of a leader's clubs, including permitted university calendars."""
     current_user = get_current_user_context()
     if not current_user or current_user.get("role") != "leader":
         return jsonify({"error": "Leader access required"}), 403
     
-    user = User.query.get(current_user.get("id"))
-    start_date = request.args.get("start_date")
-    end_date = request.args.get("end_date")
+    try:
+        start_date = parse_date_arg(request.args.get("start_date"))
+        end_date = parse_date_arg(request.args.get("end_date"))
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
     
-    # Get leader's club
-    club = Club.query.filter_by(leader_id=user.id).first()
-    if not club:
+    clubs = Club.query.filter_by(leader_id=current_user.get("id")).all()
+    if not clubs:
         return jsonify({"error": "No club found for this leader"}), 404
+    club_ids = [club.id for club in clubs]
     
-    # Get club events
-    query = Event.query.filter_by(club_id=club.id)
+    # Club events with registration counts from one grouped query
+    query = (
+        db.session.query(
+            Event,
+            Club.name.label("club_name"),
+            Club.category.label("club_category"),
+            func.coalesce(
+                func.sum(case((Registration.cancelled == False, 1), else_=0)),
+                0
+            ).label("registration_count")
+        )
+        .join(Club, Event.club_id == Club.id)
+        .outerjoin(Registration, Registration.event_id == Event.id)
+        .filter(Event.club_id.in_(club_ids))
+    )
     if start_date:
-        query = query.filter(Event.date >= datetime.strptime(start_date, "%Y-%m-%d").date())
+        query = query.filter(Event.date >= start_date)
     if end_date:
-        query = query.filter(Event.date <= datetime.strptime(end_date, "%Y-%m-%d").date())
-    
-    events = query.order_by(Event.date, Event.time).all()
+        query = query.filter(Event.date <= end_date)
     
-    calendar_events = []
+    rows = (
+        query.group_by(Event.id, Club.name, Club.category)
+        .order_by(Event.date, Event.time, Event.id)
+        .all()
+    )
     
-    # Add club events
-    for event in events:
-        event_datetime = datetime.combine(event.date, event.time)
-        registration_count = Registration.query.filter_by(event_id=event.id, cancelled=False).count()
-        
-        calendar_events.append({
+    club_calendar_events = [
+        {
             "id": event.id,
             "title": event.title,
             "date": str(event.date),
             "time": str(event.time),
-            "datetime": event_datetime.isoformat(),
+            "datetime": datetime.combine(event.date, event.time).isoformat(),
             "location": event.location,
-            "club_name": club.name,
-            "club_category": club.category,
+            "club_name": club_name,
+            "club_category": club_category,
             "description": event.description,
             "registration_count": registration_count,
             "type": "clubhub"
-        })
-    
-    # Check if club has permission to view university calendar
-    permissions = ClubCalendarPermission.query.filter_by(club_id=club.id).all()
-    calendar_ids = [p.calendar_id for p in permissions]
+        }
+        for event, club_name, club_category, registration_count in rows
+    ]
+    
+    # Official university calendars any of the leader's clubs may view
+    calendar_ids = [
+        row.calendar_id for row in
+        db.session.query(ClubCalendarPermission.calendar_id)
+        .filter(ClubCalendarPermission.club_id.in_(club_ids))
+        .distinct()
+        .all()
+    ]
     
+    official_calendar_events = []
     if calendar_ids:
-        official_events = UniversityOfficialCalendarEvent.query.join(
-            UniversityOfficialCalendar
-        ).filter(
-            UniversityOfficialCalendar.id.in_(calendar_ids)
+        official_events = UniversityOfficialCalendarEvent.query.filter(
+            UniversityOfficialCalendarEvent.calendar_id.in_(calendar_ids)
         )
-        
         if start_date:
             official_events = official_events.filter(
-                UniversityOfficialCalendarEvent.start_datetime >= datetime.strptime(start_date, "%Y-%m-%d")
+                UniversityOfficialCalendarEvent.start_datetime >= datetime.combine(start_date, datetime.min.time())
             )
         if end_date:
             official_events = official_events.filter(
-                UniversityOfficialCalendarEvent.start_datetime <= datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+                UniversityOfficialCalendarEvent.start_datetime <= datetime.combine(end_date, datetime.min.time()) + timedelta(days=1)
             )
         
-        official_calendar_events = official_events.all()
-        
-        for official_event in official_calendar_events:
-            uni_date = official_event.start_datetime.date()
-            uni_time = official_event.start_datetime.time()
-            
-            calendar_events.append({
+        for official_event in official_events.order_by(
+            UniversityOfficialCalendarEvent.start_datetime, UniversityOfficialCalendarEvent.id
+        ).all():
+            official_calendar_events.append({
                 "id": f"official_uni_{official_event.id}",
                 "title": official_event.title,
-                "date": str(uni_date),
-                "time": str(uni_time),
+                "date": str(official_event.start_datetime.date()),
+                "time": str(official_event.start_datetime.time()),
                 "datetime": official_event.start_datetime.isoformat(),
                 "location": official_event.location or "University",
                 "club_name": "Official University Calendar",
@@ -2325,8 +5212,10 @@ def get_leader_calendar():
                 "type": "university"
             })
     
-    # Sort by datetime
-    calendar_events.sort(key=lambda x: x["datetime"])
+    # Both lists are already ordered by start time, so a linear merge keeps them sorted
+    calendar_events = list(heapq.merge(
+        club_calendar_events, official_calendar_events, key=lambda x: x["datetime"]
+    ))
     
     return jsonify(calendar_events), 200
 
@@ -2356,11 +5245,14 @@ def check_in_attendee(registration_id):
             "participant": registration.participant_name,
             "email": registration.email,
             "event": event.title if event else "Unknown",
-            "checked_in_at": str(registration.timestamp)
+            "checked_in_at": str(registration.checked_in_at or registration.timestamp)
         }), 200
 
     try:
         registration.checked_in = True
+        registration.checked_in_at = datetime.utcnow()
+        bump_leader_data_version(leader_id=current_user.get("id"))
+        publish_registration_update(registration, "check_in")
         
         # Award points for check-in
         user = User.query.filter_by(email=registration.email).first()
@@ -2388,34 +5280,158 @@ def check_in_attendee(registration_id):
 
 university_bp = Blueprint("university", __name__)
 
+def club_request_summary(row, proposer_email, proposer_name):
+    """Short fields of a club request shared by the list, queue and detail views."""
+    return {
+        "id": row.id,
+        "proposer_email": proposer_email,
+        "proposer_name": proposer_name,
+        "name": row.name,
+        "category": row.category,
+        "status": row.status,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "decided_at": row.decided_at.isoformat() if row.decided_at else None,
+    }
+
+
+def encode_request_cursor(created_at, request_id):
+    """Opaque keyset cursor for the club request queue."""
+    raw = f"{created_at.isoformat() if created_at else ''}|{request_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_request_cursor(cursor):
+    """Decode a queue cursor into (created_at, id); raises ValueError when malformed."""
+    try:
+        created, request_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created), int(request_id)
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
 @university_bp.route("/club-requests", methods=["GET"])
 @university_required
 def university_list_requests():
-    """University can see all club requests, filtered by status."""
+    """University can see all club requests, filtered by status and optional ?q= search.
+
+    Passing ?limit=, ?cursor= or ?view=summary switches to the review-queue
+    mode: a keyset-paginated summary without the long text columns, returned
+    as {"requests": [...], "next_cursor": ...}. Without them the full list is
+    returned as before.
+    """
     status = request.args.get("status", "pending")
-    q = ClubRequest.query
+    search = request.args.get("q", "").strip()
+    order = request.args.get("order", "asc")
+    
+    filters = []
     if status in ["pending", "approved", "rejected"]:
-        q = q.filter_by(status=status)
-    requests = q.order_by(ClubRequest.created_at.asc()).all()
+        filters.append(ClubRequest.status == status)
+    if search:
+        # Served by the pg_trgm GIN indexes (BitmapOr) once the term has 3+ characters
+        keyword = like_pattern(search)
+        filters.append(or_(
+            ClubRequest.name.ilike(keyword, escape="\\"),
+            ClubRequest.description.ilike(keyword, escape="\\")
+        ))
+    
+    if not any(arg in request.args for arg in ("limit", "cursor", "view")):
+        rows = (
+            db.session.query(ClubRequest, User.email, User.name)
+            .outerjoin(User, User.id == ClubRequest.proposer_id)
+            .filter(*filters)
+            .order_by(ClubRequest.created_at.asc(), ClubRequest.id.asc())
+            .all()
+        )
+        return jsonify([
+            {
+                **club_request_summary(r, proposer_email, proposer_name),
+                "description": r.description,
+                "mission": r.mission,
+                "target_audience": r.target_audience,
+                "activities_plan": r.activities_plan,
+                "decision_message": r.decision_message,
+            }
+            for r, proposer_email, proposer_name in rows
+        ]), 200
+    
+    limit = min(max(request.args.get("limit", 25, type=int), 1), 100)
+    descending = order == "desc"
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            cursor_created, cursor_id = decode_request_cursor(cursor)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        if descending:
+            filters.append(or_(
+                ClubRequest.created_at < cursor_created,
+                and_(ClubRequest.created_at == cursor_created, ClubRequest.id < cursor_id)
+            ))
+        else:
+            filters.append(or_(
+                ClubRequest.created_at > cursor_created,
+                and_(ClubRequest.created_at == cursor_created, ClubRequest.id > cursor_id)
+            ))
+    
+    ordering = (
+        (ClubRequest.created_at.desc(), ClubRequest.id.desc()) if descending
+        else (ClubRequest.created_at.asc(), ClubRequest.id.asc())
+    )
+    rows = (
+        db.session.query(
+            ClubRequest.id,
+            ClubRequest.name,
+            ClubRequest.category,
+            ClubRequest.status,
+            ClubRequest.created_at,
+            ClubRequest.decided_at,
+            func.substr(ClubRequest.description, 1, 200).label("description_preview"),
+            User.email.label("proposer_email"),
+            User.name.label("proposer_name")
+        )
+        .outerjoin(User, User.id == ClubRequest.proposer_id)
+        .filter(*filters)
+        .order_by(*ordering)
+        .limit(limit + 1)
+        .all()
+    )
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify({
+        "requests": [
+            {
+                **club_request_summary(row, row.proposer_email, row.proposer_name),
+                "description_preview": row.description_preview,
+            }
+            for row in rows
+        ],
+        "next_cursor": encode_request_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+    }), 200
 
-    return jsonify([
-        {
-            "id": r.id,
-            "proposer_email": r.proposer.email if r.proposer else None,
-            "proposer_name": r.proposer.name if r.proposer else None,
-            "name": r.name,
-            "description": r.description,
-            "category": r.category,
-            "mission": r.mission,
-            "target_audience": r.target_audience,
-            "activities_plan": r.activities_plan,
-            "status": r.status,
-            "created_at": r.created_at.isoformat() if r.created_at else None,
-            "decided_at": r.decided_at.isoformat() if r.decided_at else None,
-            "decision_message": r.decision_message,
-        }
-        for r in requests
-    ]), 200
+
+@university_bp.route("/club-requests/<int:req_id>", methods=["GET"])
+@university_required
+def university_get_request(req_id):
+    """Full details of one club request, including the long text fields."""
+    row = (
+        db.session.query(ClubRequest, User.email, User.name)
+        .outerjoin(User, User.id == ClubRequest.proposer_id)
+        .filter(ClubRequest.id == req_id)
+        .first()
+    )
+    if not row:
+        return jsonify({"error": "Request not found"}), 404
+    
+    r, proposer_email, proposer_name = row
+    return jsonify({
+        **club_request_summary(r, proposer_email, proposer_name),
+        "description": r.description,
+        "mission": r.mission,
+        "target_audience": r.target_audience,
+        "activities_plan": r.activities_plan,
+        "decision_message": r.decision_message,
+    }), 200
 
 
 @university_bp.route("/club-requests/<int:req_id>/decision", methods=["POST"])
@@ -2482,32 +5498,265 @@ def university_decide_request(req_id):
         db.session.add(new_club)
 
     db.session.commit()
+    invalidate_ownership_cache()
     return jsonify({"message": f"Decision '{decision}' saved successfully."}), 200
 
 
+@university_bp.route("/club-requests/decisions", methods=["POST"])
+@university_required
+def university_decide_requests_batch():
+    """Decide on many club proposals at once, with a result per item.
+
+    Body: {"decisions": [{"request_id", "decision", "message", "leader_email",
+    "leader_password"}, ...], "all_or_nothing": false}. Every item is
+    validated before anything is written; leader passwords are hashed on the
+    process pool and the new leaders, clubs and request updates are written
+    with bulk statements in one transaction.
+    """
+    data = request.get_json() or {}
+    items = data.get("decisions")
+    all_or_nothing = bool(data.get("all_or_nothing"))
+
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "decisions must be a non-empty list"}), 400
+    if len(items) > MAX_DECISION_BATCH:
+        return jsonify({"error": f"At most {MAX_DECISION_BATCH} decisions per batch"}), 400
+
+    results = [{"request_id": None, "status": "ok"} for _ in items]
+    parsed = []
+    for index, item in enumerate(items):
+        item = item if isinstance(item, dict) else {}
+        try:
+            request_id = int(item.get("request_id"))
+        except (TypeError, ValueError):
+            request_id = None
+        results[index]["request_id"] = request_id
+        parsed.append({
+            "index": index,
+            "request_id": request_id,
+            "decision": item.get("decision"),
+            "message": str(item.get("message") or "").strip(),
+            "leader_email": str(item.get("leader_email") or "").strip(),
+            "leader_password": str(item.get("leader_password") or "").strip()
+        })
+
+    request_ids = {p["request_id"] for p in parsed if p["request_id"] is not None}
+    # Lock the pending rows so a concurrent batch cannot decide them twice
+    rows = (
+        db.session.query(ClubRequest, User.name)
+        .outerjoin(User, User.id == ClubRequest.proposer_id)
+        .filter(ClubRequest.id.in_(request_ids))
+        .with_for_update(of=ClubRequest)
+        .all()
+    ) if request_ids else []
+    requests_by_id = {req.id: (req, proposer_name) for req, proposer_name in rows}
+
+    approvals = [p for p in parsed if p["decision"] == "approved"]
+    emails = {p["leader_email"].lower() for p in approvals if p["leader_email"]}
+    club_names = {requests_by_id[p["request_id"]][0].name for p in approvals if p["request_id"] in requests_by_id}
+    taken_emails = {
+        email.lower() for (email,) in
+        db.session.query(User.email).filter(func.lower(User.email).in_(emails))
+    } if emails else set()
+    taken_names = {
+        name for (name,) in db.session.query(Club.name).filter(Club.name.in_(club_names))
+    } if club_names else set()
+
+    seen_ids, seen_emails, seen_names = set(), set(), set()
+    for p in parsed:
+        error = None
+        entry = requests_by_id.get(p["request_id"])
+        if p["request_id"] is None:
+            error = "request_id is required"
+        elif p["request_id"] in seen_ids:
+            error = "Duplicate request in batch"
+        elif p["decision"] not in ["approved", "rejected"]:
+            error = "Decision must be 'approved' or 'rejected'"
+        elif not entry:
+            error = "Club request not found"
+        elif entry[0].status != "pending":
+            error = "Request already decided"
+        elif p["decision"] == "approved":
+            email = p["leader_email"].lower()
+            if not p["leader_email"] or not p["leader_password"]:
+                error = "Leader email and password are required for approval."
+            elif entry[1] is None:
+                error = "Proposer not found"
+            elif entry[0].name in taken_names or entry[0].name in seen_names:
+                error = "A club with this name already exists."
+            elif email in taken_emails or email in seen_emails:
+                error = "Leader email already exists. Please choose a different email."
+            else:
+                seen_emails.add(email)
+                seen_names.add(entry[0].name)
+        if p["request_id"] is not None:
+            seen_ids.add(p["request_id"])
+        if error:
+            results[p["index"]].update({"status": "error", "error": error})
+
+    valid = [p for p in parsed if results[p["index"]]["status"] == "ok"]
+    failed = len(parsed) - len(valid)
+    if failed and all_or_nothing:
+        db.session.rollback()
+        return jsonify({"applied": 0, "failed": failed, "results": results}), 400
+    if not valid:
+        db.session.rollback()
+        return jsonify({"applied": 0, "failed": failed, "results": results}), 400
+
+    approved = [p for p in valid if p["decision"] == "approved"]
+    try:
+        rounds = current_app.config.get("BCRYPT_LOG_ROUNDS", 12)
+        hashed = hash_passwords([p["leader_password"] for p in approved], rounds)
+
+        now = datetime.utcnow()
+        leader_ids = []
+        if approved:
+            leader_ids = db.session.scalars(
+                insert(User).returning(User.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "name": requests_by_id[p["request_id"]][1] + " (Leader)",
+                        "email": p["leader_email"],
+                        "password": password,
+                        "role": "leader"
+                    }
+                    for p, password in zip(approved, hashed)
+                ]
+            ).all()
+            club_ids = db.session.scalars(
+                insert(Club).returning(Club.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "name": requests_by_id[p["request_id"]][0].name,
+                        "description": requests_by_id[p["request_id"]][0].description,
+                        "category": requests_by_id[p["request_id"]][0].category,
+                        "leader_id": leader_id
+                    }
+                    for p, leader_id in zip(approved, leader_ids)
+                ]
+            ).all()
+            for p, leader_id, club_id in zip(approved, leader_ids, club_ids):
+                results[p["index"]].update({"leader_id": leader_id, "club_id": club_id})
+
+        db.session.execute(update(ClubRequest), [
+            {
+                "id": p["request_id"],
+                "status": p["decision"],
+                "decided_at": now,
+                "decision_message": p["message"] or (
+                    "Your club has been approved." if p["decision"] == "approved"
+                    else "Your club proposal was not approved."
+                ),
+                "leader_email": p["leader_email"] if p["decision"] == "approved" else None,
+                "leader_password": p["leader_password"] if p["decision"] == "approved" else None
+            }
+            for p in valid
+        ])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to save decisions: {str(e)}"}), 500
+
+    invalidate_ownership_cache()
+    for p in valid:
+        results[p["index"]]["decision"] = p["decision"]
+    return jsonify({"applied": len(valid), "failed": failed, "results": results}), 200
+
+
 @university_bp.route("/clubs", methods=["GET"])
 @university_required
 def university_list_clubs():
-    """University can see all clubs with their leaders."""
-    clubs = Club.query.order_by(Club.id.desc()).all()
+    """University can see all clubs with their leaders, event and registration counts.
+
+    Supports ?q= (name), ?category=, ?sort=newest|name|events|registrations,
+    ?order=asc|desc and opt-in ?page=/?per_page= pagination.
+    """
+    search = request.args.get("q", "").strip()
+    category = request.args.get("category", "").strip()
+    sort = request.args.get("sort", "newest")
+    order = request.args.get("order", "asc" if sort == "name" else "desc")
+    page = request.args.get("page", type=int)
+    per_page = request.args.get("per_page", type=int)
+    
+    event_counts = (
+        db.session.query(Event.club_id, func.count(Event.id).label("event_count"))
+        .group_by(Event.club_id)
+        .subquery()
+    )
+    registration_counts = (
+        db.session.query(Event.club_id, func.count(Registration.id).label("registration_count"))
+        .join(Registration, Registration.event_id == Event.id)
+        .filter(Registration.cancelled == False)
+        .group_by(Event.club_id)
+        .subquery()
+    )
+    event_count = func.coalesce(event_counts.c.event_count, 0)
+    registration_count = func.coalesce(registration_counts.c.registration_count, 0)
     
-    output = []
-    for club in clubs:
-        leader = User.query.get(club.leader_id) if club.leader_id else None
-        event_count = Event.query.filter_by(club_id=club.id).count()
-        
-        output.append({
+    query = (
+        db.session.query(
+            Club,
+            User.email.label("leader_email"),
+            User.name.label("leader_name"),
+            event_count.label("event_count"),
+            registration_count.label("registration_count")
+        )
+        .outerjoin(User, User.id == Club.leader_id)
+        .outerjoin(event_counts, event_counts.c.club_id == Club.id)
+        .outerjoin(registration_counts, registration_counts.c.club_id == Club.id)
+    )
+    if search:
+        query = query.filter(Club.name.ilike(f"%{search}%"))
+    if category:
+        query = query.filter(func.lower(Club.category) == category.lower())
+    
+    sort_columns = {
+        "newest": Club.id,
+        "name": func.lower(Club.name),
+        "events": event_count,
+        "registrations": registration_count
+    }
+    if sort not in sort_columns:
+        return jsonify({"error": f"sort must be one of: {', '.join(sort_columns)}"}), 400
+    sort_column = sort_columns[sort]
+    direction = sort_column.asc() if order == "asc" else sort_column.desc()
+    query = query.order_by(direction, Club.id.desc())
+    
+    paginated = bool(page or per_page)
+    if paginated:
+        total = query.order_by(None).count()
+        page = max(page or 1, 1)
+        per_page = min(max(per_page or 50, 1), 200)
+        query = query.offset((page - 1) * per_page).limit(per_page)
+    
+    output = [
+        {
             "id": club.id,
             "name": club.name,
             "description": club.description,
             "category": club.category,
             "leader_id": club.leader_id,
-            "leader_email": leader.email if leader else None,
-            "leader_name": leader.name if leader else None,
-            "event_count": event_count
-        })
+            "leader_email": leader_email,
+            "leader_name": leader_name,
+            "event_count": events,
+            "registration_count": registrations
+        }
+        for club, leader_email, leader_name, events, registrations in query.all()
+    ]
     
-    return jsonify(output), 200
+    # Without page/per_page the plain list is returned, as existing clients expect
+    if not paginated:
+        return jsonify(output), 200
+    
+    return jsonify({
+        "clubs": output,
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "pages": -(-total // per_page) if per_page else 0
+        }
+    }), 200
 
 
 @university_bp.route("/clubs/<int:club_id>", methods=["DELETE"])
@@ -2519,8 +5768,11 @@ def university_delete_club(club_id):
         return jsonify({"error": "Club not found"}), 404
     
     try:
+        if club.leader_id:
+            bump_leader_data_version(leader_id=club.leader_id)
         db.session.delete(club)
         db.session.commit()
+        invalidate_ownership_cache()
         return jsonify({"message": f"Club '{club.name}' deleted successfully."}), 200
     except Exception as e:
         db.session.rollback()
@@ -2546,7 +5798,9 @@ def university_revoke_leader(club_id):
     leader_id = leader.id
     
     try:
+        bump_leader_data_version(leader_id=leader_id)
         club.leader_id = None
+        invalidate_ownership_cache()
         club_requests_as_proposer = ClubRequest.query.filter_by(proposer_id=leader_id).all()
         
         if club_requests_as_proposer:
@@ -2567,43 +5821,90 @@ def university_revoke_leader(club_id):
         return jsonify({"error": f"Failed to revoke leader access: {str(e)}"}), 500
 
 
+CALENDAR_DEFAULT_RANGE_DAYS = 120
+CALENDAR_MAX_RANGE_DAYS = 366
+
+
 @university_bp.route("/events/calendar", methods=["GET"])
 @university_required
 def get_university_calendar_events():
-    """Get all events from all clubs for university calendar view."""
-    start_date = request.args.get("start_date")
-    end_date = request.args.get("end_date")
-    
-    # Get all events from all approved clubs
-    query = Event.query.join(Club).filter(Club.approved == True)
-    if start_date:
-        query = query.filter(Event.date >= datetime.strptime(start_date, "%Y-%m-%d").date())
-    if end_date:
-        query = query.filter(Event.date <= datetime.strptime(end_date, "%Y-%m-%d").date())
-    
-    events = query.order_by(Event.date, Event.time).all()
+    """Get events from all clubs in a date range for the university calendar view.
+
+    Range defaults to CALENDAR_DEFAULT_RANGE_DAYS from the start of the current
+    month and is capped at CALENDAR_MAX_RANGE_DAYS. ?view=month groups the
+    events into month buckets with per-month totals.
+    """
+    try:
+        start_date = parse_date_arg(request.args.get("start_date"))
+        end_date = parse_date_arg(request.args.get("end_date"))
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
+    
+    view = request.args.get("view", "list")
+    if view not in ("list", "month"):
+        return jsonify({"error": "view must be 'list' or 'month'"}), 400
+    
+    if not start_date and not end_date:
+        start_date = datetime.utcnow().date().replace(day=1)
+    if not start_date:
+        start_date = end_date - timedelta(days=CALENDAR_DEFAULT_RANGE_DAYS)
+    if not end_date:
+        end_date = start_date + timedelta(days=CALENDAR_DEFAULT_RANGE_DAYS)
+    if end_date < start_date:
+        return jsonify({"error": "end_date must be on or after start_date"}), 400
+    if (end_date - start_date).days > CALENDAR_MAX_RANGE_DAYS:
+        return jsonify({"error": f"Date range cannot exceed {CALENDAR_MAX_RANGE_DAYS} days"}), 400
+    
+    # Clubs only exist once their request was approved, so no approval filter is needed
+    rows = (
+        db.session.query(
+            Event,
+            Club.name.label("club_name"),
+            Club.category.label("club_category"),
+            func.count(Registration.id).label("registration_count")
+        )
+        .join(Club, Club.id == Event.club_id)
+        .outerjoin(Registration, and_(Registration.event_id == Event.id, Registration.cancelled == False))
+        .filter(Event.date >= start_date, Event.date <= end_date)
+        .group_by(Event.id, Club.name, Club.category)
+        .order_by(Event.date, Event.time, Event.id)
+        .all()
+    )
     
-    # Get registration counts for each event
-    calendar_events = []
-    for event in events:
-        event_datetime = datetime.combine(event.date, event.time)
-        registration_count = Registration.query.filter_by(event_id=event.id, cancelled=False).count()
-        
-        calendar_events.append({
+    calendar_events = [
+        {
             "id": event.id,
             "title": event.title,
             "date": str(event.date),
             "time": str(event.time),
-            "datetime": event_datetime.isoformat(),
+            "datetime": datetime.combine(event.date, event.time).isoformat(),
             "location": event.location,
-            "club_name": event.club.name if event.club else "Unknown",
-            "club_category": event.club.category if event.club else None,
+            "club_name": club_name,
+            "club_category": club_category,
             "description": event.description,
             "registration_count": registration_count,
             "type": "clubhub"
-        })
+        }
+        for event, club_name, club_category, registration_count in rows
+    ]
     
-    return jsonify(calendar_events), 200
+    if view == "list":
+        return jsonify(calendar_events), 200
+    
+    months = []
+    for item in calendar_events:
+        month = item["date"][:7]
+        if not months or months[-1]["month"] != month:
+            months.append({"month": month, "event_count": 0, "registration_count": 0, "events": []})
+        months[-1]["event_count"] += 1
+        months[-1]["registration_count"] += item["registration_count"]
+        months[-1]["events"].append(item)
+    
+    return jsonify({
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "months": months
+    }), 200
 
 
 @university_bp.route("/calendar/upload", methods=["POST"])
@@ -2628,9 +5929,6 @@ def upload_university_calendar():
         return jsonify({"error": "Only .ics (iCal) files are supported"}), 400
     
     try:
-        # Read file content
-        ical_data = file.read().decode('utf-8')
-        
         # Check if calendar already exists
         existing_calendar = UniversityOfficialCalendar.query.filter_by(
             university_id=university_id,
@@ -2649,86 +5947,14 @@ def upload_university_calendar():
             db.session.add(calendar)
             db.session.flush()  # Get the ID
         
-        # Delete old events
-        UniversityOfficialCalendarEvent.query.filter_by(calendar_id=calendar.id).delete()
-        
-        # Parse iCal and extract events
-        events_found = []
-        lines = ical_data.split('\n')
-        current_event = {}
-        in_event = False
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Handle line continuation
-            if line.startswith(' ') or line.startswith('\t'):
-                if in_event and current_event:
-                    last_key = list(current_event.keys())[-1] if current_event else None
-                    if last_key:
-                        current_event[last_key] += line.strip()
-                continue
-            
-            if line == "BEGIN:VEVENT":
-                current_event = {}
-                in_event = True
-            elif line == "END:VEVENT":
-                if current_event and current_event.get("title"):
-                    try:
-                        dtstart_str = current_event.get("start", "")
-                        dtend_str = current_event.get("end", "")
-                        
-                        # Parse datetime
-                        if len(dtstart_str) == 8:
-                            start_dt = datetime.strptime(dtstart_str, "%Y%m%d")
-                        elif 'T' in dtstart_str:
-                            if dtstart_str.endswith('Z'):
-                                start_dt = datetime.strptime(dtstart_str.replace('Z', ''), "%Y%m%dT%H%M%S")
-                            else:
-                                start_dt = datetime.strptime(dtstart_str.split('T')[0], "%Y%m%d")
-                        else:
-                            start_dt = datetime.strptime(dtstart_str[:8], "%Y%m%d")
-                        
-                        if len(dtend_str) == 8:
-                            end_dt = datetime.strptime(dtend_str, "%Y%m%d")
-                        elif 'T' in dtend_str:
-                            if dtend_str.endswith('Z'):
-                                end_dt = datetime.strptime(dtend_str.replace('Z', ''), "%Y%m%dT%H%M%S")
-                            else:
-                                end_dt = datetime.strptime(dtend_str.split('T')[0], "%Y%m%d")
-                        else:
-                            end_dt = datetime.strptime(dtend_str[:8], "%Y%m%d")
-                        
-                        # Create event
-                        cal_event = UniversityOfficialCalendarEvent(
-                            calendar_id=calendar.id,
-                            title=current_event.get("title", "University Event"),
-                            description=current_event.get("description", ""),
-                            start_datetime=start_dt,
-                            end_datetime=end_dt,
-                            location=current_event.get("location", "")
-                        )
-                        db.session.add(cal_event)
-                        events_found.append(cal_event.to_dict())
-                    except Exception as parse_err:
-                        print(f"Error parsing event: {parse_err}")
-                        continue
-                current_event = {}
-                in_event = False
-            elif line.startswith("SUMMARY:"):
-                current_event["title"] = line.split(":", 1)[1] if ":" in line else ""
-            elif line.startswith("DTSTART"):
-                dt_part = line.split(":", 1)[1] if ":" in line else ""
-                current_event["start"] = dt_part
-            elif line.startswith("DTEND"):
-                dt_part = line.split(":", 1)[1] if ":" in line else ""
-                current_event["end"] = dt_part
-            elif line.startswith("LOCATION:"):
-                current_event["location"] = line.split(":", 1)[1] if ":" in line else ""
-            elif line.startswith("DESCRIPTION:"):
-                current_event["description"] = line.split(":", 1)[1] if ":" in line else ""
+        # Parse the upload as it streams in and apply only what changed since the last upload
+        preview = []
+        changes = sync_calendar_events(
+            UniversityOfficialCalendarEvent,
+            {"calendar_id": calendar.id},
+            parse_ical_stream(file.stream),
+            preview
+        )
         
         calendar.last_synced = datetime.utcnow()
         db.session.commit()
@@ -2736,8 +5962,20 @@ def upload_university_calendar():
         return jsonify({
             "message": "Calendar uploaded and synced successfully",
             "calendar": calendar.to_dict(),
-            "events_found": len(events_found),
-            "events": events_found[:10]
+            "events_found": changes["inserted"] + changes["updated"] + changes["unchanged"],
+            "changes": changes,
+            "events": [
+                {
+                    "title": item["title"],
+                    "description": item["description"],
+                    "start_datetime": str(item["start"]),
+                    "end_datetime": str(item["end"]),
+                    "location": item["location"],
+                    "date": str(item["start"].date()),
+                    "time": str(item["start"].time())
+                }
+                for item in preview
+            ]
         }), 200
         
     except Exception as e:
@@ -2756,6 +5994,70 @@ def get_university_calendars():
     return jsonify([cal.to_dict() for cal in calendars]), 200
 
 
+@university_bp.route("/calendar/clashes", methods=["GET"])
+@university_required
+def university_calendar_clashes():
+    """Report club events that overlap official calendar entries in a date range.
+
+    Club events and the official entries in range are swept together, so the
+    report costs O((n+m) log(n+m)) instead of comparing every pair.
+    """
+    try:
+        start_date = parse_date_arg(request.args.get("start_date")) or datetime.utcnow().date()
+        end_date = parse_date_arg(request.args.get("end_date")) or start_date + timedelta(days=CALENDAR_DEFAULT_RANGE_DAYS)
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Use YYYY-MM-DD."}), 400
+    if end_date < start_date:
+        return jsonify({"error": "end_date must be on or after start_date"}), 400
+    if (end_date - start_date).days > CALENDAR_MAX_RANGE_DAYS:
+        return jsonify({"error": f"Date range cannot exceed {CALENDAR_MAX_RANGE_DAYS} days"}), 400
+    
+    rows = (
+        db.session.query(
+            Event.id, Event.title, Event.date, Event.time, Event.location, Club.id, Club.name, Event.duration_minutes
+        )
+        .join(Club, Club.id == Event.club_id)
+        .filter(Event.date >= start_date, Event.date <= end_date)
+        .all()
+    )
+    club_events = [(*event_interval(row[2], row[3], row[7]), row) for row in rows]
+    official = official_calendar_index.overlapping(
+        datetime.combine(start_date, datetime.min.time()),
+        datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+    )
+    
+    report = {}
+    for (start, end, row), entry in sweep_interval_overlaps(club_events, official):
+        event_id, title, event_date, event_time, location, club_id, club_name, _ = row
+        if event_id not in report:
+            report[event_id] = {
+                "event": {
+                    "id": event_id,
+                    "title": title,
+                    "date": str(event_date),
+                    "time": str(event_time),
+                    "location": location,
+                    "club_id": club_id,
+                    "club_name": club_name
+                },
+                "clashes": []
+            }
+        report[event_id]["clashes"].append(official_calendar_index.entry_to_dict(entry))
+    
+    clashes = sorted(report.values(), key=lambda item: (item["event"]["date"], item["event"]["time"], item["event"]["id"]))
+    for item in clashes:
+        item["clashes"].sort(key=lambda clash: (clash["start_datetime"], clash["id"]))
+    
+    return jsonify({
+        "start_date": str(start_date),
+        "end_date": str(end_date),
+        "events_checked": len(club_events),
+        "official_entries": len(official),
+        "clashing_events": len(clashes),
+        "clashes": clashes
+    }), 200
+
+
 @university_bp.route("/clubs/<int:club_id>/calendar-permission", methods=["POST"])
 @university_required
 def grant_calendar_permission(club_id):
@@ -2816,15 +6118,306 @@ def revoke_calendar_permission(club_id):
     if not permission:
         return jsonify({"error": "Permission not found"}), 404
     
-    club_name = permission.club.name if permission.club else "Unknown"
-    db.session.delete(permission)
-    db.session.commit()
+    club_name = permission.club.name if permission.club else "Unknown"
+    db.session.delete(permission)
+    db.session.commit()
+    
+    return jsonify({
+        "message": f"Calendar permission revoked from {club_name}"
+    }), 200
+
+
+UNIVERSITY_KPI_FIELDS = ("clubs", "events", "participants", "leaders", "registrations", "check_ins")
+UNIVERSITY_KPI_MAX_MONTHS = 36
+
+
+def compute_university_kpis():
+    """Count every university KPI from the base tables in a single statement."""
+    row = db.session.query(
+        db.session.query(func.count(Club.id)).scalar_subquery().label("clubs"),
+        db.session.query(func.count(Event.id)).scalar_subquery().label("events"),
+        db.session.query(func.count(User.id)).filter(User.role == "participant").scalar_subquery().label("participants"),
+        db.session.query(func.count(User.id)).filter(User.role == "leader").scalar_subquery().label("leaders"),
+        db.session.query(func.count(Registration.id)).filter(
+            Registration.cancelled == False
+        ).scalar_subquery().label("registrations"),
+        db.session.query(func.count(Registration.id)).filter(
+            Registration.checked_in == True
+        ).scalar_subquery().label("check_ins"),
+    ).one()
+    return {field: int(getattr(row, field) or 0) for field in UNIVERSITY_KPI_FIELDS}
+
+
+def compute_university_kpi_deltas(since):
+    """Rows added after `since`, read through the creation-time indexes (deletions wait for the next snapshot)."""
+    row = db.session.query(
+        db.session.query(func.count(Club.id)).filter(Club.created_at > since).scalar_subquery().label("clubs"),
+        db.session.query(func.count(Event.id)).filter(Event.created_at > since).scalar_subquery().label("events"),
+        db.session.query(func.count(User.id)).filter(
+            User.created_at > since, User.role == "participant"
+        ).scalar_subquery().label("participants"),
+        db.session.query(func.count(User.id)).filter(
+            User.created_at > since, User.role == "leader"
+        ).scalar_subquery().label("leaders"),
+        db.session.query(func.count(Registration.id)).filter(
+            Registration.timestamp > since, Registration.cancelled == False
+        ).scalar_subquery().label("registrations"),
+        db.session.query(func.count(Registration.id)).filter(
+            Registration.checked_in_at > since, Registration.checked_in == True
+        ).scalar_subquery().label("check_ins"),
+    ).one()
+    return {field: int(getattr(row, field) or 0) for field in UNIVERSITY_KPI_FIELDS}
+
+
+def get_university_kpi_snapshot():
+    """Today's KPI snapshot row, taking it with one full count on the first read of the day."""
+    today = datetime.utcnow().date()
+    snapshot = UniversityKpiSnapshot.query.get(today)
+    if snapshot:
+        return snapshot
+    
+    try:
+        snapshot = UniversityKpiSnapshot(
+            snapshot_date=today,
+            computed_at=datetime.utcnow(),
+            **compute_university_kpis()
+        )
+        db.session.add(snapshot)
+        db.session.commit()
+        return snapshot
+    except Exception as snapshot_err:
+        # Another request took today's snapshot first
+        db.session.rollback()
+        snapshot = UniversityKpiSnapshot.query.get(today)
+        if snapshot:
+            return snapshot
+        raise snapshot_err
+
+
+def get_university_kpis():
+    """Current university totals: today's snapshot plus what was added since it was taken."""
+    snapshot = get_university_kpi_snapshot()
+    today = compute_university_kpi_deltas(snapshot.computed_at)
+    totals = {field: getattr(snapshot, field) + today[field] for field in UNIVERSITY_KPI_FIELDS}
+    return totals, today, snapshot
+
+
+def university_kpi_history(start, end):
+    """End-of-day totals for every day in [start, end], rebuilt from row timestamps.
+
+    Each KPI is one grouped count by the day a row appeared; rows with no usable
+    timestamp count from the start. Cancellations and check-ins use their current
+    state, so history is an approximation of what the dashboard showed back then.
+    """
+    first_registration = (
+        db.session.query(func.min(Registration.timestamp))
+        .filter(Registration.email == User.email).scalar_subquery()
+    )
+    first_club = (
+        db.session.query(func.min(Club.created_at))
+        .filter(Club.leader_id == User.id).scalar_subquery()
+    )
+    first_event = (
+        db.session.query(func.min(func.coalesce(Event.created_at, Event.date)))
+        .filter(Event.club_id == Club.id).scalar_subquery()
+    )
+    sources = {
+        "clubs": (func.coalesce(Club.created_at, first_event), []),
+        "events": (func.coalesce(Event.created_at, Event.date), []),
+        "participants": (func.coalesce(User.created_at, first_registration), [User.role == "participant"]),
+        "leaders": (func.coalesce(User.created_at, first_club), [User.role == "leader"]),
+        "registrations": (Registration.timestamp, [Registration.cancelled == False]),
+        "check_ins": (
+            func.coalesce(
+                Registration.checked_in_at,
+                db.session.query(Event.date).filter(Event.id == Registration.event_id).scalar_subquery()
+            ),
+            [Registration.checked_in == True]
+        ),
+    }
+    
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    history = {day: {} for day in days}
+    for field, (appeared, filters) in sources.items():
+        appeared_day = func.date(appeared).label("appeared_day")
+        added = {}
+        running = 0
+        for day, count in db.session.query(appeared_day, func.count()).filter(*filters).group_by(appeared_day):
+            day = date.fromisoformat(str(day)[:10]) if day is not None else None
+            if day is None or day < start:
+                running += count
+            else:
+                added[day] = count
+        for day in days:
+            running += added.get(day, 0)
+            history[day][field] = running
+    return history
+
+
+def backfill_university_kpi_snapshots(months=UNIVERSITY_KPI_MAX_MONTHS):
+    """Write a snapshot for every missing day of the trend window before today; returns rows added."""
+    today = datetime.utcnow().date()
+    start = today.replace(day=1)
+    for _ in range(months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+    end = today - timedelta(days=1)
+    if end < start:
+        return 0
+    
+    present = db.session.query(func.count()).select_from(UniversityKpiSnapshot).filter(
+        UniversityKpiSnapshot.snapshot_date.between(start, end)
+    ).scalar()
+    if present >= (end - start).days + 1:
+        return 0
+    
+    existing = {
+        day for (day,) in db.session.query(UniversityKpiSnapshot.snapshot_date).filter(
+            UniversityKpiSnapshot.snapshot_date.between(start, end)
+        )
+    }
+    rows = [
+        {
+            "snapshot_date": day,
+            # Backfilled rows describe the end of their day
+            "computed_at": datetime.combine(day + timedelta(days=1), datetime.min.time()),
+            **totals
+        }
+        for day, totals in university_kpi_history(start, end).items() if day not in existing
+    ]
+    # Another worker may be backfilling the same days; its rows win
+    insert_missing_rows(UniversityKpiSnapshot, rows)
+    db.session.commit()
+    return len(rows)
+
+
+class UniversityKpiScheduler:
+    """Background thread that writes today's KPI snapshot and fills any missing days."""
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, app, interval_minutes):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(app, max(interval_minutes, 1) * 60), daemon=True, name="university-kpi-scheduler"
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, app, tick_seconds):
+        # First tick right away so a fresh deployment gets its history at startup
+        while True:
+            with app.app_context():
+                try:
+                    get_university_kpi_snapshot()
+                    added = backfill_university_kpi_snapshots()
+                    if added:
+                        print(f"✅ Backfilled {added} university KPI snapshots")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"University KPI snapshot failed: {e}")
+                finally:
+                    db.session.remove()
+            if self._stop.wait(tick_seconds):
+                return
+
+
+university_kpi_scheduler = UniversityKpiScheduler()
+
+
+@university_bp.route("/kpis", methods=["GET"])
+@university_required
+def university_kpis():
+    """Get current university KPIs with today's deltas, served from the daily snapshot."""
+    try:
+        totals, today, snapshot = get_university_kpis()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to load KPIs: {str(e)}"}), 500
+    
+    return jsonify({
+        "kpis": totals,
+        "today": today,
+        "snapshot": {"date": snapshot.snapshot_date.isoformat(), "computed_at": str(snapshot.computed_at)}
+    }), 200
+
+
+@university_bp.route("/kpis/trend", methods=["GET"])
+@university_required
+def university_kpi_trend():
+    """Get the KPI trend from the daily snapshots (?months=12, ?granularity=day|month).
+    
+    Month buckets report the last snapshot taken in each month. Snapshots are
+    written by UniversityKpiScheduler, which also backfills missing days from
+    row timestamps.
+    """
+    try:
+        months = int(request.args.get("months", 12))
+    except ValueError:
+        return jsonify({"error": "months must be an integer"}), 400
+    if months < 1 or months > UNIVERSITY_KPI_MAX_MONTHS:
+        return jsonify({"error": f"months must be between 1 and {UNIVERSITY_KPI_MAX_MONTHS}"}), 400
+    
+    granularity = request.args.get("granularity", "month")
+    if granularity not in ("day", "month"):
+        return jsonify({"error": "granularity must be 'day' or 'month'"}), 400
+    
+    try:
+        totals, today, snapshot = get_university_kpis()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to load KPIs: {str(e)}"}), 500
+    
+    # First day of the oldest month in the window (the current month counts as one)
+    start = snapshot.snapshot_date.replace(day=1)
+    for _ in range(months - 1):
+        start = (start - timedelta(days=1)).replace(day=1)
+    
+    rows = UniversityKpiSnapshot.query.filter(
+        UniversityKpiSnapshot.snapshot_date >= start
+    ).order_by(UniversityKpiSnapshot.snapshot_date).all()
+    
+    points = [row.to_dict() for row in rows]
+    # The latest point reflects today so far rather than this morning's snapshot
+    if points and points[-1]["date"] == snapshot.snapshot_date.isoformat():
+        points[-1].update(totals)
+    
+    if granularity == "month":
+        buckets = {}
+        for point in points:
+            buckets[point["date"][:7]] = point
+        points = [{**point, "month": month} for month, point in buckets.items()]
     
     return jsonify({
-        "message": f"Calendar permission revoked from {club_name}"
+        "granularity": granularity,
+        "months": months,
+        "from": start.isoformat(),
+        "points": points,
+        "kpis": totals,
+        "today": today
     }), 200
 
 
+@university_bp.route("/recommendations/refresh", methods=["POST"])
+@university_required
+def refresh_stored_recommendations():
+    """Run the recommendation job now: changed participants only, or everyone with {"full": true}."""
+    data = request.get_json(silent=True) or {}
+    try:
+        result = refresh_recommendations(full=bool(data.get("full")))
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Recommendation refresh failed: {str(e)}"}), 500
+    return jsonify(result), 200
+
+
 # ============================================================================
 # SECTION 13: ROUTE BLUEPRINTS - AI FEATURES
 # ============================================================================
@@ -2838,6 +6431,15 @@ except ImportError:
     genai = None  # type: ignore[assignment]
     print("Warning: google-generativeai not installed. Install with: pip install google-generativeai")
 
+# Local recommender (numpy + scipy); recommend_events falls back to category matching without them
+try:
+    import numpy as np  # type: ignore[import]
+    from scipy import sparse  # type: ignore[import]
+except ImportError:
+    np = None  # type: ignore[assignment]
+    sparse = None  # type: ignore[assignment]
+    print("Warning: numpy/scipy not installed. Local recommendations disabled. Install with: pip install numpy scipy")
+
 if GEMINI_API_KEY and genai:
     try:
         genai.configure(api_key=GEMINI_API_KEY)
@@ -2910,38 +6512,242 @@ def generate_fallback_insights(base_analytics, attendance_rate, event_attendance
     }
 
 
-def call_gemini(prompt, model_name="gemini-pro", max_output_tokens=500):
-    """Call Google Gemini API."""
+_gemini_cache_inserts = 0
+
+
+def gemini_cache_key(model_name, prompt, generation_config):
+    """Stable hash of everything that determines a Gemini response."""
+    raw = json.dumps({"model": model_name, "prompt": prompt, "config": generation_config}, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def record_gemini_cache_stat(conn, hits=0, misses=0, latency_saved_ms=0):
+    """Add to today's cache counters (one upsert on the caller's connection)."""
+    conn.execute(text(
+        "INSERT INTO gemini_cache_stats (stat_date, hits, misses, latency_saved_ms) "
+        "VALUES (:today, :hits, :misses, :saved) "
+        "ON CONFLICT (stat_date) DO UPDATE SET hits = gemini_cache_stats.hits + :hits, "
+        "misses = gemini_cache_stats.misses + :misses, "
+        "latency_saved_ms = gemini_cache_stats.latency_saved_ms + :saved"
+    ), {"today": datetime.utcnow().date(), "hits": hits, "misses": misses, "saved": latency_saved_ms})
+
+
+def get_cached_gemini_response(cache_key):
+    """Cached response text for a key, or None. Hits refresh the entry's LRU position.
+
+    Cache reads and writes use their own connection and transaction, so they
+    never commit or roll back the calling request's session.
+    """
+    now = datetime.utcnow()
+    try:
+        with db.engine.begin() as conn:
+            row = conn.execute(
+                db.select(GeminiResponseCache.response, GeminiResponseCache.latency_ms)
+                .where(GeminiResponseCache.cache_key == cache_key, GeminiResponseCache.expires_at > now)
+            ).first()
+            if row is None:
+                record_gemini_cache_stat(conn, misses=1)
+                return None
+            conn.execute(
+                update(GeminiResponseCache)
+                .where(GeminiResponseCache.cache_key == cache_key)
+                .values(hit_count=GeminiResponseCache.hit_count + 1, last_hit_at=now)
+            )
+            record_gemini_cache_stat(conn, hits=1, latency_saved_ms=row.latency_ms)
+            return row.response
+    except Exception as cache_err:
+        print(f"Gemini cache read failed: {cache_err}")
+        return None
+
+
+def store_gemini_response(cache_key, model_name, response_text, latency_ms):
+    """Cache a fresh response; every 50th insert also evicts expired and least recently used entries."""
+    global _gemini_cache_inserts
+    now = datetime.utcnow()
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(delete(GeminiResponseCache).where(GeminiResponseCache.cache_key == cache_key))
+            conn.execute(insert(GeminiResponseCache).values(
+                cache_key=cache_key,
+                model_name=model_name,
+                response=response_text,
+                latency_ms=latency_ms,
+                hit_count=0,
+                created_at=now,
+                expires_at=now + timedelta(seconds=GEMINI_CACHE_TTL_SECONDS),
+                last_hit_at=now
+            ))
+    except Exception as cache_err:
+        # Usually another worker cached the same prompt at the same moment
+        print(f"Gemini cache write skipped: {cache_err}")
+        return
+    
+    _gemini_cache_inserts += 1
+    if _gemini_cache_inserts % 50 != 1:
+        return
+    try:
+        with db.engine.begin() as conn:
+            conn.execute(delete(GeminiResponseCache).where(GeminiResponseCache.expires_at <= now))
+            excess = conn.execute(db.select(func.count()).select_from(GeminiResponseCache)).scalar() - GEMINI_CACHE_MAX_ENTRIES
+            if excess > 0:
+                oldest = (
+                    db.select(GeminiResponseCache.cache_key)
+                    .order_by(GeminiResponseCache.last_hit_at.asc())
+                    .limit(excess)
+                )
+                conn.execute(delete(GeminiResponseCache).where(GeminiResponseCache.cache_key.in_(oldest)))
+    except Exception as evict_err:
+        print(f"Gemini cache eviction failed: {evict_err}")
+
+
+def call_gemini(prompt, model_name="gemini-pro", max_output_tokens=500, use_cache=True):
+    """Call Google Gemini API, answering repeated prompts from the shared response cache."""
     if not GEMINI_API_KEY:
         raise ValueError("Gemini API key not configured. Set GEMINI_API_KEY in your .env file")
     
     if not gemini_model:
         raise ValueError("Gemini AI not initialized. Install google-generativeai package: pip install google-generativeai")
     
+    generation_config = {
+        "temperature": 0.7,
+        "top_p": 0.8,
+        "top_k": 40,
+        "max_output_tokens": max_output_tokens,
+    }
+    cache_key = None
+    if GEMINI_CACHE_TTL_SECONDS > 0:
+        cache_key = gemini_cache_key(model_name, prompt, generation_config)
+        if use_cache:
+            cached = get_cached_gemini_response(cache_key)
+            if cached is not None:
+                return cached
+    
+    started = datetime.utcnow()
+    text_response = request_gemini(prompt, generation_config)
+    if cache_key:
+        latency_ms = int((datetime.utcnow() - started).total_seconds() * 1000)
+        store_gemini_response(cache_key, model_name, text_response, latency_ms)
+    return text_response
+
+
+def generate_gemini_text(prompt, generation_config):
+    """Send one prompt to Gemini and extract the response text (runs on the Gemini executor)."""
+    response = gemini_model.generate_content(prompt, generation_config=generation_config)
+    
+    if response and response.text:
+        return response.text.strip()
+    elif response and hasattr(response, 'candidates') and response.candidates:
+        candidate = response.candidates[0]
+        if hasattr(candidate, 'content') and candidate.content:
+            if hasattr(candidate.content, 'parts'):
+                text_parts = [part.text for part in candidate.content.parts if hasattr(part, 'text')]
+                if text_parts:
+                    return ' '.join(text_parts).strip()
+        raise Exception("Could not extract text from Gemini response")
+    else:
+        raise Exception("Empty response from Gemini API")
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After failure_threshold failures in a row the circuit opens and calls are
+    refused for cooldown_seconds. After the cooldown one trial call is let
+    through (half-open): success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold, cooldown_seconds):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.cooldown = timedelta(seconds=cooldown_seconds)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def is_open(self):
+        """True while calls are refused outright (no state change)."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            return self._trial_running or datetime.utcnow() - self._opened_at < self.cooldown
+
+    def allow(self):
+        """Whether a call may proceed; claims the single trial call when half-open."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or datetime.utcnow() - self._opened_at < self.cooldown:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                self._opened_at = datetime.utcnow()
+            self._trial_running = False
+
+    def to_dict(self):
+        with self._lock:
+            if self._opened_at is None:
+                state = "closed"
+            elif self._trial_running or datetime.utcnow() - self._opened_at < self.cooldown:
+                state = "open"
+            else:
+                state = "half_open"
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened_at": str(self._opened_at) if self._opened_at else None
+            }
+
+
+gemini_breaker = CircuitBreaker(GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_COOLDOWN_SECONDS)
+# A slot is held until the remote call really returns, even after its caller gave up,
+# so calls stuck past the deadline still count against the cap
+_gemini_slots = threading.BoundedSemaphore(max(GEMINI_MAX_CONCURRENCY, 1))
+_gemini_executor = ThreadPoolExecutor(max_workers=max(GEMINI_MAX_CONCURRENCY, 1), thread_name_prefix="gemini")
+
+
+def request_gemini(prompt, generation_config):
+    """Send one prompt to Gemini with a deadline, the circuit breaker and the concurrency cap.
+
+    The call runs on a small executor and the request thread waits at most
+    GEMINI_TIMEOUT_SECONDS for it. Refusals (open circuit, no free slot) and
+    timeouts raise immediately so callers fall back to their non-AI answers.
+    """
+    if gemini_breaker.is_open():
+        raise Exception("Gemini API temporarily unavailable (circuit open)")
+    # The callback below must release the semaphore this call acquired
+    slots = _gemini_slots
+    if not slots.acquire(timeout=GEMINI_QUEUE_WAIT_SECONDS):
+        raise Exception("Gemini API busy: too many requests in progress")
+    if not gemini_breaker.allow():
+        slots.release()
+        raise Exception("Gemini API temporarily unavailable (circuit open)")
+    
     try:
-        generation_config = {
-            "temperature": 0.7,
-            "top_p": 0.8,
-            "top_k": 40,
-            "max_output_tokens": max_output_tokens,
-        }
-        
-        response = gemini_model.generate_content(prompt, generation_config=generation_config)
-        
-        if response and response.text:
-            return response.text.strip()
-        elif response and hasattr(response, 'candidates') and response.candidates:
-            candidate = response.candidates[0]
-            if hasattr(candidate, 'content') and candidate.content:
-                if hasattr(candidate.content, 'parts'):
-                    text_parts = [part.text for part in candidate.content.parts if hasattr(part, 'text')]
-                    if text_parts:
-                        return ' '.join(text_parts).strip()
-            raise Exception("Could not extract text from Gemini response")
-        else:
-            raise Exception("Empty response from Gemini API")
-            
+        future = _gemini_executor.submit(generate_gemini_text, prompt, generation_config)
+    except Exception:
+        slots.release()
+        gemini_breaker.record_failure()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    
+    try:
+        text_response = future.result(timeout=GEMINI_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        gemini_breaker.record_failure()
+        raise Exception(f"Gemini API timed out after {GEMINI_TIMEOUT_SECONDS}s")
     except Exception as e:
+        gemini_breaker.record_failure()
         error_msg = str(e)
         if "API key" in error_msg or "authentication" in error_msg.lower():
             raise Exception("Invalid Gemini API key. Please check your GEMINI_API_KEY in .env file")
@@ -2951,6 +6757,57 @@ def call_gemini(prompt, model_name="gemini-pro", max_output_tokens=500):
             raise Exception("google-generativeai package not installed. Run: pip install google-generativeai")
         else:
             raise Exception(f"Gemini API error: {error_msg}")
+    
+    gemini_breaker.record_success()
+    return text_response
+
+
+@ai_bp.route("/status", methods=["GET"])
+@jwt_required()
+def gemini_status():
+    """Whether AI features are currently served by Gemini or by the fallbacks."""
+    circuit = gemini_breaker.to_dict()
+    return jsonify({
+        "configured": bool(gemini_model and GEMINI_API_KEY),
+        "available": bool(gemini_model and GEMINI_API_KEY) and circuit["state"] != "open",
+        "circuit": circuit,
+        "timeout_seconds": GEMINI_TIMEOUT_SECONDS,
+        "max_concurrency": GEMINI_MAX_CONCURRENCY
+    }), 200
+
+
+@ai_bp.route("/cache-stats", methods=["GET"])
+@university_required
+def gemini_cache_stats():
+    """Gemini response cache size, hit rate and API time saved over the last ?days=30."""
+    try:
+        days = min(max(int(request.args.get("days", 30)), 1), 366)
+    except ValueError:
+        return jsonify({"error": "days must be an integer"}), 400
+    
+    since = datetime.utcnow().date() - timedelta(days=days - 1)
+    rows = GeminiCacheStat.query.filter(GeminiCacheStat.stat_date >= since).order_by(GeminiCacheStat.stat_date).all()
+    entries, cached_hits = db.session.query(
+        func.count(GeminiResponseCache.cache_key), func.coalesce(func.sum(GeminiResponseCache.hit_count), 0)
+    ).one()
+    
+    hits = sum(row.hits for row in rows)
+    misses = sum(row.misses for row in rows)
+    return jsonify({
+        "enabled": GEMINI_CACHE_TTL_SECONDS > 0,
+        "ttl_seconds": GEMINI_CACHE_TTL_SECONDS,
+        "max_entries": GEMINI_CACHE_MAX_ENTRIES,
+        "entries": entries,
+        "entry_hits": int(cached_hits),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "latency_saved_ms": sum(row.latency_saved_ms for row in rows),
+        "daily": [
+            {"date": str(row.stat_date), "hits": row.hits, "misses": row.misses, "latency_saved_ms": row.latency_saved_ms}
+            for row in rows
+        ]
+    }), 200
 
 
 @ai_bp.route("/suggest-event", methods=["POST"])
@@ -3188,7 +7045,31 @@ def leader_insights():
                 "recommendations": ["Create your first club to start organizing events"]
             }), 200
         
-        base_analytics = get_event_analytics(leader_id=leader_id)
+        try:
+            start_date, end_date, bucket, max_points = parse_timeseries_args(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # Snapshots only hold the default view; a custom range is computed fresh
+        ranged = bool(start_date or end_date or max_points)
+
+        data_version = get_leader_data_version(leader_id)
+        if request.args.get("refresh") != "1" and not ranged:
+            snapshot = LeaderInsightSnapshot.query.get(leader_id)
+            # Fallback insights are only reused while Gemini is unavailable
+            if (snapshot and snapshot.data_version == data_version
+                    and (snapshot.source == "gemini" or not gemini_model)):
+                insights = json.loads(snapshot.insights)
+                insights["snapshot"] = {
+                    "cached": True,
+                    "data_version": data_version,
+                    "computed_at": str(snapshot.computed_at)
+                }
+                return jsonify(insights), 200
+        
+        base_analytics = get_event_analytics(
+            leader_id=leader_id, start_date=start_date, end_date=end_date,
+            bucket=bucket, max_points=max_points
+        )
         attendance_stats = get_attendance_stats(leader_id=leader_id)
         
         event_attendance = (
@@ -3264,9 +7145,13 @@ def leader_insights():
         }
         
         prompt = build_leader_insight_prompt(analytics_data)
+        source = "fallback"
 
         try:
-            ai_response = call_gemini(prompt, max_output_tokens=800)
+            # ?refresh=1 asks for new insights, so it skips the response cache too
+            ai_response = call_gemini(
+                prompt, max_output_tokens=800, use_cache=request.args.get("refresh") != "1"
+            )
             
             try:
                 if "{" in ai_response and "}" in ai_response:
@@ -3280,11 +7165,31 @@ def leader_insights():
                         "key_insights": [line.strip() for line in ai_response.split("\n") if line.strip() and not line.strip().startswith("#")][:5],
                         "recommendations": []
                     }
+                source = "gemini"
             except json.JSONDecodeError:
                 insights = generate_fallback_insights(base_analytics, attendance_rate, event_attendance, active_days, category_performance)
         except Exception:
             insights = generate_fallback_insights(base_analytics, attendance_rate, event_attendance, active_days, category_performance)
         
+        computed_at = datetime.utcnow()
+        if ranged:
+            insights["snapshot"] = {"cached": False, "data_version": data_version, "computed_at": str(computed_at)}
+            return jsonify(insights), 200
+        try:
+            db.session.merge(LeaderInsightSnapshot(
+                leader_id=leader_id,
+                data_version=data_version,
+                analytics_data=json.dumps(analytics_data, default=str),
+                insights=json.dumps(insights),
+                source=source,
+                computed_at=computed_at
+            ))
+            db.session.commit()
+        except Exception as snapshot_err:
+            db.session.rollback()
+            print(f"Failed to store insight snapshot: {snapshot_err}")
+        
+        insights["snapshot"] = {"cached": False, "data_version": data_version, "computed_at": str(computed_at)}
         return jsonify(insights), 200
         
     except Exception as e:
@@ -3295,6 +7200,584 @@ def leader_insights():
         }), 500
 
 
+# ============================================================================
+# LOCAL HYBRID RECOMMENDER
+# ============================================================================
+
+RECOMMENDER_STOPWORDS = frozenset(
+    "a an and are as at be by for from in into is it of on or our the this to with you your we will".split()
+)
+
+
+def recommender_terms(title, description, category):
+    """Term counts of an event's text; the category is one extra, heavily weighted term."""
+    terms = {}
+    for word in re.findall(r"[a-z0-9]+", f"{title or ''} {description or ''}".lower()):
+        if len(word) > 1 and word not in RECOMMENDER_STOPWORDS:
+            terms[word] = terms.get(word, 0) + 1
+    if category:
+        terms["category:" + category.strip().lower()] = 3
+    return terms
+
+
+class LocalRecommender:
+    """In-process hybrid recommender over events and registrations.
+
+    Content: TF-IDF vectors of event title, description and category; a
+    participant's profile is the sum of the vectors of their events.
+    Collaborative: item-item cosine similarity over the participant x event
+    registration matrix R, evaluated per request as (R u) R with degree
+    normalisation, so the item-item matrix is never materialised.
+
+    refresh() compares a cheap signature of the source tables and only
+    re-reads what moved: term counts are cached per event and recomputed for
+    new or edited events, and new registrations are appended by id. The
+    sparse matrices are then reassembled with vectorised numpy code.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self._event_terms = {}  # event_id -> ((title, description, category), terms)
+        self._events = {}  # event_id -> (date, category)
+        self._pairs = {}  # registration id -> (email, event_id)
+        self._max_registration_id = 0
+        self._model = None
+
+    @staticmethod
+    def available():
+        return np is not None and sparse is not None
+
+    def _read_signature(self):
+        return db.session.query(
+            db.session.query(func.max(Event.id)).scalar_subquery(),
+            db.session.query(func.count(Event.id)).scalar_subquery(),
+            db.session.query(func.max(Registration.id)).scalar_subquery(),
+            db.session.query(func.count(Registration.id)).filter(Registration.cancelled == False).scalar_subquery(),
+            # Bumped on every event edit, registration and cancellation
+            db.session.query(func.coalesce(func.sum(LeaderDataVersion.version), 0)).scalar_subquery(),
+        ).one()
+
+    def refresh(self):
+        """Bring the model up to date with the database and return it."""
+        signature = tuple(self._read_signature())
+        if signature == self._signature and self._model is not None:
+            return self._model
+        with self._lock:
+            if signature == self._signature and self._model is not None:
+                return self._model
+            self._load_events()
+            self._load_registrations(signature)
+            self._model = self._build()
+            self._signature = signature
+            return self._model
+
+    def _load_events(self):
+        events = {}
+        event_terms = {}
+        rows = (
+            db.session.query(Event.id, Event.title, Event.description, Event.date, Club.category)
+            .join(Club, Club.id == Event.club_id)
+        )
+        for event_id, title, description, event_date, category in rows:
+            key = (title, description, category)
+            cached = self._event_terms.get(event_id)
+            event_terms[event_id] = cached if cached and cached[0] == key else (key, recommender_terms(*key))
+            events[event_id] = (event_date, category)
+        self._events = events
+        self._event_terms = event_terms
+
+    def _load_registrations(self, signature):
+        _, _, max_registration_id, active_registrations, _ = signature
+        max_registration_id = max_registration_id or 0
+        new_rows = []
+        if self._pairs and max_registration_id >= self._max_registration_id:
+            new_rows = (
+                db.session.query(Registration.id, Registration.email, Registration.event_id)
+                .filter(Registration.id > self._max_registration_id, Registration.cancelled == False)
+                .all()
+            )
+        if self._pairs and len(self._pairs) + len(new_rows) == active_registrations:
+            # Only additions since the last refresh
+            for registration_id, email, event_id in new_rows:
+                self._pairs[registration_id] = (email.lower(), event_id)
+        else:
+            self._pairs = {
+                registration_id: (email.lower(), event_id)
+                for registration_id, email, event_id in
+                db.session.query(Registration.id, Registration.email, Registration.event_id)
+                .filter(Registration.cancelled == False)
+            }
+        self._max_registration_id = max_registration_id
+
+    def _build(self):
+        event_ids = sorted(self._events)
+        event_index = {event_id: i for i, event_id in enumerate(event_ids)}
+        n_events = len(event_ids)
+
+        vocabulary = {}
+        rows, cols, counts = [], [], []
+        for i, event_id in enumerate(event_ids):
+            for term, count in self._event_terms[event_id][1].items():
+                rows.append(i)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                counts.append(count)
+        tf = sparse.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+            shape=(n_events, max(len(vocabulary), 1))
+        )
+        document_frequency = np.bincount(tf.indices, minlength=tf.shape[1])
+        idf = np.log((1.0 + n_events) / (1.0 + document_frequency)) + 1.0
+        tfidf = sparse.csr_matrix(tf.multiply(idf))
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        tfidf = sparse.csr_matrix(sparse.diags(1.0 / norms) @ tfidf)
+
+        user_index = {}
+        user_rows, event_cols = [], []
+        for email, event_id in set(self._pairs.values()):
+            if event_id in event_index:
+                user_rows.append(user_index.setdefault(email, len(user_index)))
+                event_cols.append(event_index[event_id])
+        interactions = sparse.csr_matrix(
+            (np.ones(len(user_rows)), (np.asarray(user_rows, dtype=np.int64), np.asarray(event_cols, dtype=np.int64))),
+            shape=(max(len(user_index), 1), n_events)
+        )
+        degree = np.asarray(interactions.sum(axis=0)).ravel()
+        inverse_sqrt_degree = np.zeros(n_events)
+        inverse_sqrt_degree[degree > 0] = 1.0 / np.sqrt(degree[degree > 0])
+
+        return {
+            "event_ids": np.asarray(event_ids, dtype=np.int64),
+            "event_index": event_index,
+            "day_ordinals": np.asarray([self._events[event_id][0].toordinal() for event_id in event_ids], dtype=np.int64),
+            "tfidf": tfidf,
+            "user_index": user_index,
+            "interactions": interactions,
+            "normalized_interactions": sparse.csr_matrix(interactions @ sparse.diags(inverse_sqrt_degree)),
+            "inverse_sqrt_degree": inverse_sqrt_degree,
+            "popularity": degree,
+        }
+
+    def recommend(self, email, k=3, from_date=None, model=None):
+        """Top-k upcoming events for a participant: [(event_id, score, content, collaborative, popularity)]."""
+        model = model or self.refresh()
+        user = model["user_index"].get((email or "").lower())
+        if user is None or not len(model["event_ids"]):
+            return []
+        history = model["interactions"].getrow(user)
+        seen = history.indices
+
+        profile = (history @ model["tfidf"]).toarray().ravel()
+        content = np.asarray(model["tfidf"] @ profile).ravel()
+        if content.max() > 0:
+            content /= content.max()
+
+        # Cosine item-item CF: score_j = sum_v (sum_i u_i R_vi / sqrt(d_i)) R_vj / sqrt(d_j),
+        # i.e. u S with S = R^T R / sqrt(d_i d_j); each 1/sqrt(d) is applied exactly once
+        weighted_history = history.multiply(model["inverse_sqrt_degree"])
+        neighbours = model["interactions"] @ weighted_history.T
+        collaborative = (neighbours.T @ model["normalized_interactions"]).toarray().ravel()
+        if collaborative.max() > 0:
+            collaborative /= collaborative.max()
+
+        scores = RECOMMENDER_CONTENT_WEIGHT * content + (1 - RECOMMENDER_CONTENT_WEIGHT) * collaborative
+        from_date = from_date or datetime.utcnow().date()
+        candidates = model["day_ordinals"] >= from_date.toordinal()
+        candidates[seen] = False
+        scores[~candidates] = -1.0
+        eligible = int(candidates.sum())
+        if not eligible:
+            return []
+        k = min(k, eligible)
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Ties (e.g. no signal at all) go to the more popular event
+        top = sorted(top, key=lambda i: (-scores[i], -model["popularity"][i]))
+        return [
+            (
+                int(model["event_ids"][i]), float(scores[i]), float(content[i]), float(collaborative[i]),
+                int(model["popularity"][i])
+            )
+            for i in top
+        ]
+
+
+local_recommender = LocalRecommender()
+
+
+def local_recommendation_explanation(content_score, collaborative_score, category):
+    """Short reason shown with a locally ranked recommendation."""
+    if collaborative_score > content_score:
+        return "Popular with participants who attend the same events as you."
+    if content_score > 0:
+        return f"Similar to {category or 'the'} events you registered for."
+    return "Popular upcoming event."
+
+
+def local_recommendations(email, k=3):
+    """Locally ranked upcoming events for a participant, in the recommend_events response shape."""
+    ranked = local_recommender.recommend(email, k=k)
+    if not ranked:
+        return []
+    rows = {
+        event.id: (event, club_name, club_category)
+        for event, club_name, club_category in
+        db.session.query(Event, Club.name, Club.category)
+        .join(Club, Club.id == Event.club_id)
+        .filter(Event.id.in_([event_id for event_id, _, _, _, _ in ranked]))
+    }
+    recommendations = []
+    for event_id, score, content_score, collaborative_score, popularity in ranked:
+        if event_id not in rows:
+            continue
+        event, club_name, club_category = rows[event_id]
+        recommendations.append({
+            "event_id": event.id,
+            "title": event.title,
+            "description": event.description or "",
+            "date": str(event.date),
+            "time": str(event.time),
+            "location": event.location,
+            "club_name": club_name or "Unknown",
+            "club_category": club_category or "General",
+            "explanation": local_recommendation_explanation(content_score, collaborative_score, club_category),
+            "popularity": popularity,
+            "score": round(score, 4)
+        })
+    return recommendations
+
+
+# ============================================================================
+# RECOMMENDATION BATCH JOB
+# ============================================================================
+
+def upcoming_event_popularity(from_date):
+    """(event_id, category, active registrations) for upcoming events, most popular first, in one query."""
+    registrations = func.count(Registration.id)
+    return (
+        db.session.query(Event.id, Club.category, registrations.label("registrations"))
+        .join(Club, Club.id == Event.club_id)
+        .outerjoin(Registration, and_(Registration.event_id == Event.id, Registration.cancelled == False))
+        .filter(Event.date >= from_date)
+        .group_by(Event.id, Club.category)
+        .order_by(registrations.desc(), Event.date.asc(), Event.id.asc())
+        .all()
+    )
+
+
+def compute_user_recommendations(email, history_count, interests, registered, popular, model, limit):
+    """Ranked (event_id, score, popularity, source, explanation) rows for one participant.
+
+    Participants with at least 4 registrations get the hybrid recommender;
+    the others (and everyone when numpy/scipy are missing) get a popularity
+    list with events from their categories first.
+    """
+    popularity = {event_id: count for event_id, _, count in popular}
+    if history_count >= 4 and model is not None:
+        categories = {event_id: category for event_id, category, _ in popular}
+        ranked = local_recommender.recommend(email, k=limit, model=model)
+        if ranked:
+            return [
+                (
+                    event_id, score, popularity.get(event_id, 0), "hybrid",
+                    local_recommendation_explanation(content, collaborative, categories.get(event_id))
+                )
+                for event_id, score, content, collaborative, _ in ranked
+            ]
+    
+    source = "category" if history_count >= 4 else "popular"
+    candidates = [row for row in popular if row[0] not in registered]
+    candidates.sort(key=lambda row: row[1] not in interests)  # stable: keeps popularity order
+    return [
+        (
+            event_id, float(count), count, source,
+            f"Popular {category} event among participants." if category in interests
+            else "Popular upcoming event."
+        )
+        for event_id, category, count in candidates[:limit]
+    ]
+
+
+def refresh_recommendations(full=False, user_ids=None, batch_size=500):
+    """Recompute stored recommendations and return counts.
+
+    With full=True every participant (or every one of user_ids) is
+    recomputed. Otherwise only participants whose registration history
+    (active count, newest registration id) differs from the state stored
+    with their recommendations, including those never computed.
+    """
+    today = datetime.utcnow().date()
+    participants = db.session.query(User.id, User.email).filter(User.role == "participant")
+    if user_ids is not None:
+        participants = participants.filter(User.id.in_(list(user_ids)))
+    participants = dict(participants.all())
+    # Refreshing a few participants only reads their own registrations
+    scope = [Registration.email.in_(list(participants.values()))] if user_ids is not None else []
+    
+    history = {
+        email: (count, last_id) for email, count, last_id in
+        db.session.query(Registration.email, func.count(Registration.id), func.max(Registration.id))
+        .filter(Registration.cancelled == False, *scope)
+        .group_by(Registration.email)
+    }
+    states = {} if full else {
+        user_id: (registrations, last_registration_id) for user_id, registrations, last_registration_id in
+        db.session.query(
+            RecommendationState.user_id, RecommendationState.registrations, RecommendationState.last_registration_id
+        )
+    }
+    due = [
+        user_id for user_id, email in participants.items()
+        if full or states.get(user_id) != history.get(email, (0, None))
+    ]
+    if not due:
+        return {"users": 0, "rows": 0, "full": full}
+    
+    popular = upcoming_event_popularity(today)
+    registered = {}
+    for email, event_id in (
+        db.session.query(Registration.email, Registration.event_id)
+        .join(Event, Event.id == Registration.event_id)
+        .filter(Registration.cancelled == False, Event.date >= today, *scope)
+    ):
+        registered.setdefault(email, set()).add(event_id)
+    interests = {}
+    for email, category in (
+        db.session.query(Registration.email, Club.category)
+        .join(Event, Event.id == Registration.event_id)
+        .join(Club, Club.id == Event.club_id)
+        .filter(Registration.cancelled == False, Club.category.isnot(None), *scope)
+        .distinct()
+    ):
+        interests.setdefault(email, set()).add(category)
+    
+    model = None
+    if LocalRecommender.available():
+        try:
+            model = local_recommender.refresh()
+        except Exception as recommender_err:
+            print(f"Local recommender unavailable for the batch run: {recommender_err}")
+    
+    written = 0
+    for offset in range(0, len(due), batch_size):
+        chunk = due[offset:offset + batch_size]
+        computed_at = datetime.utcnow()
+        rows = []
+        state_rows = []
+        for user_id in chunk:
+            email = participants[user_id]
+            count, last_id = history.get(email, (0, None))
+            user_interests = interests.get(email, set())
+            ranked = compute_user_recommendations(
+                email, count, user_interests, registered.get(email, set()), popular, model, RECOMMENDATIONS_PER_USER
+            )
+            rows.extend(
+                {
+                    "user_id": user_id, "event_id": event_id, "rank": rank, "score": score,
+                    "popularity": popularity, "source": source, "explanation": explanation,
+                    "computed_at": computed_at
+                }
+                for rank, (event_id, score, popularity, source, explanation) in enumerate(ranked, start=1)
+            )
+            state_rows.append({
+                "user_id": user_id, "registrations": count, "last_registration_id": last_id,
+                "interests": json.dumps(sorted(user_interests)), "computed_at": computed_at
+            })
+        try:
+            db.session.execute(
+                delete(Recommendation).where(Recommendation.user_id.in_(chunk)).execution_options(synchronize_session=False)
+            )
+            db.session.execute(
+                delete(RecommendationState).where(RecommendationState.user_id.in_(chunk))
+                .execution_options(synchronize_session=False)
+            )
+            if rows:
+                db.session.execute(insert(Recommendation), rows)
+            db.session.execute(insert(RecommendationState), state_rows)
+            db.session.commit()
+            written += len(rows)
+        except Exception as batch_err:
+            # uq_recommendations_user_rank: another worker refreshed these participants concurrently
+            db.session.rollback()
+            print(f"Recommendation batch skipped: {batch_err}")
+    
+    return {"users": len(due), "rows": written, "full": full, "engine": "hybrid" if model is not None else "popular"}
+
+
+def claim_job_run(name, interval):
+    """Claim the next run of a periodic job for this worker; False if another worker already has it.
+
+    Same conditional-UPDATE claim as the calendar feeds, on a single lease row.
+    """
+    now = datetime.utcnow()
+    insert_missing_rows(JobLease, [{"name": name, "next_run_at": now}])
+    claimed = db.session.execute(
+        update(JobLease)
+        .where(JobLease.name == name, JobLease.next_run_at <= now)
+        .values(next_run_at=now + interval)
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def claim_nightly_recommendation_run(today, now):
+    """Claim today's full run: insert its row, or take over a run whose worker stopped long ago."""
+    existing = RecommendationRun.query.get(today)
+    if existing is None:
+        try:
+            db.session.add(RecommendationRun(run_date=today, started_at=now))
+            db.session.commit()
+            return True
+        except Exception:
+            # Another worker claimed tonight's run first
+            db.session.rollback()
+            return False
+    if existing.finished_at is not None:
+        return False
+    claimed = db.session.execute(
+        update(RecommendationRun)
+        .where(
+            RecommendationRun.run_date == today,
+            RecommendationRun.finished_at.is_(None),
+            RecommendationRun.started_at < now - timedelta(minutes=RECOMMENDATION_RUN_STALE_MINUTES)
+        )
+        .values(started_at=now)
+    ).rowcount
+    db.session.commit()
+    return bool(claimed)
+
+
+def run_recommendation_cycle():
+    """Nightly full run or an incremental refresh of changed participants, each claimed by one worker.
+
+    Returns None when another worker holds the run.
+    """
+    now = datetime.utcnow()
+    today = now.date()
+    if now.hour >= RECOMMENDATION_NIGHTLY_HOUR and claim_nightly_recommendation_run(today, now):
+        try:
+            result = refresh_recommendations(full=True)
+        except Exception:
+            # Release the claim so the next tick retries tonight's run
+            db.session.rollback()
+            db.session.execute(delete(RecommendationRun).where(RecommendationRun.run_date == today))
+            db.session.commit()
+            raise
+        db.session.execute(
+            update(RecommendationRun)
+            .where(RecommendationRun.run_date == today)
+            .values(finished_at=datetime.utcnow(), users=result["users"], rows=result["rows"])
+        )
+        db.session.commit()
+        return result
+    
+    # Leave some slack so a worker ticking slightly early still gets each interval
+    interval = timedelta(minutes=max(RECOMMENDATION_REFRESH_MINUTES, 1))
+    if not claim_job_run("recommendations-incremental", max(interval - timedelta(seconds=30), timedelta(seconds=30))):
+        return None
+    return refresh_recommendations()
+
+
+class RecommendationScheduler:
+    """Background thread that periodically runs run_recommendation_cycle."""
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self, app, interval_minutes):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(app, max(interval_minutes, 1) * 60), daemon=True, name="recommendation-scheduler"
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, app, tick_seconds):
+        while not self._stop.wait(tick_seconds):
+            with app.app_context():
+                try:
+                    result = run_recommendation_cycle()
+                    if result and result["users"]:
+                        print(f"✅ Recommendations refreshed for {result['users']} participants")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Recommendation refresh failed: {e}")
+                finally:
+                    db.session.remove()
+
+
+recommendation_scheduler = RecommendationScheduler()
+
+
+def read_stored_recommendations(user_id, limit=3):
+    """A participant's stored recommendations for upcoming events, with their state, in one indexed read."""
+    today = datetime.utcnow().date()
+    rows = (
+        db.session.query(RecommendationState, Recommendation, Event, Club.name, Club.category)
+        .outerjoin(Recommendation, Recommendation.user_id == RecommendationState.user_id)
+        .outerjoin(Event, and_(Event.id == Recommendation.event_id, Event.date >= today))
+        .outerjoin(Club, Club.id == Event.club_id)
+        .filter(RecommendationState.user_id == user_id)
+        .order_by(Recommendation.rank)
+        .all()
+    )
+    if not rows:
+        return None, []
+    state = rows[0][0]
+    recommendations = [
+        {
+            "event_id": event.id,
+            "title": event.title,
+            "description": event.description or "",
+            "date": str(event.date),
+            "time": str(event.time),
+            "location": event.location,
+            "club_name": club_name or "Unknown",
+            "club_category": club_category or "General",
+            "explanation": recommendation.explanation or "Recommended based on your interests",
+            "popularity": recommendation.popularity,
+            "score": round(recommendation.score, 4),
+            "source": recommendation.source
+        }
+        for _, recommendation, event, club_name, club_category in rows
+        if event is not None
+    ]
+    return state, recommendations[:limit]
+
+
+def fallback_event_recommendations(email, events_data, attended_categories):
+    """Recommendations when Gemini is unavailable: the local recommender, else same-category trending events."""
+    if LocalRecommender.available():
+        try:
+            recommendations = local_recommendations(email)
+            if recommendations:
+                return recommendations
+        except Exception as recommender_err:
+            print(f"Local recommender failed: {recommender_err}")
+    
+    matching_events = [
+        e for e in events_data
+        if (attended_categories and e["club_category"] in attended_categories) or not attended_categories
+    ]
+    if not matching_events:
+        matching_events = events_data
+    matching_events.sort(key=lambda x: (x["is_trending"], x["popularity"]), reverse=True)
+    return [
+        {
+            "event_id": e["event_id"],
+            "explanation": f"Popular {e['club_category']} event: {e['title']}. Based on your interest in similar events."
+        }
+        for e in matching_events[:3]
+    ]
+
+
 @ai_bp.route("/recommend-events", methods=["POST"])
 @jwt_required()
 def recommend_events():
@@ -3307,11 +7790,55 @@ def recommend_events():
         return jsonify({"error": "Access denied", "details": "This feature is only available for participants"}), 403
     
     participant_email = current_user.get("email")
+    data = request.get_json(silent=True) or {}
+    # precomputed: stored by the recommendation job; auto: Gemini, with the local
+    # recommender as fallback; local: the local recommender, computed now
+    engine = data.get("engine") or request.args.get("engine", "precomputed")
+    if engine not in ("precomputed", "auto", "local"):
+        return jsonify({"error": "engine must be 'precomputed', 'auto' or 'local'"}), 400
+    
+    if engine == "precomputed":
+        try:
+            limit = min(max(int(data.get("limit", 3)), 1), RECOMMENDATIONS_PER_USER)
+            user_id = current_user.get("id")
+            state, recommendations = read_stored_recommendations(user_id, limit)
+            # Never computed, or every stored event has passed: compute this participant now, but at
+            # most once per refresh interval; an empty list (no upcoming events) is a valid answer
+            recompute_after = timedelta(minutes=max(RECOMMENDATION_REFRESH_MINUTES, 1))
+            if state is None or (not recommendations and datetime.utcnow() - state.computed_at >= recompute_after):
+                refresh_recommendations(full=True, user_ids=[user_id])
+                state, recommendations = read_stored_recommendations(user_id, limit)
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": f"Failed to load recommendations: {str(e)}"}), 500
+        
+        return jsonify({
+            "recommendations": recommendations,
+            "engine": "precomputed",
+            "computed_at": str(state.computed_at) if state else None,
+            "profile_summary": {
+                "past_events": state.registrations if state else 0,
+                "interests": json.loads(state.interests or "[]") if state else []
+            }
+        }), 200
     
     try:
         participant_analytics = get_event_analytics(email=participant_email)
         past_registrations = participant_analytics.get("participant_history", [])
         
+        # The local recommender needs one registration, not four, and no network
+        if past_registrations and LocalRecommender.available() and (engine == "local" or len(past_registrations) < 4):
+            recommendations = local_recommendations(participant_email)
+            attended_categories = {reg["club_category"] for reg in past_registrations if reg.get("club_category")}
+            return jsonify({
+                "recommendations": recommendations,
+                "engine": "local",
+                "profile_summary": {
+                    "past_events": len(past_registrations),
+                    "interests": list(attended_categories)
+                }
+            }), 200
+        
         if len(past_registrations) < 4:
             return jsonify({
                 "error": "Insufficient data for recommendations",
@@ -3346,10 +7873,9 @@ def recommend_events():
             .all()
         )
         
-        event_popularity = {}
-        for event in upcoming_events:
-            reg_count = Registration.query.filter_by(event_id=event.id, cancelled=False).count()
-            event_popularity[event.id] = reg_count
+        event_popularity = {
+            event_id: count for event_id, _, count in upcoming_event_popularity(datetime.now().date())
+        }
         
         week_ago = datetime.now() - timedelta(days=7)
         trending_events = (
@@ -3410,20 +7936,7 @@ def recommend_events():
         try:
             ai_response = call_gemini(prompt, max_output_tokens=600)
         except Exception:
-            matching_events = [
-                e for e in events_data
-                if (attended_categories and e["club_category"] in attended_categories) or not attended_categories
-            ]
-            if not matching_events:
-                matching_events = events_data
-            matching_events.sort(key=lambda x: (x["is_trending"], x["popularity"]), reverse=True)
-            recommendations = [
-                {
-                    "event_id": e["event_id"],
-                    "explanation": f"Popular {e['club_category']} event: {e['title']}. Based on your interest in similar events."
-                }
-                for e in matching_events[:3]
-            ]
+            recommendations = fallback_event_recommendations(participant_email, events_data, attended_categories)
         else:
             try:
                 if "[" in ai_response and "]" in ai_response:
@@ -3434,25 +7947,16 @@ def recommend_events():
                 else:
                     raise ValueError("No JSON array found in AI response")
             except (json.JSONDecodeError, ValueError):
-                matching_events = [
-                    e for e in events_data
-                    if (attended_categories and e["club_category"] in attended_categories) or not attended_categories
-                ]
-                if not matching_events:
-                    matching_events = events_data
-                matching_events.sort(key=lambda x: (x["is_trending"], x["popularity"]), reverse=True)
-                recommendations = [
-                    {
-                        "event_id": e["event_id"],
-                        "explanation": f"Popular {e['club_category']} event: {e['title']}. Based on your interest in similar events."
-                    }
-                    for e in matching_events[:3]
-                ]
+                recommendations = fallback_event_recommendations(participant_email, events_data, attended_categories)
         
         enriched_recommendations = []
         for rec in recommendations[:3]:
             event_id = rec.get("event_id")
             event = next((e for e in upcoming_events if e.id == event_id), None)
+            if not event and rec.get("title"):
+                # Ranked by the local recommender outside the 50 soonest events
+                enriched_recommendations.append(rec)
+                continue
             
             if event:
                 club = event.club
@@ -3532,35 +8036,26 @@ def get_profile():
         }
     elif user.role == "leader":
         leader_clubs = Club.query.filter_by(leader_id=user.id).all()
-        club_ids = [club.id for club in leader_clubs]
-        
-        total_events = Event.query.filter(Event.club_id.in_(club_ids)).count() if club_ids else 0
-        total_regs = db.session.query(Registration).join(Event).filter(
-            Event.club_id.in_(club_ids),
-            Registration.cancelled == False
-        ).count() if club_ids else 0
-        total_attendees = db.session.query(Registration).join(Event).filter(
-            Event.club_id.in_(club_ids),
-            Registration.checked_in == True
-        ).count() if club_ids else 0
+        event_rows = get_leader_event_rows([club.id for club in leader_clubs])
         
         stats = {
             "total_clubs": len(leader_clubs),
-            "total_events": total_events,
-            "total_registrations": total_regs,
-            "total_attendees": total_attendees
+            "total_events": len(event_rows),
+            "total_registrations": sum(row.registrations for row in event_rows),
+            "total_attendees": sum(row.checked_in for row in event_rows)
         }
     elif user.role == "university":
-        total_clubs = Club.query.count()
-        total_events = Event.query.count()
-        total_participants = User.query.filter_by(role="participant").count()
-        total_leaders = User.query.filter_by(role="leader").count()
+        # Daily snapshot plus today's additions instead of full-table counts
+        totals, today, _ = get_university_kpis()
         
         stats = {
-            "total_clubs": total_clubs,
-            "total_events": total_events,
-            "total_participants": total_participants,
-            "total_leaders": total_leaders
+            "total_clubs": totals["clubs"],
+            "total_events": totals["events"],
+            "total_participants": totals["participants"],
+            "total_leaders": totals["leaders"],
+            "total_registrations": totals["registrations"],
+            "total_check_ins": totals["check_ins"],
+            "today": today
         }
     
     profile_data = user.to_dict()
@@ -4220,7 +8715,6 @@ def export_calendar_ical():
     
     ical_content += "END:VCALENDAR\r\n"
     
-    from flask import Response
     response = Response(
         ical_content,
         mimetype="text/calendar; charset=utf-8",
@@ -4252,107 +8746,38 @@ def sync_university_calendar():
     try:
         # For iCal URL, fetch and parse
         if calendar_type == "ical":
-            import urllib.request
-            import urllib.error
-            
             try:
-                with urllib.request.urlopen(calendar_url, timeout=10) as response:
-                    ical_data = response.read().decode('utf-8')
-            except urllib.error.URLError as e:
+                _, response = fetch_calendar_feed(calendar_url)
+            except (urllib.error.URLError, ValueError) as e:
                 return jsonify({"error": f"Failed to fetch calendar: {str(e)}"}), 400
             
-            # Parse iCal and extract events
-            events_found = []
-            lines = ical_data.split('\n')
-            current_event = {}
-            in_event = False
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                # Handle line continuation (iCal format)
-                if line.startswith(' ') or line.startswith('\t'):
-                    if in_event and current_event:
-                        # Continue previous line
-                        last_key = list(current_event.keys())[-1] if current_event else None
-                        if last_key:
-                            current_event[last_key] += line.strip()
-                    continue
-                
-                if line == "BEGIN:VEVENT":
-                    current_event = {}
-                    in_event = True
-                elif line == "END:VEVENT":
-                    if current_event and current_event.get("title"):
-                        # Parse datetime
-                        try:
-                            dtstart_str = current_event.get("start", "")
-                            dtend_str = current_event.get("end", "")
-                            
-                            # Handle different iCal datetime formats
-                            if len(dtstart_str) == 8:  # YYYYMMDD
-                                start_dt = datetime.strptime(dtstart_str, "%Y%m%d")
-                            elif 'T' in dtstart_str:
-                                if dtstart_str.endswith('Z'):
-                                    start_dt = datetime.strptime(dtstart_str.replace('Z', ''), "%Y%m%dT%H%M%S")
-                                else:
-                                    start_dt = datetime.strptime(dtstart_str.split('T')[0], "%Y%m%d")
-                            else:
-                                start_dt = datetime.strptime(dtstart_str[:8], "%Y%m%d")
-                            
-                            if len(dtend_str) == 8:  # YYYYMMDD
-                                end_dt = datetime.strptime(dtend_str, "%Y%m%d")
-                            elif 'T' in dtend_str:
-                                if dtend_str.endswith('Z'):
-                                    end_dt = datetime.strptime(dtend_str.replace('Z', ''), "%Y%m%dT%H%M%S")
-                                else:
-                                    end_dt = datetime.strptime(dtend_str.split('T')[0], "%Y%m%d")
-                            else:
-                                end_dt = datetime.strptime(dtend_str[:8], "%Y%m%d")
-                            
-                            # Save to database
-                            uni_event = UniversityCalendarEvent(
-                                user_id=user_id,
-                                title=current_event.get("title", "University Event"),
-                                description=current_event.get("description", ""),
-                                start_datetime=start_dt,
-                                end_datetime=end_dt,
-                                location=current_event.get("location", ""),
-                                calendar_url=calendar_url
-                            )
-                            db.session.add(uni_event)
-                            events_found.append({
-                                "title": uni_event.title,
-                                "start": str(uni_event.start_datetime),
-                                "end": str(uni_event.end_datetime),
-                                "location": uni_event.location
-                            })
-                        except Exception as parse_err:
-                            print(f"Error parsing event: {parse_err}")
-                            continue
-                    current_event = {}
-                    in_event = False
-                elif line.startswith("SUMMARY:"):
-                    current_event["title"] = line.split(":", 1)[1] if ":" in line else ""
-                elif line.startswith("DTSTART"):
-                    dt_part = line.split(":", 1)[1] if ":" in line else ""
-                    current_event["start"] = dt_part
-                elif line.startswith("DTEND"):
-                    dt_part = line.split(":", 1)[1] if ":" in line else ""
-                    current_event["end"] = dt_part
-                elif line.startswith("LOCATION:"):
-                    current_event["location"] = line.split(":", 1)[1] if ":" in line else ""
-                elif line.startswith("DESCRIPTION:"):
-                    current_event["description"] = line.split(":", 1)[1] if ":" in line else ""
+            # Re-syncing a URL only applies what changed since the previous sync
+            preview = []
+            with response:
+                changes = sync_calendar_events(
+                    UniversityCalendarEvent,
+                    {"user_id": user_id, "calendar_url": calendar_url},
+                    parse_ical_stream(response),
+                    preview
+                )
+                # The scheduler keeps this URL fresh from now on
+                register_calendar_feed(calendar_url, response)
             
             db.session.commit()
             
             return jsonify({
                 "message": "University calendar synced successfully",
-                "events_found": len(events_found),
-                "events": events_found[:10]  # Return first 10 for preview
+                "events_found": changes["inserted"] + changes["updated"] + changes["unchanged"],
+                "changes": changes,
+                "events": [
+                    {
+                        "title": item["title"],
+                        "start": str(item["start"]),
+                        "end": str(item["end"]),
+                        "location": item["location"]
+                    }
+                    for item in preview
+                ]  # Return first 10 for preview
             }), 200
         
         elif calendar_type == "google":
@@ -4577,7 +9002,7 @@ def create_app():
     @jwt_required()
     @leader_required
     def send_event_reminders_endpoint(event_id):
-        """Send reminders to all registered participants for an event (Leader only)."""
+        """Queue a background reminder blast for all registered participants (Leader only)."""
         current_user = get_current_user_context()
         event = Event.query.get(event_id)
         
@@ -4591,33 +9016,51 @@ def create_app():
         data = request.get_json() or {}
         channels = data.get("channels", ["email"])  # Default to email
         reminder_type = data.get("reminder_type", "manual")
-        custom_message = data.get("message", "")
         
-        # Get all registrations for this event
-        registrations = Registration.query.filter_by(
-            event_id=event_id, cancelled=False
-        ).all()
+        if not isinstance(channels, list) or not channels:
+            return jsonify({"error": "channels must be a non-empty list"}), 400
+        invalid = [c for c in channels if c not in REMINDER_CHANNEL_CONCURRENCY]
+        if invalid:
+            return jsonify({"error": f"Unknown channels: {', '.join(map(str, invalid))}"}), 400
         
-        results = {
-            "total": len(registrations),
-            "sent": {"email": 0, "whatsapp": 0, "sms": 0},
-            "failed": {"email": 0, "whatsapp": 0, "sms": 0}
-        }
+        job = ReminderJob(
+            event_id=event_id,
+            leader_id=current_user.get("id"),
+            channels=",".join(dict.fromkeys(channels)),
+            reminder_type=str(reminder_type)[:20]
+        )
+        try:
+            db.session.add(job)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({"error": str(e)}), 500
         
-        for registration in registrations:
-            user = User.query.filter_by(email=registration.email).first()
-            if user:
-                reminder_results = send_event_reminders(user, event, reminder_type, channels)
-                for channel, success in reminder_results.items():
-                    if success:
-                        results["sent"][channel] += 1
-                    else:
-                        results["failed"][channel] += 1
+        start_reminder_job(current_app._get_current_object(), job.id)
         
         return jsonify({
-            "message": "Reminders sent",
-            "results": results
-        }), 200
+            "message": "Reminders queued",
+            "job": job.to_dict(),
+            "status_url": f"/api/reminder-jobs/{job.id}"
+        }), 202
+    
+    @reminders_bp.route("/reminder-jobs/<int:job_id>", methods=["GET"])
+    @jwt_required()
+    @leader_required
+    def reminder_job_status(job_id):
+        """Progress of a reminder blast: status plus sent/failed counts per channel (Leader only)."""
+        current_user = get_current_user_context()
+        try:
+            reap_stale_reminder_jobs()
+        except Exception as reap_err:
+            db.session.rollback()
+            print(f"Reminder job reaper failed: {reap_err}")
+        job = ReminderJob.query.get(job_id)
+        
+        if not job or not leader_owns_event(current_user.get("id"), job.event_id):
+            return jsonify({"error": "Reminder job not found"}), 404
+        
+        return jsonify(job.to_dict()), 200
     
     @reminders_bp.route("/reminder-preferences", methods=["GET", "PUT"])
     @jwt_required()
@@ -4682,6 +9125,27 @@ def create_app():
     with app.app_context():
         db.create_all()
         ensure_schema()
+        try:
+            backfilled = backfill_event_venues()
+            if backfilled:
+                print(f"✅ Linked {backfilled} events to venues")
+        except Exception as backfill_err:
+            db.session.rollback()
+            print(f"Venue backfill failed: {backfill_err}")
+        try:
+            reaped = reap_stale_reminder_jobs()
+            if reaped:
+                print(f"⚠️ Marked {reaped} interrupted reminder jobs as failed")
+        except Exception as reap_err:
+            db.session.rollback()
+            print(f"Reminder job reaper failed: {reap_err}")
+    
+    if CALENDAR_REFRESH_MINUTES > 0:
+        calendar_feed_scheduler.start(app)
+    if RECOMMENDATION_REFRESH_MINUTES > 0:
+        recommendation_scheduler.start(app, RECOMMENDATION_REFRESH_MINUTES)
+    if UNIVERSITY_KPI_SNAPSHOT_MINUTES > 0:
+        university_kpi_scheduler.start(app, UNIVERSITY_KPI_SNAPSHOT_MINUTES)
     
     return app
 
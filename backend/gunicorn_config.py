@@ -1,9 +1,16 @@
+import os
 import multiprocessing
 
 # Gunicorn configuration for production deployment
-bind = "0.0.0.0:5000"
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
 workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+# Threaded workers keep long-lived SSE streams (live check-in counters)
+# from blocking a whole worker or tripping the worker timeout. Each open
+# stream holds a thread for up to LIVE_STREAM_MAX_SECONDS, and at most
+# LIVE_STREAMS_PER_WORKER (default threads // 2) run per worker, so raise
+# GUNICORN_THREADS with the number of leader screens expected at once.
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
 worker_connections = 1000
 timeout = 120
 keepalive = 5
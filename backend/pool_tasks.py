@@ -0,0 +1,24 @@
+"""
+Student Club-Hub API - Process Pool Tasks
+
+CPU-bound functions run on app.get_process_pool(). The pool uses the spawn
+start method, so each child imports the module a task lives in: keeping them
+here means a child never imports app.py (config, database, schedulers).
+"""
+
+import io
+
+import qrcode
+from flask_bcrypt import generate_password_hash
+
+
+def render_qr_png(qr_data):
+    """Render a QR code to PNG bytes."""
+    buffer = io.BytesIO()
+    qrcode.make(qr_data).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def hash_password(password, rounds=12):
+    """Bcrypt-hash a password."""
+    return generate_password_hash(password, rounds).decode("utf-8")
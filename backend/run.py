@@ -5,7 +5,10 @@
 import os
 from app import create_app
 
-app = create_app()
+# The process pool spawns its children with this file re-run as __mp_main__;
+# only the real entry point (or gunicorn's `run:app` import) builds the app.
+if __name__ != "__mp_main__":
+    app = create_app()
 
 if __name__ == "__main__":
     # Development mode
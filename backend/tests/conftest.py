@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture(scope="session")
+def clubhub(tmp_path_factory):
+    """The app module, configured against a throwaway SQLite database with schedulers off."""
+    db_path = tmp_path_factory.mktemp("db") / "clubhub.db"
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["CALENDAR_REFRESH_MINUTES"] = "0"
+    os.environ["RECOMMENDATION_REFRESH_MINUTES"] = "0"
+    os.environ["UNIVERSITY_KPI_SNAPSHOT_MINUTES"] = "0"
+    import app as clubhub
+    return clubhub
+
+
+@pytest.fixture(scope="session")
+def flask_app(clubhub):
+    return clubhub.create_app()
+
+
+@pytest.fixture
+def app_context(clubhub, flask_app):
+    with flask_app.app_context():
+        yield
+        clubhub.db.session.remove()
+        clubhub.db.drop_all()
+        clubhub.db.create_all()
@@ -0,0 +1,135 @@
+import http.server
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+FEED = (
+    "BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:exam-1\r\nSUMMARY:{title}\r\n"
+    "DTSTART:20261201T090000Z\r\nDTEND:20261201T110000Z\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+)
+
+
+@pytest.fixture
+def feed_server():
+    """A local HTTP stand-in for an iCal host that honours If-None-Match."""
+    state = {"title": "Exam", "etag": '"v1"', "hits": 0, "not_modified": 0, "redirect": None}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["hits"] += 1
+            if state["redirect"]:
+                self.send_response(302)
+                self.send_header("Location", state["redirect"])
+                self.end_headers()
+                return
+            if self.headers.get("If-None-Match") == state["etag"]:
+                state["not_modified"] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = FEED.format(title=state["title"]).encode()
+            self.send_response(200)
+            self.send_header("ETag", state["etag"])
+            self.send_header("Content-Type", "text/calendar")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/feed.ics"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def official_calendar(clubhub, app_context, feed_server, monkeypatch):
+    monkeypatch.setattr(clubhub, "CALENDAR_ALLOW_PRIVATE_HOSTS", True)
+    db = clubhub.db
+    university = clubhub.User(name="Uni", email="uni@example.edu", password="x", role="university")
+    db.session.add(university)
+    db.session.flush()
+    calendar = clubhub.UniversityOfficialCalendar(
+        university_id=university.id, calendar_name="Academic", calendar_url=feed_server["url"]
+    )
+    db.session.add(calendar)
+    db.session.commit()
+    clubhub.ensure_calendar_feeds()
+    return calendar
+
+
+def make_due(clubhub):
+    clubhub.db.session.execute(
+        clubhub.update(clubhub.CalendarFeed).values(next_fetch_at=datetime.utcnow() - timedelta(minutes=1))
+    )
+    clubhub.db.session.commit()
+
+
+def test_refresh_cycle_syncs_then_revalidates(clubhub, official_calendar, feed_server):
+    results = clubhub.run_calendar_refresh_cycle()
+    assert results[0]["status"] == 200
+    assert results[0]["changes"]["inserted"] == 1
+
+    # Not due again until the interval has passed
+    assert clubhub.run_calendar_refresh_cycle() == []
+
+    make_due(clubhub)
+    results = clubhub.run_calendar_refresh_cycle()
+    assert results[0]["status"] == 304
+    assert feed_server["not_modified"] == 1
+
+    feed_server["title"] = "Final Exam"
+    feed_server["etag"] = '"v2"'
+    make_due(clubhub)
+    results = clubhub.run_calendar_refresh_cycle()
+    assert results[0]["changes"]["updated"] == 1
+    titles = [e.title for e in clubhub.UniversityOfficialCalendarEvent.query.all()]
+    assert titles == ["Final Exam"]
+    assert clubhub.CalendarFeed.query.one().etag == '"v2"'
+
+
+def test_redirect_to_other_scheme_is_refused(clubhub, official_calendar, feed_server):
+    # urllib itself follows ftp:// redirects; the feed guard must not
+    feed_server["redirect"] = "ftp://127.0.0.1/feed.ics"
+    with pytest.raises(ValueError):
+        clubhub.fetch_calendar_feed(feed_server["url"])
+
+    results = clubhub.run_calendar_refresh_cycle()
+    assert results[0]["status"] == "error"
+    assert clubhub.UniversityOfficialCalendarEvent.query.count() == 0
+
+
+@pytest.mark.parametrize("url", [
+    "file:///etc/passwd",
+    "ftp://calendar.example.com/feed.ics",
+    "http://127.0.0.1/feed.ics",
+    "http://localhost:5000/api/events",
+    "http://10.0.0.5/feed.ics",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/feed.ics",
+])
+def test_private_and_non_http_urls_are_refused(clubhub, url):
+    with pytest.raises(ValueError):
+        clubhub.check_calendar_url(url)
+
+
+def test_participant_sync_rejects_loopback_feed(clubhub, flask_app, app_context, feed_server):
+    from flask_jwt_extended import create_access_token
+
+    user = clubhub.User(name="P", email="p@example.edu", password="x", role="participant")
+    clubhub.db.session.add(user)
+    clubhub.db.session.commit()
+    token = create_access_token(identity=str(user.id), additional_claims={"role": "participant"})
+
+    response = flask_app.test_client().post(
+        "/api/participant/events/calendar/university-sync",
+        json={"calendar_url": feed_server["url"]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 400
+    assert feed_server["hits"] == 0
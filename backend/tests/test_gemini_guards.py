@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+
+class SlowGeminiModel:
+    """Stand-in for genai.GenerativeModel that takes `delay` seconds to answer.
+
+    Calls block on `release`, so a test can also hold them open indefinitely
+    and let them go at teardown.
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self.release = threading.Event()
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        self.release.wait(self.delay)
+        return type("Response", (), {"text": '{"titles": ["From Gemini"], "description": "d"}', "candidates": []})()
+
+
+@pytest.fixture
+def slow_gemini(clubhub, monkeypatch):
+    model = SlowGeminiModel(delay=5)
+    monkeypatch.setattr(clubhub, "gemini_model", model)
+    monkeypatch.setattr(clubhub, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(clubhub, "GEMINI_CACHE_TTL_SECONDS", 0)
+    monkeypatch.setattr(clubhub, "GEMINI_TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setattr(clubhub, "GEMINI_QUEUE_WAIT_SECONDS", 0.1)
+    monkeypatch.setattr(clubhub, "gemini_breaker", clubhub.CircuitBreaker(2, 60))
+    yield model
+    model.release.set()
+
+
+def timed(fn, *args):
+    started = time.monotonic()
+    try:
+        fn(*args)
+    except Exception as e:
+        return time.monotonic() - started, str(e)
+    return time.monotonic() - started, None
+
+
+def test_deadline_releases_caller_and_opens_breaker(clubhub, slow_gemini):
+    config = {"max_output_tokens": 10}
+
+    for _ in range(2):
+        elapsed, error = timed(clubhub.request_gemini, "prompt", config)
+        assert "timed out" in error
+        assert elapsed < 1
+    assert clubhub.gemini_breaker.to_dict()["state"] == "open"
+
+    # An open circuit refuses without touching the backend
+    elapsed, error = timed(clubhub.request_gemini, "prompt", config)
+    assert "circuit open" in error
+    assert elapsed < 0.05
+    assert slow_gemini.calls == 2
+
+
+def test_stuck_calls_keep_their_slot(clubhub, slow_gemini, monkeypatch):
+    monkeypatch.setattr(clubhub, "_gemini_slots", threading.BoundedSemaphore(1))
+    monkeypatch.setattr(clubhub, "gemini_breaker", clubhub.CircuitBreaker(99, 60))
+    config = {"max_output_tokens": 10}
+
+    _, error = timed(clubhub.request_gemini, "prompt", config)
+    assert "timed out" in error
+    elapsed, error = timed(clubhub.request_gemini, "prompt", config)
+    assert "busy" in error
+    assert elapsed < 1
+
+    # Once the stuck call really returns its slot is free again
+    slow_gemini.release.set()
+    slow_gemini.delay = 0
+    for _ in range(50):
+        if clubhub._gemini_slots.acquire(blocking=False):
+            clubhub._gemini_slots.release()
+            break
+        time.sleep(0.02)
+    assert clubhub.request_gemini("prompt", config) == '{"titles": ["From Gemini"], "description": "d"}'
+
+
+def test_endpoint_falls_back_within_deadline(clubhub, flask_app, app_context, slow_gemini):
+    from flask_jwt_extended import create_access_token
+
+    leader = clubhub.User(name="L", email="leader@example.edu", password="x", role="leader")
+    clubhub.db.session.add(leader)
+    clubhub.db.session.commit()
+    token = create_access_token(identity=str(leader.id), additional_claims={"role": "leader"})
+    client = flask_app.test_client()
+
+    for _ in range(3):
+        started = time.monotonic()
+        response = client.post(
+            "/api/ai/event-ideas", json={"club_category": "Tech"}, headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 200
+        assert response.json["titles"][0] != "From Gemini"
+        assert time.monotonic() - started < 1
+    assert slow_gemini.calls == 2
@@ -0,0 +1,38 @@
+from datetime import date, time
+
+import pytest
+
+
+@pytest.fixture
+def event(clubhub, app_context):
+    db = clubhub.db
+    club = clubhub.Club(name="Chess")
+    db.session.add(club)
+    db.session.flush()
+    event = clubhub.Event(club_id=club.id, title="Open", date=date(2026, 12, 1), time=time(18), location="Hall")
+    db.session.add(event)
+    db.session.flush()
+    for name, email in [("Ann_Lee", "ann@x.edu"), ("Annxlee", "annx@x.edu"), ("100% Bob", "bob@x.edu")]:
+        db.session.add(clubhub.Registration(event_id=event.id, participant_name=name, email=email))
+    db.session.commit()
+    return event
+
+
+@pytest.mark.parametrize("search, expected", [
+    ("ann_", ["Ann_Lee"]),
+    ("100%", ["100% Bob"]),
+    ("ann", ["Ann_Lee", "Annxlee"]),
+])
+def test_search_matches_wildcards_literally(clubhub, event, search, expected):
+    rows = clubhub.leader_registrations_query(event.id, search).all()
+    assert sorted(reg.participant_name for reg, *_ in rows) == expected
+
+
+@pytest.mark.parametrize("value", ["=1+1", "+1", "-1", "@SUM(A1)", "\t=1", "\r=1"])
+def test_csv_safe_quotes_formula_prefixes(clubhub, value):
+    assert clubhub.csv_safe(value) == "'" + value
+
+
+def test_csv_safe_leaves_plain_values(clubhub):
+    assert clubhub.csv_safe("Ann Lee") == "Ann Lee"
+    assert clubhub.csv_safe(None) == ""
@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+
+@pytest.fixture
+def recommender(clubhub):
+    """A LocalRecommender built from in-memory events and registrations (no database)."""
+    today = date(2026, 1, 1)
+    registrations = {
+        "a@x.edu": [0, 1, 2],
+        "b@x.edu": [1, 2, 3, 4],
+        "c@x.edu": [2, 4, 5],
+        "d@x.edu": [0, 5, 6, 7],
+        "e@x.edu": [3, 6],
+    }
+    recommender = clubhub.LocalRecommender()
+    recommender._events = {event_id: (today + timedelta(days=event_id), "Tech") for event_id in range(8)}
+    recommender._event_terms = {
+        event_id: ((f"Event {event_id}", "", "Tech"), clubhub.recommender_terms(f"Event {event_id}", "", "Tech"))
+        for event_id in range(8)
+    }
+    recommender._pairs = {
+        n: (email, event_id)
+        for n, (email, event_id) in enumerate(
+            (email, event_id) for email, events in registrations.items() for event_id in events
+        )
+    }
+    recommender._model = recommender._build()
+    return recommender, registrations, today
+
+
+def dense_cosine_scores(registrations, email, n_events):
+    users = sorted(registrations)
+    interactions = np.zeros((len(users), n_events))
+    for row, user in enumerate(users):
+        interactions[row, registrations[user]] = 1.0
+    degree = interactions.sum(axis=0)
+    similarity = interactions.T @ interactions / np.sqrt(np.outer(degree, degree))
+    scores = interactions[users.index(email)] @ similarity
+    return scores / scores.max()
+
+
+@pytest.mark.parametrize("email", ["a@x.edu", "c@x.edu", "e@x.edu"])
+def test_collaborative_score_is_item_item_cosine(recommender, email):
+    model_owner, registrations, today = recommender
+    expected = dense_cosine_scores(registrations, email, 8)
+
+    ranked = model_owner.recommend(email, k=8, from_date=today, model=model_owner._model)
+    assert {event_id for event_id, *_ in ranked} == set(range(8)) - set(registrations[email])
+    for event_id, _, _, collaborative, popularity in ranked:
+        assert collaborative == pytest.approx(expected[event_id])
+        assert popularity == sum(event_id in events for events in registrations.values())
@@ -0,0 +1,43 @@
+import os
+import sys
+import types
+
+from flask_bcrypt import check_password_hash
+
+from conftest import BACKEND_DIR
+
+# Shadows app.py inside pool children only: the parent has already imported the real one
+FAKE_APP = """
+import os
+
+
+def create_app():
+    with open(os.environ["CREATE_APP_MARKER"], "a") as marker:
+        marker.write(f"{os.getpid()}\\n")
+"""
+
+
+def test_hash_passwords_does_not_rebuild_app_in_pool_children(clubhub, tmp_path, monkeypatch):
+    (tmp_path / "app.py").write_text(FAKE_APP)
+    marker = tmp_path / "create_app.log"
+    monkeypatch.setenv("CREATE_APP_MARKER", str(marker))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    # Run the pool as under `python run.py`: spawn re-runs __main__'s file in each child
+    main = types.ModuleType("__main__")
+    main.__file__ = os.path.join(BACKEND_DIR, "run.py")
+    main.__spec__ = None
+    monkeypatch.setitem(sys.modules, "__main__", main)
+
+    monkeypatch.setattr(clubhub, "PROCESS_POOL_WORKERS", 2)
+    monkeypatch.setattr(clubhub, "_process_pool", None)
+    passwords = ["first-secret", "second-secret", "third-secret"]
+    try:
+        hashed = clubhub.hash_passwords(passwords, rounds=4)
+        assert clubhub._process_pool is not None
+    finally:
+        if clubhub._process_pool is not None:
+            clubhub._process_pool.shutdown(wait=True)
+
+    assert [check_password_hash(h, p) for h, p in zip(hashed, passwords)] == [True, True, True]
+    assert not marker.exists()